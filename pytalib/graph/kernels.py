@@ -0,0 +1,99 @@
+import numpy as np
+from ..jit import jit
+
+@jit
+def hvg_edges(series):
+	"""
+	edges of the horizontal visibility graph of `series` as an (m, 2) array
+	"""
+	n = series.shape[0]
+	edges = np.empty((2 * n, 2), dtype=np.int64)
+	stack = np.empty(n, dtype=np.int64)
+	top = 0
+	m = 0
+
+	for i in range(n):
+		if top > 0 and series[stack[top - 1]] > series[i]:
+			edges[m, 0] = stack[top - 1]
+			edges[m, 1] = i
+			m += 1
+		elif top > 0:
+			while top > 0 and series[stack[top - 1]] < series[i]:
+				top -= 1
+				edges[m, 0] = i
+				edges[m, 1] = stack[top]
+				m += 1
+			if top > 0:
+				edges[m, 0] = stack[top - 1]
+				edges[m, 1] = i
+				m += 1
+		stack[top] = i
+		top += 1
+
+	return edges[:m]
+
+@jit
+def _append_edge(edges, m, a, b):
+	if m == edges.shape[0]:
+		grown = np.empty((2 * edges.shape[0], 2), dtype=np.int64)
+		grown[:m] = edges[:m]
+		edges = grown
+	edges[m, 0] = a
+	edges[m, 1] = b
+	return edges
+
+@jit
+def vg_fast_edges(series):
+	"""
+	edges of the visibility graph of `series` as an (m, 2) array, using an explicit stack in place of recursion
+	"""
+	n = series.shape[0]
+	edges = np.empty((max(2 * n, 1), 2), dtype=np.int64)
+	m = 0
+	bounds = np.empty((n + 1, 2), dtype=np.int64)
+	top = 0
+	if n > 1:
+		bounds[0, 0] = 0
+		bounds[0, 1] = n - 1
+		top = 1
+
+	while top > 0:
+		top -= 1
+		left = bounds[top, 0]
+		right = bounds[top, 1]
+		k = left
+		for i in range(left + 1, right + 1):
+			if series[i] > series[k]:
+				k = i
+		y_from = series[k]
+
+		has_slope = False
+		min_slope_left = 0.0
+		for i in range(k - 1, left - 1, -1):
+			slope = (series[i] - y_from) / (i - k)
+			if not has_slope or slope < min_slope_left:
+				has_slope = True
+				min_slope_left = slope
+				edges = _append_edge(edges, m, k, i)
+				m += 1
+
+		has_slope = False
+		max_slope_right = 0.0
+		for i in range(k + 1, right + 1):
+			slope = (series[i] - y_from) / (i - k)
+			if not has_slope or slope > max_slope_right:
+				has_slope = True
+				max_slope_right = slope
+				edges = _append_edge(edges, m, k, i)
+				m += 1
+
+		if k + 1 < right:
+			bounds[top, 0] = k + 1
+			bounds[top, 1] = right
+			top += 1
+		if left < k - 1:
+			bounds[top, 0] = left
+			bounds[top, 1] = k - 1
+			top += 1
+
+	return edges[:m]
@@ -1,5 +1,8 @@
 import networkx as nx
+import numpy as np
 from .utils import *
+from . import kernels
+from ..jit import HAS_NUMBA
 from scipy.stats import t
 def ts2hvg(series):
 	"""
@@ -10,6 +13,10 @@ def ts2hvg(series):
 	"""
 	hvg = nx.Graph()
 	hvg.add_nodes_from([i for i in range(len(series))])
+	if HAS_NUMBA:
+		hvg.add_edges_from(kernels.hvg_edges(np.asarray(series, dtype=np.float64)).tolist())
+		return hvg
+
 	stack = []
 	for i in range(len(series)):
 		if not stack:
@@ -57,6 +64,10 @@ def ts2vg_fast(series):
 	"""
 	vg = nx.Graph()
 	vg.add_nodes_from([i for i in range(len(series))])
+	if HAS_NUMBA:
+		vg.add_edges_from(kernels.vg_fast_edges(np.asarray(series, dtype=np.float64)).tolist())
+		return vg
+
 	ts2vg_fast_helper(vg, series, 0, len(series) - 1)
 	return vg
 
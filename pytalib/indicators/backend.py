@@ -0,0 +1,111 @@
+import threading
+import warnings
+from contextlib import contextmanager
+from ..jit import HAS_NUMBA
+
+BACKENDS = ('python', 'numpy', 'numba')
+AUTO = 'auto'
+PREFERENCE = ('numba', 'numpy', 'python')
+
+_implementations = {}
+_default = AUTO
+_local = threading.local()
+
+def _check_backend(backend):
+	if backend != AUTO and backend not in BACKENDS:
+		raise Exception("Unknown backend `{}`. Available backends: {}".format(backend, ", ".join((AUTO,) + BACKENDS)))
+
+def is_available(backend):
+	if backend == 'numba':
+		return HAS_NUMBA
+
+	return backend in BACKENDS
+
+def register(name, backend):
+	"""
+	register `function` as the `backend` implementation of the computation `name`
+	"""
+	_check_backend(backend)
+
+	def decorator(function):
+		_implementations.setdefault(name, {})[backend] = function
+		return function
+
+	return decorator
+
+def implementations(name):
+	return [backend for backend in PREFERENCE if backend in _implementations.get(name, {}) and is_available(backend)]
+
+def set_backend(backend):
+	"""
+	set the process wide default backend
+	"""
+	global _default
+	_check_backend(backend)
+	_default = backend
+
+def get_backend():
+	stack = getattr(_local, 'stack', None)
+	if stack:
+		return stack[-1]
+
+	return _default
+
+@contextmanager
+def use_backend(backend):
+	"""
+	select `backend` for every dispatch made by the current thread inside the `with` block
+	"""
+	_check_backend(backend)
+	if not hasattr(_local, 'stack'):
+		_local.stack = []
+
+	_local.stack.append(backend)
+	try:
+		yield backend
+	finally:
+		_local.stack.pop()
+
+def resolve(name, backend=None):
+	if backend is None:
+		backend = get_backend()
+	_check_backend(backend)
+
+	candidates = implementations(name)
+	if len(candidates) == 0:
+		raise Exception("No implementation registered for `{}`.".format(name))
+
+	if backend == AUTO:
+		return candidates[0]
+
+	if backend in candidates:
+		return backend
+
+	return 'python' if 'python' in candidates else candidates[0]
+
+def merge_backends(backends):
+	"""
+	backend reported for an indicator built from several computations, "+"-joined when they ran on
+	different backends and "python" when none of them dispatched
+	"""
+	names = [backend for backend in PREFERENCE if backend in backends]
+
+	return '+'.join(names) if len(names) > 0 else 'python'
+
+def dispatch(name, *args, backend=None):
+	"""
+	run computation `name` on the selected backend, returns (result, backend that actually ran)
+
+	A failing non-reference backend falls back to the python implementation with a warning.
+	"""
+	selected = resolve(name, backend)
+	implementation = _implementations[name][selected]
+
+	if selected == 'python' or 'python' not in _implementations[name]:
+		return (implementation(*args), selected)
+
+	try:
+		return (implementation(*args), selected)
+	except Exception as e:
+		warnings.warn("`{}` backend failed for `{}`, falling back to `python`: {}".format(selected, name, e), RuntimeWarning)
+		return (_implementations[name]['python'](*args), 'python')
@@ -1,11 +1,319 @@
+import copy
+import inspect
 from abc import ABC, abstractmethod
+from array import array
+from .backend import dispatch as dispatch_backend, merge_backends
+from . import planner
+
+INPUT_NAMES = ('prices', 'high', 'low', 'volume', 'put_volume', 'call_volume')
+
+def get_input_names(cls):
+	"""
+	names of the series an indicator class is constructed from, in constructor order
+	"""
+	return [name for name in inspect.signature(cls.__init__).parameters if name in INPUT_NAMES]
+
+def get_parameter_names(cls):
+	"""
+	names of the constructor arguments of an indicator class that are not input series
+	"""
+	return [name for name in list(inspect.signature(cls.__init__).parameters)[1:] if name not in INPUT_NAMES]
+
+def get_stream_config(stream):
+	"""
+	scalar slots of a stream, which for a new stream are its configuration
+	"""
+	return tuple((name, getattr(stream, name)) for klass in type(stream).__mro__ for name in getattr(klass, '__slots__', ())
+		if hasattr(stream, name) and (getattr(stream, name) is None or isinstance(getattr(stream, name), (bool, int, float, str))))
 
 class AbstractIndicator(ABC):
 
+	outputs = ()
+	checkpoint_interval = 256
+
 	def __init__(self):
 		self.messages = []
+		self.backend = None
+		self.backend_used = None
+		self.stream = None
+		self.stream_inputs = None
+		self.stream_size = 0
+		self.checkpoints = {}
+		self.checkpoint_inputs = None
+		self.extend_lists = None
 		super().__init__()
 
+	def dispatch(self, name, *args, backend=None):
+		result, self.backend_used = dispatch_backend(name, *args, backend=self.select_backend(backend))
+		return result
+
+	def select_backend(self, backend=None):
+		return backend if backend is not None else self.backend
+
+	def set_backend_used(self, *indicators):
+		"""
+		report the backends the child indicators ran on, or "python" for an indicator computed in Python only
+		"""
+		self.backend_used = merge_backends([indicator.backend_used for indicator in indicators])
+
+	def get_inputs(self):
+		return [getattr(self, name) for name in get_input_names(type(self))]
+
+	def get_params(self):
+		return {name: getattr(self, name) for name in get_parameter_names(type(self))}
+
+	def get_nodes(self, *inputs):
+		"""
+		planner nodes computing each output from `inputs`, the input series of the class by default
+
+		Composite indicators override this to declare their children, so a `Plan` can share them.
+		"""
+		if len(inputs) == 0:
+			inputs = [planner.source(name) for name in get_input_names(type(self))]
+
+		node = planner.indicator(type(self), *inputs, **self.get_params())
+		if len(self.outputs) == 1:
+			return [node]
+
+		return [planner.output(node, i) for i in range(len(self.outputs))]
+
+	def evaluate_nodes(self, nodes, backend=None):
+		plan = planner.Plan(nodes)
+		values = plan.run(dict(zip(get_input_names(type(self)), self.get_inputs())), self.select_backend(backend))
+		self.backend_used = merge_backends(plan.backends_used)
+
+		return values
+
+	def get_stream(self):
+		"""
+		new streaming indicator configured like this one
+		"""
+		raise Exception("`{}` has no streaming counterpart.".format(type(self).__name__))
+
+	@property
+	def lookback(self):
+		"""
+		number of bars before the first output computed from full windows
+
+		From index `lookback` on, an output depends only on the current bar and the `lookback` bars before
+		it, unless the indicator is `recursive`. EMA-type smoothing counts `period - 1` bars of warm-up.
+		"""
+		return self.get_stream().lookback
+
+	@property
+	def recursive(self):
+		"""
+		whether outputs carry state from the whole history, as EMA-type smoothing and cumulative lines do
+		"""
+		return self.get_stream().recursive
+
+	def is_stream_current(self):
+		"""
+		whether the kept streaming state is at the last bar of the current inputs
+		"""
+		inputs = self.get_inputs()
+		if self.stream is None or self.stream_inputs is None:
+			return False
+
+		return all(a is b for a, b in zip(self.stream_inputs, inputs)) and self.stream_size == len(inputs[0])
+
+	def get_extend_stream(self):
+		"""
+		streaming state at the last bar of the inputs, rebuilt from the whole history when the inputs changed
+		"""
+		inputs = self.get_inputs()
+		if not self.is_stream_current():
+			self.stream = self.get_stream()
+			self.replay(self.stream, inputs, 0, len(inputs[0]))
+			self.stream_inputs = inputs
+			self.stream_size = len(inputs[0])
+
+		return self.stream
+
+	def replay(self, stream, inputs, start, stop):
+		"""
+		advance `stream` over bars `start` to `stop` of `inputs` and return its outputs
+
+		Recursive indicators keep a copy of the stream state every `checkpoint_interval` bars, which
+		`correct` restarts from.
+		"""
+		if self.checkpoint_inputs is None or any(a is not b for a, b in zip(self.checkpoint_inputs, inputs)):
+			self.checkpoints = {}
+			self.checkpoint_inputs = inputs
+
+		interval = self.checkpoint_interval if stream.recursive else None
+		outputs = []
+		for i, bar in enumerate(zip(*[values[start:stop] for values in inputs]), start):
+			if interval and i > 0 and i % interval == 0 and i not in self.checkpoints:
+				self.checkpoints[i] = copy.deepcopy(stream)
+			outputs.append(stream.update(*bar))
+
+		if stream.n_outputs > 1:
+			return tuple(list(column) for column in zip(*outputs)) if len(outputs) > 0 else tuple([] for i in range(stream.n_outputs))
+
+		return outputs
+
+	def tail(self, count=1):
+		"""
+		the last `count` values of every output, computed from as little history as possible
+
+		Non-recursive indicators run on the last `lookback + count` bars only. Recursive ones run `calculate`
+		once, which uses the fastest backend available, and slice it; when `extend` keeps a streaming state
+		at the last bar, `tail(1)` reads that state instead. Outputs already calculated are sliced.
+		Returns a list, or a tuple of lists for multi-output indicators.
+		"""
+		if count is None or count <= 0:
+			raise Exception("`count` must be greater than 0.")
+
+		self.validate()
+		inputs = self.get_inputs()
+		size = len(inputs[0])
+		count = min(count, size)
+
+		computed = [getattr(self, name) for name in self.outputs]
+		if count == 1 and self.recursive and self.is_stream_current():
+			value = self.stream.value
+			result = [[value] for value in (value if self.stream.n_outputs > 1 else (value,))]
+		elif all(len(values) == size for values in computed) or self.recursive:
+			self.calculate()
+			result = [list(getattr(self, name)[size - count:]) for name in self.outputs]
+		else:
+			start = max(0, size - count - self.lookback)
+			window = type(self)(*[values[start:] for values in inputs], **self.get_params())
+			window.backend = self.backend
+			result = window.calculate()
+			if len(self.outputs) == 1:
+				result = (result,)
+			result = [list(values[len(values) - count:]) for values in result]
+
+		return tuple(result) if len(result) > 1 else result[0]
+
+	def latest(self):
+		"""
+		value of every output at the last bar, a tuple for multi-output indicators
+		"""
+		result = self.tail(1)
+		if isinstance(result, tuple):
+			return tuple(values[-1] for values in result)
+
+		return result[-1]
+
+	def requires_recompute(self, stream, *series):
+		"""
+		whether appending `series` also changes outputs of earlier bars
+		"""
+		return False
+
+	def extend(self, *series):
+		"""
+		append new bars to the inputs and compute only the new part of the outputs
+
+		`series` are the new values of every input, in constructor order. The outputs equal a full recompute
+		on the longer inputs. The streaming state is kept between calls, the first call after `calculate`
+		or `reset` replays the history once. That call also copies the input and output lists, so the lists
+		passed in are never modified; later calls append to the copies in place.
+		"""
+		names = get_input_names(type(self))
+		if len(series) != len(names):
+			raise Exception("`extend` expects new values for {}.".format(", ".join("`{}`".format(name) for name in names)))
+
+		if len(set(len(values) for values in series)) > 1:
+			raise Exception("new values of {} must have the same length.".format(", ".join("`{}`".format(name) for name in names)))
+
+		self.calculate()
+		stream = self.get_extend_stream()
+		if self.requires_recompute(stream, *series):
+			inputs = {name: list(values) + list(new_values) for name, values, new_values in zip(names, self.get_inputs(), series)}
+			self.reset(**inputs, **self.get_params())
+			self.stream = None
+			return self.calculate()
+
+		inputs = self.get_inputs()
+		outputs = [getattr(self, name) for name in self.outputs]
+		if self.extend_lists is None or any(a is not b for a, b in zip(self.extend_lists, inputs + outputs)):
+			inputs = [list(values) for values in inputs]
+			outputs = [list(values) for values in outputs]
+			self.stream_inputs = inputs
+			self.checkpoint_inputs = inputs
+		self.extend_lists = inputs + outputs
+
+		size = self.stream_size
+		for values, new_values in zip(inputs, series):
+			values.extend(new_values)
+		self.reset(**dict(zip(names, inputs)), **self.get_params())
+		tail = self.replay(stream, inputs, size, size + len(series[0]))
+		if len(self.outputs) == 1:
+			tail = (tail,)
+
+		for name, values, new_values in zip(self.outputs, outputs, tail):
+			values.extend(new_values)
+			setattr(self, name, values)
+
+		self.stream_size = len(inputs[0])
+
+		return self.calculate()
+
+	def correct(self, index, *series):
+		"""
+		replace the bars from `index` on with `series` and recompute only the outputs that depend on them
+
+		`series` are the corrected values of every input, in constructor order, and may be shorter or longer
+		than the bars they replace. Outputs before `index` are kept. Non-recursive indicators recompute from
+		`index - lookback`; recursive ones restart from the last checkpoint of their streaming state at or
+		before `index`, replaying from the first bar the first time.
+		"""
+		names = get_input_names(type(self))
+		if len(series) != len(names):
+			raise Exception("`correct` expects new values for {}.".format(", ".join("`{}`".format(name) for name in names)))
+
+		if len(set(len(values) for values in series)) > 1:
+			raise Exception("new values of {} must have the same length.".format(", ".join("`{}`".format(name) for name in names)))
+
+		self.calculate()
+		size = len(self.get_inputs()[0])
+		if index is None or index < 0 or index > size:
+			raise Exception("`index` must be between 0 and the number of bars.")
+
+		outputs = [list(getattr(self, name)[:index]) for name in self.outputs]
+		inputs = {name: list(values[:index]) + list(new_values) for name, values, new_values in zip(names, self.get_inputs(), series)}
+		checkpoints = {position: stream for position, stream in self.checkpoints.items() if position <= index}
+		config = get_stream_config(self.get_stream())
+
+		self.reset(**inputs, **self.get_params())
+		self.stream = None
+		self.checkpoints = checkpoints
+		self.checkpoint_inputs = self.get_inputs()
+		if index == 0 or len(self.checkpoint_inputs[0]) <= self.lookback + 1 or get_stream_config(self.get_stream()) != config:
+			self.checkpoints = {}
+			return self.calculate()
+
+		inputs = self.get_inputs()
+		if index == len(inputs[0]):
+			tail = [[] for name in self.outputs]
+		elif not self.recursive:
+			start = max(0, index - self.lookback)
+			window = type(self)(*[values[start:] for values in inputs], **self.get_params())
+			window.backend = self.backend
+			tail = window.calculate()
+			if len(self.outputs) == 1:
+				tail = (tail,)
+			tail = [values[index - start:] for values in tail]
+		else:
+			position = max(self.checkpoints) if len(self.checkpoints) > 0 else 0
+			stream = copy.deepcopy(self.checkpoints[position]) if position > 0 else self.get_stream()
+			self.replay(stream, inputs, position, index)
+			tail = self.replay(stream, inputs, index, len(inputs[0]))
+			if len(self.outputs) == 1:
+				tail = (tail,)
+			self.stream = stream
+			self.stream_inputs = inputs
+			self.stream_size = len(inputs[0])
+
+		for name, values, new_values in zip(self.outputs, outputs, tail):
+			setattr(self, name, values + list(new_values))
+
+		return self.calculate()
+
 	@abstractmethod
 	def _validate(self):
 		pass
@@ -19,7 +327,7 @@ class AbstractIndicator(ABC):
 		pass
 
 	@abstractmethod
-	def calculate(self):
+	def calculate(self, backend=None):
 		pass
 
 class AbstractPriceIndicator(AbstractIndicator):
@@ -29,6 +337,7 @@ class AbstractPriceIndicator(AbstractIndicator):
 		super().__init__()
 
 	def _validate(self):
+		self.messages = []
 		if self.prices is None:
 			self.messages.append("`prices` cannot be None.")
 		if self.prices is not None and len(self.prices) == 0:
@@ -43,7 +352,7 @@ class AbstractPriceIndicator(AbstractIndicator):
 		pass
 
 	@abstractmethod
-	def calculate(self):
+	def calculate(self, backend=None):
 		pass
 
 class AbstractHighLowPriceIndicator(AbstractIndicator):
@@ -56,6 +365,7 @@ class AbstractHighLowPriceIndicator(AbstractIndicator):
 		super().__init__()
 
 	def _validate(self):
+		self.messages = []
 		if self.prices is None:
 			self.messages.append("`prices` cannot be None.")
 		if self.prices is not None and len(self.prices) == 0:
@@ -76,7 +386,7 @@ class AbstractHighLowPriceIndicator(AbstractIndicator):
 		pass
 
 	@abstractmethod
-	def calculate(self):
+	def calculate(self, backend=None):
 		pass
 
 class AbstractMovingAverages(AbstractPriceIndicator):
@@ -159,7 +469,102 @@ class VolumeIndicator(AbstractPriceIndicator):
 		if len(self.messages) > 0:
 			raise Exception(", ".join(self.messages))
 
+class RingBuffer(object):
+
+	__slots__ = ('capacity', 'width', 'data', 'start', 'size')
+
+	def __init__(self, capacity, width=1):
+		if capacity is None or capacity <= 0:
+			raise Exception("`capacity` must be greater than 0.")
+
+		self.capacity = capacity
+		self.width = width
+		self.data = array('d', [0.0]) * (capacity * width)
+		self.start = 0
+		self.size = 0
+
+	def __len__(self):
+		return self.size
+
+	def is_full(self):
+		return self.size == self.capacity
+
+	def clear(self):
+		self.start = 0
+		self.size = 0
+
+	def append(self, *values):
+		evicted = None
+		if self.size == self.capacity:
+			offset = self.start * self.width
+			evicted = tuple(self.data[offset : offset + self.width])
+			self.start = (self.start + 1) % self.capacity
+			slot = (self.start + self.size - 1) % self.capacity
+		else:
+			slot = (self.start + self.size) % self.capacity
+			self.size += 1
+
+		offset = slot * self.width
+		for j in range(self.width):
+			self.data[offset + j] = values[j]
+
+		return evicted
 
+	def get(self, i, column=0):
+		if i < 0:
+			i += self.size
+		if i < 0 or i >= self.size:
+			raise IndexError("RingBuffer index out of range.")
+
+		return self.data[((self.start + i) % self.capacity) * self.width + column]
+
+	def column(self, column=0):
+		return [self.get(i, column) for i in range(self.size)]
+
+	def tail(self, count, column=0):
+		"""
+		the last `count` values of a column, oldest first
+		"""
+		return [self.get(i, column) for i in range(self.size - count, self.size)]
+
+	def column_sum(self, column=0):
+		total = 0.0
+		for i in range(self.size):
+			total += self.data[((self.start + i) % self.capacity) * self.width + column]
+
+		return total
+
+class AbstractStreamingIndicator(ABC):
+	"""
+	indicator state advanced one bar at a time
+
+	State is a fixed number of scalars plus ring buffers of at most `lookback + 1` bars, so memory stays
+	constant however long a stream runs. Streams declare `__slots__` and keep no per-instance dict.
+	"""
+
+	__slots__ = ('value',)
+	n_outputs = 1
+	lookback = 0
+	recursive = False
+
+	def __init__(self):
+		self.reset()
+		super().__init__()
+
+	@abstractmethod
+	def reset(self):
+		pass
+
+	@abstractmethod
+	def update(self, *bar):
+		pass
 
+	def run(self, *series):
+		outputs = [self.update(*bar) for bar in zip(*series)]
 
+		if self.n_outputs > 1:
+			if len(outputs) == 0:
+				return tuple([] for i in range(self.n_outputs))
+			return tuple(list(column) for column in zip(*outputs))
 
+		return outputs
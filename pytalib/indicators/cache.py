@@ -0,0 +1,217 @@
+"""
+Opt-in on-disk cache of indicator results.
+
+Results are keyed by a SHA-256 of the indicator class, its parameters, the bytes of its input series
+and the source code of the indicator modules, so results of an edited or upgraded package are not reused.
+They are stored as one small binary file per key: a header and the outputs as float64. Files are written
+to a temporary name and renamed into place, so processes sharing a directory only ever read complete
+files. Reads refresh the file time and, when the directory grows past `max_bytes`, the least recently
+used files are removed first. Opening a cache and evicting also remove temporary files older than
+`STALE_SECONDS`, which writers that crashed left behind.
+"""
+
+import hashlib
+import os
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from .spec import build_indicator
+
+CACHE_VERSION = 1
+MAGIC = b'PTLC'
+HEADER = struct.Struct('<4sBBxxQ')
+SUFFIX = '.bin'
+TEMP_PREFIX = '.entry-'
+STALE_SECONDS = 3600
+SOURCE_HASHES = {}
+
+def get_source_hash(module):
+	"""
+	hash of the source files of the indicator package and of `module`, computed once per process
+	"""
+	if module not in SOURCE_HASHES:
+		directory = os.path.dirname(os.path.abspath(__file__))
+		paths = sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith('.py'))
+		path = getattr(sys.modules.get(module), '__file__', None)
+		if path is not None and os.path.abspath(path) not in paths:
+			paths.append(os.path.abspath(path))
+
+		digest = hashlib.sha256()
+		for path in paths:
+			with open(path, 'rb') as f:
+				digest.update(f.read())
+		SOURCE_HASHES[module] = digest.hexdigest()
+
+	return SOURCE_HASHES[module]
+
+def get_key(indicator):
+	"""
+	content hash of an indicator's class, parameters, input series and source code
+	"""
+	digest = hashlib.sha256()
+	cls = type(indicator)
+	digest.update("{}:{}:{}.{}:{}".format(CACHE_VERSION, get_source_hash(cls.__module__), cls.__module__, cls.__qualname__, sorted(indicator.get_params().items())).encode())
+	for values in indicator.get_inputs():
+		data = array('d', values).tobytes()
+		digest.update(struct.pack('<Q', len(data)))
+		digest.update(data)
+
+	return digest.hexdigest()
+
+def encode(result):
+	outputs = result if isinstance(result, tuple) else (result,)
+	size = len(outputs[0]) if len(outputs) > 0 else 0
+	if any(len(values) != size for values in outputs):
+		raise Exception("outputs must have the same length.")
+
+	return HEADER.pack(MAGIC, CACHE_VERSION, len(outputs) if isinstance(result, tuple) else 0, size) + b''.join(array('d', values).tobytes() for values in outputs)
+
+def decode(data):
+	if len(data) < HEADER.size:
+		raise Exception("cache entry is truncated.")
+
+	magic, version, count, size = HEADER.unpack_from(data)
+	if magic != MAGIC or version != CACHE_VERSION:
+		raise Exception("cache entry has an unsupported format.")
+
+	values = array('d')
+	values.frombytes(data[HEADER.size:])
+	if len(values) != max(count, 1) * size:
+		raise Exception("cache entry is truncated.")
+
+	outputs = [values[i * size:(i + 1) * size].tolist() for i in range(max(count, 1))]
+
+	return tuple(outputs) if count > 0 else outputs[0]
+
+class ResultCache(object):
+	"""
+	directory of cached `calculate()` results, at most `max_bytes` large
+
+	Cached outputs are returned as lists of floats, so integer zeros of a warm-up come back as 0.0.
+	"""
+
+	def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+		if max_bytes is None or max_bytes <= 0:
+			raise Exception("`max_bytes` must be greater than 0.")
+
+		self.directory = directory
+		self.max_bytes = max_bytes
+		self.hits = 0
+		self.misses = 0
+		os.makedirs(directory, exist_ok=True)
+		self.remove_stale()
+		self.size = self.get_size()
+
+	def get_path(self, key):
+		return os.path.join(self.directory, key + SUFFIX)
+
+	def get_entries(self):
+		"""
+		(last use, size, path) of every entry, oldest first
+		"""
+		entries = []
+		for entry in os.scandir(self.directory):
+			if entry.name.endswith(SUFFIX):
+				try:
+					stat = entry.stat()
+				except FileNotFoundError:
+					continue
+				entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+		return sorted(entries)
+
+	def get_size(self):
+		return sum(size for mtime, size, path in self.get_entries())
+
+	def get(self, key):
+		"""
+		cached outputs under `key`, or None
+		"""
+		path = self.get_path(key)
+		try:
+			with open(path, 'rb') as f:
+				result = decode(f.read())
+			os.utime(path)
+		except FileNotFoundError:
+			return None
+		except Exception:
+			self.remove(path)
+			return None
+
+		return result
+
+	def put(self, key, result):
+		data = encode(result)
+		fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=TEMP_PREFIX)
+		try:
+			with os.fdopen(fd, 'wb') as f:
+				f.write(data)
+			os.replace(temp_path, self.get_path(key))
+		except BaseException:
+			self.remove(temp_path)
+			raise
+
+		self.size += len(data)
+		if self.size > self.max_bytes:
+			self.evict()
+
+	def remove(self, path):
+		try:
+			os.unlink(path)
+		except FileNotFoundError:
+			pass
+
+	def evict(self):
+		"""
+		remove the least recently used entries until the directory fits in `max_bytes`, and temporary
+		files older than `STALE_SECONDS`
+		"""
+		self.remove_stale()
+		entries = self.get_entries()
+		self.size = sum(size for mtime, size, path in entries)
+		for mtime, size, path in entries:
+			if self.size <= self.max_bytes:
+				break
+			self.remove(path)
+			self.size -= size
+
+	def remove_stale(self):
+		stale = time.time() - STALE_SECONDS
+		for entry in os.scandir(self.directory):
+			if entry.name.startswith(TEMP_PREFIX):
+				try:
+					if entry.stat().st_mtime < stale:
+						self.remove(entry.path)
+				except FileNotFoundError:
+					continue
+
+	def clear(self):
+		for mtime, size, path in self.get_entries():
+			self.remove(path)
+		self.size = 0
+
+	def calculate(self, indicator):
+		"""
+		`indicator.calculate()`, read from the cache when the same class, parameters and inputs were seen
+
+		Results that are not numbers throughout are returned without being cached.
+		"""
+		key = get_key(indicator)
+		result = self.get(key)
+		if result is not None:
+			self.hits += 1
+			return result
+
+		self.misses += 1
+		result = indicator.calculate()
+		try:
+			self.put(key, result)
+		except (TypeError, OverflowError):
+			pass
+
+		return result
+
+	def run_indicator(self, spec, ohlcv):
+		return self.calculate(build_indicator(spec, ohlcv))
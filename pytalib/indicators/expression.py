@@ -0,0 +1,204 @@
+"""
+Indicator expressions such as "EMA(EMA(ROC(close, 1), 25), 13)" or "SMA(high - low, 10) / ATR(14)".
+
+An expression is compiled once into planner nodes. Batch evaluation runs the plan, so every distinct
+sub-expression is computed once over the whole series; streaming evaluation advances one stream per
+distinct indicator call through a flat list of steps per bar. Both give the same values.
+
+Functions are indicator classes, by name or by the short names in `FUNCTIONS`. Leading arguments that
+are expressions are the input series of the indicator; without them it reads the default inputs, so
+`ATR(14)` uses close, high and low. The remaining arguments are its parameters, in constructor order
+or by keyword. Outputs of multi-output indicators are selected by name, e.g. `MACD(close).macd_signal_line`.
+Arithmetic is not rounded and a division by zero gives 0, as indicators do during their warm-up.
+"""
+
+import ast
+from .base import AbstractStreamingIndicator, get_input_names, get_parameter_names
+from .spec import get_indicator_class, get_series
+from . import planner
+
+FUNCTIONS = {
+	'SMA': 'SimpleMovingAverage',
+	'WMA': 'WeightedMovingAverage',
+	'EMA': 'ExponentialMovingAverage',
+	'MACD': 'MovingAverageConvergenceDivergence',
+	'ROC': 'RateOfChange',
+	'RSI': 'RelativeStrengthIndex',
+	'ATR': 'AverageTrueRange',
+	'STD': 'StandardDeviation',
+	'ADX': 'AverageDirectionalIndex',
+	'CCI': 'CommodityChannelIndex',
+	'OBV': 'OnBalanceVolume',
+}
+
+SERIES = {'close': 'prices', 'prices': 'prices', 'open': 'open', 'high': 'high', 'low': 'low', 'volume': 'volume'}
+
+OPERATORS = {ast.Add: '+', ast.Sub: '-', ast.Mult: '*', ast.Div: '/'}
+
+def is_constant(tree):
+	return isinstance(tree, ast.Constant) and isinstance(tree.value, (int, float, str)) and not isinstance(tree.value, bool)
+
+def _compile(tree, text, multi=False):
+	if isinstance(tree, ast.Name):
+		if tree.id not in SERIES:
+			raise Exception("Unknown series `{}` in `{}`.".format(tree.id, text))
+		return planner.source(SERIES[tree.id])
+	elif is_constant(tree) and not isinstance(tree.value, str):
+		return planner.constant(tree.value)
+	elif isinstance(tree, ast.BinOp) and type(tree.op) in OPERATORS:
+		return planner.operation('arithmetic', _compile(tree.left, text), _compile(tree.right, text), operator=OPERATORS[type(tree.op)])
+	elif isinstance(tree, ast.UnaryOp) and isinstance(tree.op, ast.USub):
+		return planner.operation('negate', _compile(tree.operand, text))
+	elif isinstance(tree, ast.UnaryOp) and isinstance(tree.op, ast.UAdd):
+		return _compile(tree.operand, text)
+	elif isinstance(tree, ast.Attribute) and isinstance(tree.value, ast.Call):
+		node = _compile(tree.value, text, multi=True)
+		if tree.attr not in node.target.outputs:
+			raise Exception("`{}` has no output `{}`.".format(node.target.__name__, tree.attr))
+		if len(node.target.outputs) == 1:
+			return node
+		return planner.output(node, node.target.outputs.index(tree.attr))
+	elif isinstance(tree, ast.Call) and isinstance(tree.func, ast.Name):
+		cls = get_indicator_class(FUNCTIONS.get(tree.func.id, tree.func.id))
+		args = list(tree.args)
+		inputs = []
+		while len(args) > 0 and not is_constant(args[0]):
+			inputs.append(_compile(args.pop(0), text))
+		if len(inputs) == 0:
+			inputs = [planner.source(name) for name in get_input_names(cls)]
+
+		names = get_parameter_names(cls)
+		if len(args) > len(names) or not all(is_constant(arg) for arg in args + [keyword.value for keyword in tree.keywords]):
+			raise Exception("Invalid arguments for `{}` in `{}`.".format(tree.func.id, text))
+		params = {name: arg.value for name, arg in zip(names, args)}
+		params.update({keyword.arg: keyword.value.value for keyword in tree.keywords})
+
+		node = planner.indicator(cls, *inputs, **params)
+		if len(cls.outputs) > 1 and not multi:
+			raise Exception("`{}` has several outputs, select one of {}.".format(tree.func.id, ", ".join(cls.outputs)))
+		return node
+
+	raise Exception("Unsupported expression `{}`.".format(ast.unparse(tree) if hasattr(ast, 'unparse') else text))
+
+def compile_node(text):
+	"""
+	planner node computing the expression `text`
+	"""
+	try:
+		tree = ast.parse(text.strip(), mode='eval').body
+	except SyntaxError:
+		raise Exception("Invalid expression `{}`.".format(text))
+
+	return _compile(tree, text)
+
+class Expression(object):
+	"""
+	compiled expression, evaluated over whole series with `calculate` or bar by bar with `get_stream`
+
+	`inputs` are the series the expression reads, in the order a stream's `update` takes them.
+	"""
+
+	def __init__(self, text):
+		self.text = text
+		self.plan = planner.Plan([compile_node(text)])
+		self.inputs = self.plan.sources
+
+		if len(self.inputs) == 0:
+			raise Exception("`{}` does not use any input series.".format(text))
+
+	def calculate(self, ohlcv):
+		"""
+		values of the expression at every bar of `ohlcv`, which maps "close", "high", ... to series
+		"""
+		series = {}
+		for name in self.inputs:
+			values = get_series(ohlcv, name)
+			series[name] = values.tolist() if hasattr(values, 'tolist') else list(values)
+
+		return self.plan.run(series)[0]
+
+	def get_stream(self):
+		return ExpressionStream(self)
+
+	@property
+	def lookback(self):
+		return self.get_stream().lookback
+
+	@property
+	def recursive(self):
+		return self.get_stream().recursive
+
+def compile_expression(text):
+	return Expression(text)
+
+class ExpressionStream(AbstractStreamingIndicator):
+	"""
+	expression advanced one bar at a time, `update` takes one value per series in `Expression.inputs`
+
+	The program is a list of (kind, argument, input slots) steps, each writing one slot: an input series,
+	a constant, a stream, one output of a stream, an arithmetic operator or a negation. The last slot
+	is the value of the expression.
+	"""
+
+	__slots__ = ('program', 'slots')
+
+	def __init__(self, expression):
+		slots = {}
+		self.program = []
+		for node in expression.plan.steps:
+			children = tuple(slots[child.key] for child in node.inputs)
+			if node.op == 'source':
+				step = ('input', expression.inputs.index(node.target), children)
+			elif node.op == 'constant':
+				step = ('constant', node.target, children)
+			elif node.op == 'indicator':
+				step = ('stream', node.target(**{name: [] for name in get_input_names(node.target)}, **node.params).get_stream(), children)
+			elif node.op == 'output':
+				step = ('output', node.target, children)
+			elif node.target == 'arithmetic':
+				step = ('arithmetic', node.params['operator'], children)
+			else:
+				step = ('negate', None, children)
+			slots[node.key] = len(self.program)
+			self.program.append(step)
+		super().__init__()
+
+	@property
+	def lookback(self):
+		lookbacks = []
+		for kind, argument, children in self.program:
+			lookback = max([lookbacks[i] for i in children], default=0)
+			lookbacks.append(lookback + argument.lookback if kind == 'stream' else lookback)
+
+		return lookbacks[-1]
+
+	@property
+	def recursive(self):
+		return any(argument.recursive for kind, argument, children in self.program if kind == 'stream')
+
+	def reset(self):
+		for kind, argument, children in self.program:
+			if kind == 'stream':
+				argument.reset()
+		self.slots = [None] * len(self.program)
+		self.value = None
+
+	def update(self, *bar):
+		slots = self.slots
+		for i, (kind, argument, children) in enumerate(self.program):
+			if kind == 'stream':
+				slots[i] = argument.update(*[slots[j] for j in children])
+			elif kind == 'arithmetic':
+				slots[i] = planner.apply(argument, slots[children[0]], slots[children[1]])
+			elif kind == 'input':
+				slots[i] = bar[argument]
+			elif kind == 'constant':
+				slots[i] = argument
+			elif kind == 'output':
+				slots[i] = slots[children[0]][argument]
+			else:
+				slots[i] = -slots[children[0]]
+
+		self.value = slots[-1]
+
+		return self.value
@@ -0,0 +1,160 @@
+"""
+Feature matrices of many indicators over one OHLCV series.
+
+`build_features` computes every spec into one preallocated 2-D array, one named column per output.
+Series that several indicators need, such as moving averages of the close, the true range, the
+typical price, gains and losses or the MACD line, are computed once and shared. Indicators with a
+vectorized form use it; the others run their class.
+"""
+
+import numpy as np
+from . import vectorized
+from .spec import normalize_spec, get_columns, get_series, build_indicator, run_indicator
+
+class Intermediates(object):
+	"""
+	series shared between the indicators of one OHLCV input, each computed once
+
+	Intermediates are keyed by tuples; a moving average takes the key of its source, or the name of an
+	input series such as "close".
+	"""
+
+	def __init__(self, ohlcv):
+		self.ohlcv = ohlcv
+		self.cache = {}
+
+	def get(self, key, compute):
+		if key not in self.cache:
+			self.cache[key] = compute()
+
+		return self.cache[key]
+
+	def series(self, name):
+		return self.get(('series', name), lambda: np.asarray(get_series(self.ohlcv, name), dtype=np.float64))
+
+	def resolve(self, source):
+		return self.series(source) if isinstance(source, str) else self.cache[source]
+
+	def moving_average(self, source, period, ma_type='SMA'):
+		return self.get(('ma', source, period, ma_type), lambda: vectorized.moving_average(self.resolve(source), period, ma_type))
+
+	def gain_loss(self):
+		return self.get(('gain_loss',), lambda: vectorized.gain_loss(self.series('prices')))
+
+	def typical_price(self):
+		return self.get(('typical_price',), lambda: vectorized.typical_price(self.series('prices'), self.series('high'), self.series('low')))
+
+	def true_range(self):
+		return self.get(('true_range',), lambda: vectorized.true_range(self.series('prices'), self.series('high'), self.series('low')))
+
+	def standard_deviation(self, period):
+		return self.get(('std', period), lambda: vectorized.standard_deviation(self.series('prices'), period))
+
+	def macd(self, f_ema_period, s_ema_period):
+		return self.get(('macd', f_ema_period, s_ema_period), lambda: vectorized.round_exact(
+			self.moving_average('prices', f_ema_period, 'EMA') - self.moving_average('prices', s_ema_period, 'EMA'), 2))
+
+	def force_index(self):
+		def compute():
+			prices = self.series('prices')
+			fi = np.zeros(len(prices))
+			fi[1:] = vectorized.round_exact((prices[1:] - prices[:-1]) * self.series('volume')[1:], 2)
+			return fi
+
+		return self.get(('force_index',), compute)
+
+	def ease_of_movement(self):
+		return self.get(('ease_of_movement',), lambda: vectorized.ease_of_movement(self.series('high'), self.series('low'), self.series('volume')))
+
+def _bands(ma, width):
+	return (vectorized.round_exact(ma + width, 2), ma, vectorized.round_exact(ma - width, 2))
+
+def _macd(inter, f_ema_period=12, s_ema_period=26, signal_period=9):
+	inter.macd(f_ema_period, s_ema_period)
+	key = ('macd', f_ema_period, s_ema_period)
+	return (inter.resolve(key), inter.moving_average(key, signal_period, 'EMA'))
+
+def _bollinger_bands(inter, period=20, ma_type='SMA', num_std=2):
+	return _bands(inter.moving_average('prices', period, ma_type), num_std * inter.standard_deviation(period))
+
+def _keltner_channel(inter, ma_type='EMA', ma_period=20, atr_period=10, num_atr=2, atr_ma_type='SMA'):
+	inter.true_range()
+	return _bands(inter.moving_average('prices', ma_period, ma_type), num_atr * inter.moving_average(('true_range',), atr_period, atr_ma_type))
+
+def _force_index(inter, period=13, ma_type='EMA'):
+	inter.force_index()
+	return (inter.moving_average(('force_index',), period, ma_type),)
+
+def _ease_of_movement(inter, period=14, ma_type='SMA'):
+	inter.ease_of_movement()
+	return (inter.moving_average(('ease_of_movement',), period, ma_type),)
+
+def _average_true_range(inter, period=14, ma_type='SMA'):
+	inter.true_range()
+	return (inter.moving_average(('true_range',), period, ma_type),)
+
+FEATURES = {
+	'SimpleMovingAverage': lambda inter, period=20: (inter.moving_average('prices', period, 'SMA'),),
+	'WeightedMovingAverage': lambda inter, period=20: (inter.moving_average('prices', period, 'WMA'),),
+	'ExponentialMovingAverage': lambda inter, period=20: (inter.moving_average('prices', period, 'EMA'),),
+	'MovingAverageConvergenceDivergence': _macd,
+	'RelativeStrengthIndex': lambda inter, period=14: (vectorized.relative_strength_index_from_gain_loss(*inter.gain_loss(), period),),
+	'MoneyFlowIndex': lambda inter, period=14: (vectorized.money_flow_index_from_typical_price(inter.typical_price(), inter.series('prices'), inter.series('volume'), period),),
+	'UltimateOscillator': lambda inter, **params: (vectorized.ultimate_oscillator(inter.series('prices'), inter.series('high'), inter.series('low'), **params),),
+	'AverageTrueRange': _average_true_range,
+	'StandardDeviation': lambda inter, period=20: (inter.standard_deviation(period),),
+	'BollingerBands': _bollinger_bands,
+	'KeltnerChannel': _keltner_channel,
+	'AccumulationDistributionLine': lambda inter: (vectorized.accumulation_distribution_line(inter.series('prices'), inter.series('high'), inter.series('low'), inter.series('volume')),),
+	'EaseOfMovement': _ease_of_movement,
+	'ForceIndex': _force_index,
+}
+
+class FeatureMatrix(object):
+
+	def __init__(self, values, columns):
+		self.values = values
+		self.columns = columns
+		self.index = {column: i for i, column in enumerate(columns)}
+
+	def __getitem__(self, column):
+		return self.values[:, self.index[column]]
+
+	def __len__(self):
+		return self.values.shape[0]
+
+def build_features(specs, ohlcv, dtype=np.float64):
+	"""
+	run every indicator spec on `ohlcv` into one (bars, columns) array
+
+	`specs` are given as in `run_universe` and `ohlcv` maps "open", "high", "low", "close" and "volume" to
+	equal length series. Inputs are validated as each class does, and column values equal its `calculate()`.
+	"""
+	specs = [normalize_spec(spec) for spec in specs]
+	columns = [get_columns(spec) for spec in specs]
+	size = len(get_series(ohlcv, 'prices'))
+
+	if len(set(column for names in columns for column in names)) != sum(len(names) for names in columns):
+		raise Exception("`specs` cannot contain the same indicator twice.")
+
+	matrix = FeatureMatrix(np.empty((size, sum(len(names) for names in columns)), dtype=dtype), [column for names in columns for column in names])
+	inter = Intermediates(ohlcv)
+	offset = 0
+	for spec, names in zip(specs, columns):
+		name, params = spec
+		if name in FEATURES:
+			indicator = build_indicator(spec, ohlcv)
+			indicator.validate()
+			outputs = FEATURES[name](inter, **indicator.get_params())
+		else:
+			outputs = run_indicator(spec, ohlcv)
+			if not isinstance(outputs, tuple):
+				outputs = (outputs,)
+
+		if len(outputs) != len(names):
+			raise Exception("`{}` returned {} outputs for {} columns.".format(name, len(outputs), len(names)))
+		for k, output in enumerate(outputs):
+			matrix.values[:, offset + k] = output
+		offset += len(names)
+
+	return matrix
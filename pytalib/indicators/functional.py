@@ -0,0 +1,149 @@
+"""
+Stateless functions over every indicator.
+
+Each call works on its own arrays or on an indicator instance it creates, nothing is shared between
+calls, so the functions can be used from several threads at once. Inputs are any sequence of numbers,
+outputs are float64 arrays, or a tuple of arrays for multi-output indicators. The functions backed by
+`vectorized`, `kernels` (compiled with nogil when Numba is installed) and the registered backends spend
+most of their time outside the GIL, the others run the pure-python classes.
+"""
+
+import numpy as np
+from . import vectorized
+from .backend import dispatch
+from .trend import MovingAverageConvergenceDivergence, Trix, CommodityChannelIndex, DetrendedPriceOscillator, MassIndex, VortexIndicator
+from .momentum import RateOfChange, StochasticOscillator, TrueStrengthIndex, Williams, KnowSureThingOscillator
+from .volatility import AverageTrueRange, PriceChannel, KeltnerChannel
+from .volume import ForceIndex, NegativeVolumeIndex, OnBalanceVolume, PutCallRatio
+
+def _validate(period, *series):
+	messages = []
+	if period is None or period <= 0:
+		messages.append("`period` must be positive.")
+
+	if any(len(values) == 0 for values in series):
+		messages.append("input series cannot be empty.")
+	elif len(set(len(values) for values in series)) > 1:
+		messages.append("input series must have the same length.")
+	elif period is not None and period > len(series[0]):
+		messages.append("`period` cannot be greater than length of input series.")
+
+	if len(messages) > 0:
+		raise Exception(", ".join(messages))
+
+def _as_lists(*series):
+	return [np.asarray(values, dtype=np.float64).tolist() for values in series]
+
+def _as_arrays(result):
+	if isinstance(result, tuple):
+		return tuple(np.asarray(values, dtype=np.float64) for values in result)
+
+	return np.asarray(result, dtype=np.float64)
+
+def _run(cls, *series, **kwargs):
+	return _as_arrays(cls(*_as_lists(*series), **kwargs).calculate())
+
+def sma(prices, period=20):
+	_validate(period, prices)
+	return vectorized.simple_moving_average(prices, period)
+
+def wma(prices, period=20):
+	_validate(period, prices)
+	return vectorized.weighted_moving_average(prices, period)
+
+def ema(prices, period=20):
+	_validate(period, prices)
+	return vectorized.exponential_moving_average(prices, period)
+
+def macd(prices, f_ema_period=12, s_ema_period=26, signal_period=9):
+	return _run(MovingAverageConvergenceDivergence, prices, f_ema_period=f_ema_period, s_ema_period=s_ema_period, signal_period=signal_period)
+
+def trix(prices, period=15):
+	return _run(Trix, prices, period=period)
+
+def adx(prices, high, low, period=14, backend=None):
+	"""
+	average directional index, with `backend` selecting the implementation as in `calculate`
+	"""
+	_validate(period, prices, high, low)
+	result, used = dispatch('average_directional_index', *_as_lists(prices, high, low), period, backend=backend)
+	return np.asarray(result[0], dtype=np.float64)
+
+def cci(prices, high, low, period=14, cci_constant=0.015):
+	return _run(CommodityChannelIndex, prices, high, low, period=period, cci_constant=cci_constant)
+
+def dpo(prices, period=20):
+	return _run(DetrendedPriceOscillator, prices, period=period)
+
+def mass_index(prices, high, low, mi_period=25, ema_period=9):
+	return _run(MassIndex, prices, high, low, mi_period=mi_period, ema_period=ema_period)
+
+def vortex(prices, high, low, period=21):
+	return _run(VortexIndicator, prices, high, low, period=period)
+
+def roc(prices, period=9):
+	return _run(RateOfChange, prices, period=period)
+
+def rsi(prices, period=14):
+	_validate(period, prices)
+	return vectorized.relative_strength_index(prices, period)
+
+def stochastic(prices, high, low, k_period=14, d_period=3):
+	return _run(StochasticOscillator, prices, high, low, k_period=k_period, d_period=d_period)
+
+def mfi(prices, high, low, volume, period=14):
+	_validate(period, prices, high, low, volume)
+	return vectorized.money_flow_index(prices, high, low, volume, period)
+
+def tsi(prices, r_period=25, s_period=13):
+	return _run(TrueStrengthIndex, prices, r_period=r_period, s_period=s_period)
+
+def ultimate_oscillator(prices, high, low, s_period=7, m_period=14, l_period=28, s_weight=4, m_weight=2, l_weight=1):
+	_validate(max(s_period, m_period, l_period), prices, high, low)
+	return vectorized.ultimate_oscillator(prices, high, low, s_period, m_period, l_period, s_weight, m_weight, l_weight)
+
+def williams(prices, high, low, period=14):
+	return _run(Williams, prices, high, low, period=period)
+
+def kst(prices, **kwargs):
+	"""
+	know sure thing oscillator and its signal line, keyword arguments as in `KnowSureThingOscillator`
+	"""
+	return _run(KnowSureThingOscillator, prices, **kwargs)
+
+def atr(prices, high, low, period=14, ma_type='SMA'):
+	return _run(AverageTrueRange, prices, high, low, period=period, ma_type=ma_type)
+
+def stddev(prices, period=20):
+	_validate(period, prices)
+	return vectorized.standard_deviation(prices, period)
+
+def bollinger_bands(prices, period=20, ma_type='SMA', num_std=2):
+	_validate(period, prices)
+	return vectorized.bollinger_bands(prices, period, ma_type, num_std)
+
+def price_channel(prices, high, low, period=20):
+	return _run(PriceChannel, prices, high, low, period=period)
+
+def keltner_channel(prices, high, low, ma_type='EMA', ma_period=20, atr_period=10, num_atr=2, atr_ma_type='SMA'):
+	return _run(KeltnerChannel, prices, high, low, ma_type=ma_type, ma_period=ma_period, atr_period=atr_period, num_atr=num_atr, atr_ma_type=atr_ma_type)
+
+def adl(prices, high, low, volume):
+	_validate(1, prices, high, low, volume)
+	return vectorized.accumulation_distribution_line(prices, high, low, volume)
+
+def emv(prices, high, low, volume, period=14, ma_type='SMA'):
+	_validate(period, prices, high, low, volume)
+	return vectorized.moving_average(vectorized.ease_of_movement(high, low, volume), period, ma_type)
+
+def force_index(prices, volume, period=13, ma_type='EMA'):
+	return _run(ForceIndex, prices, volume, period=period, ma_type=ma_type)
+
+def nvi(prices, volume, period=255, ma_type='EMA'):
+	return _run(NegativeVolumeIndex, prices, volume, period=period, ma_type=ma_type)
+
+def obv(prices, volume):
+	return _run(OnBalanceVolume, prices, volume)
+
+def put_call_ratio(prices, put_volume, call_volume):
+	return _run(PutCallRatio, prices, put_volume, call_volume)
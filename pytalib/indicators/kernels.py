@@ -0,0 +1,105 @@
+import math
+import numpy as np
+from ..jit import jit
+
+@jit
+def round_half_even(value, decimals):
+	scale = 10.0 ** decimals
+	scaled = value * scale
+	if math.isnan(scaled) or math.isinf(scaled) or abs(scaled) >= 4503599627370496.0:
+		return value
+
+	splitter = 134217729.0 * value
+	value_hi = splitter - (splitter - value)
+	value_lo = value - value_hi
+	error = (value_hi * scale - scaled) + value_lo * scale
+
+	rounded = math.floor(scaled)
+	fraction = scaled - rounded
+	if fraction > 0.5 or (fraction == 0.5 and (error > 0 or (error == 0 and rounded % 2 == 1))):
+		rounded += 1.0
+
+	return rounded / scale
+
+@jit
+def exponential_moving_average(values, period):
+	out = np.empty(values.shape[0])
+	multiplier = 2 / (period + 1)
+
+	for i in range(values.shape[0]):
+		if i == 0:
+			out[i] = values[i]
+		else:
+			out[i] = round_half_even((values[i] - out[i - 1]) * multiplier + out[i - 1], 2)
+
+	return out
+
+@jit
+def weighted_moving_average(values, period):
+	out = np.zeros(values.shape[0])
+	denominator = period * (period + 1) // 2
+	total_price = 0.0
+	numerator = 0.0
+
+	for i in range(values.shape[0]):
+		if i == period - 1:
+			total_price = 0.0
+			numerator = 0.0
+			for j in range(period):
+				total_price += values[j]
+				numerator += (j + 1) * values[j]
+			out[i] = round_half_even(numerator / denominator, 2)
+		elif i >= period:
+			numerator = numerator + period * values[i] - total_price
+			total_price = total_price + values[i] - values[i - period]
+			out[i] = round_half_even(numerator / denominator, 2)
+
+	return out
+
+@jit
+def average_directional_index(prices, high, low, period):
+	n = prices.shape[0]
+	adx = np.zeros(n)
+	pos_di = np.zeros(n)
+	neg_di = np.zeros(n)
+	multiplier = 2 / (period + 1)
+
+	period_tr = 0.0
+	pos_period_dm = 0.0
+	neg_period_dm = 0.0
+	pos_dm_ema = 0.0
+	neg_dm_ema = 0.0
+
+	for i in range(1, n):
+		tr = round_half_even(max(abs(high[i] - low[i]), abs(low[i] - low[i - 1]), abs(high[i] - prices[i - 1])), 2)
+		up_move = high[i] - high[i - 1]
+		down_move = low[i - 1] - low[i]
+		pos_dm = round_half_even(up_move, 2) if up_move > down_move and up_move > 0 else 0.0
+		neg_dm = round_half_even(down_move, 2) if down_move > up_move and down_move > 0 else 0.0
+
+		if i <= period:
+			period_tr += tr
+			pos_period_dm += pos_dm
+			neg_period_dm += neg_dm
+		else:
+			period_tr = round_half_even(period_tr - (period_tr / period) + tr, 2)
+			pos_period_dm = round_half_even(pos_period_dm - (pos_period_dm / period) + pos_dm, 2)
+			neg_period_dm = round_half_even(neg_period_dm - (neg_period_dm / period) + neg_dm, 2)
+
+		if i == period:
+			period_tr = round_half_even(period_tr, 2)
+			pos_period_dm = round_half_even(pos_period_dm, 2)
+			neg_period_dm = round_half_even(neg_period_dm, 2)
+
+		if i >= period:
+			pos_dm_ema = round_half_even((pos_period_dm - pos_dm_ema) * multiplier + pos_dm_ema, 2)
+			neg_dm_ema = round_half_even((neg_period_dm - neg_dm_ema) * multiplier + neg_dm_ema, 2)
+
+			if period_tr != 0:
+				pos_di[i] = round_half_even((pos_dm_ema / period_tr) * 100, 2)
+				neg_di[i] = round_half_even((neg_dm_ema / period_tr) * 100, 2)
+
+			if pos_di[i] + neg_di[i] != 0:
+				adx[i] = round_half_even((abs(pos_di[i] - neg_di[i]) / (pos_di[i] + neg_di[i])) * 100, 2)
+
+	return adx, pos_di, neg_di
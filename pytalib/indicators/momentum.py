@@ -1,8 +1,12 @@
-from .base import MomentumIndicator, AbstractPriceIndicator, AbstractHighLowPriceIndicator
-from .trend import SimpleMovingAverage, ExponentialMovingAverage
+from .base import MomentumIndicator, AbstractPriceIndicator, AbstractHighLowPriceIndicator, AbstractStreamingIndicator, RingBuffer
+from .trend import SimpleMovingAverage, ExponentialMovingAverage, SimpleMovingAverageStream, ExponentialMovingAverageStream
+from . import vectorized
+from .backend import register
 
 class RateOfChange(MomentumIndicator):
 
+	outputs = ('roc',)
+
 	def __init__(self, prices=[], period=9):
 		self.roc = []
 		super().__init__(prices, period)
@@ -12,11 +16,12 @@ class RateOfChange(MomentumIndicator):
 		self.period = period
 		self.roc = []
 	
-	def calculate(self):
+	def calculate(self, backend=None):
 		if len(self.roc) != 0:
 			return self.roc
 
 		self.validate()
+		self.set_backend_used()
 
 		for i in range(len(self.prices)):
 			if i < self.period:
@@ -29,8 +34,45 @@ class RateOfChange(MomentumIndicator):
 					
 		return self.roc
 
+	def get_stream(self):
+		return RateOfChangeStream(self.period)
+
+class RateOfChangeStream(AbstractStreamingIndicator):
+
+	__slots__ = ('period', 'window')
+
+	def __init__(self, period=9):
+		if period is None or period <= 0:
+			raise Exception("`period` cannot be None.")
+
+		self.period = period
+		super().__init__()
+
+	@property
+	def lookback(self):
+		return self.period
+
+	def reset(self):
+		self.window = RingBuffer(self.period + 1)
+		self.value = None
+
+	def update(self, price):
+		self.window.append(price)
+
+		if not self.window.is_full():
+			self.value = 0.00
+		else:
+			try:
+				self.value = round((price - self.window.get(0)) / self.window.get(0), 2)
+			except ZeroDivisionError:
+				self.value = 0.00
+
+		return self.value
+
 class RelativeStrengthIndex(MomentumIndicator):
 
+	outputs = ('rsi',)
+
 	def __init__(self, prices=[], period=14):
 		self.rsi = []
 		self.rs = []
@@ -97,27 +139,73 @@ class RelativeStrengthIndex(MomentumIndicator):
 		for i in range(len(avg_gain)):
 			if i < self.period:
 				self.rs.append(0.00)
+			elif avg_loss[i] == 0:
+				self.rs.append(float('inf'))
 			else:
 				self.rs.append(round(avg_gain[i] / avg_loss[i], 2))
 
 		return self.rs
 
-	def calculate(self):
+	def calculate(self, backend=None):
 		if len(self.rsi) != 0:
 			return self.rsi
 
 		self.validate()
 
-		rs = self.get_rs()
-		for i in range(len(rs)):
-			if i < self.period:
-				self.rsi.append(0.00)
-			else:
-				self.rsi.append(round((100 - 100 / (1 + rs[i])), 2))
+		self.rsi = self.dispatch('relative_strength_index', self.prices, self.period, backend=backend)
 
 		return self.rsi
 
+	def get_stream(self):
+		return RelativeStrengthIndexStream(self.period)
+
+class RelativeStrengthIndexStream(AbstractStreamingIndicator):
+
+	__slots__ = ('period', 'window', 'prev_price', 'count')
+
+	def __init__(self, period=14):
+		if period is None or period <= 0:
+			raise Exception("`period` cannot be None.")
+
+		self.period = period
+		super().__init__()
+
+	@property
+	def lookback(self):
+		return self.period
+
+	def reset(self):
+		self.window = RingBuffer(self.period, 2)
+		self.prev_price = None
+		self.count = 0
+		self.value = None
+
+	def update(self, price):
+		if self.prev_price is None or price == self.prev_price:
+			self.window.append(0.00, 0.00)
+		elif price > self.prev_price:
+			self.window.append(round(price - self.prev_price, 2), 0.00)
+		else:
+			self.window.append(0.00, round(self.prev_price - price, 2))
+
+		self.prev_price = price
+		self.count += 1
+
+		if self.count <= self.period:
+			self.value = 0.00
+		else:
+			avg_gain = round(self.window.column_sum(0) / self.period, 2)
+			avg_loss = round(self.window.column_sum(1) / self.period, 2)
+			if avg_loss == 0:
+				self.value = 100.00
+			else:
+				self.value = round((100 - 100 / (1 + round(avg_gain / avg_loss, 2))), 2)
+
+		return self.value
+
 class StochasticOscillator(AbstractHighLowPriceIndicator):
+
+	outputs = ('stc', 'stc_sma')
 	
 	def __init__(self, prices=[], high=[], low=[], k_period=14, d_period=3):
 		self.k_period = k_period
@@ -167,25 +255,70 @@ class StochasticOscillator(AbstractHighLowPriceIndicator):
 
 		return self.stc
 
-	def get_stc_sma(self):
+	def get_stc_sma(self, backend=None):
 		if len(self.stc_sma) != 0:
 			return self.stc_sma
 
 		stc = self.get_stc()
 		sma = SimpleMovingAverage(stc, self.d_period)
-		self.stc_sma = sma.calculate()
+		self.stc_sma = sma.calculate(self.select_backend(backend))
+		self.set_backend_used(sma)
 
 		return self.stc_sma
 
-	def calculate(self):
+	def calculate(self, backend=None):
 		if len(self.stc_sma) != 0 and len(self.stc) != 0:
 			return (self.stc, self.stc_sma)
 
 		self.validate()
 
-		return (self.get_stc(), self.get_stc_sma())
+		return (self.get_stc(), self.get_stc_sma(backend))
+
+	def get_stream(self):
+		return StochasticOscillatorStream(self.k_period, self.d_period)
+
+class StochasticOscillatorStream(AbstractStreamingIndicator):
+
+	n_outputs = 2
+	__slots__ = ('k_period', 'd_period', 'sma', 'window', 'count')
+
+	def __init__(self, k_period=14, d_period=3):
+		if k_period is None or k_period <= 0:
+			raise Exception("`k_period` cannot be None.")
+
+		self.k_period = k_period
+		self.d_period = d_period
+		self.sma = SimpleMovingAverageStream(d_period)
+		super().__init__()
+
+	@property
+	def lookback(self):
+		return self.k_period + self.sma.lookback
+
+	def reset(self):
+		self.sma.reset()
+		self.window = RingBuffer(self.k_period, 2)
+		self.count = 0
+		self.value = None
+
+	def update(self, price, high, low):
+		self.window.append(high, low)
+		self.count += 1
+
+		if self.count <= self.k_period:
+			stc = 0.00
+		else:
+			period_low = min(self.window.column(1))
+			period_high = max(self.window.column(0))
+			stc = round( 100 * (price - period_low) / (period_high - period_low), 2)
+
+		self.value = (stc, self.sma.update(stc))
+
+		return self.value
 
 class MoneyFlowIndex(AbstractHighLowPriceIndicator):
+
+	outputs = ('mfi',)
 	
 	def __init__(self, prices=[], high=[], low=[], volume=[], period=14):
 		self.volume = volume
@@ -296,23 +429,63 @@ class MoneyFlowIndex(AbstractHighLowPriceIndicator):
 
 		return self.period_neg_mf
 
-	def calculate(self):
+	def calculate(self, backend=None):
 		if len(self.mfi) != 0:
 			return self.mfi
 
-		period_pos_mf = self.get_period_pos_mf()
-		period_neg_mf = self.get_period_neg_mf()
-		for i in range(len(self.prices)):
-			if i < self.period + 1:
-				self.mfi.append(0.00)
-			else:
-				ratio = period_pos_mf[i] / period_neg_mf[i]
-				self.mfi.append(round(100 - 100 / (1 + ratio), 2))
+		self.mfi = self.dispatch('money_flow_index', self.prices, self.high, self.low, self.volume, self.period, backend=backend)
 
 		return self.mfi
 
+	def get_stream(self):
+		return MoneyFlowIndexStream(self.period)
+
+class MoneyFlowIndexStream(AbstractStreamingIndicator):
+
+	__slots__ = ('period', 'window', 'prev_price', 'count')
+
+	def __init__(self, period=14):
+		if period is None or period <= 0:
+			raise Exception("`period` cannot be None.")
+
+		self.period = period
+		super().__init__()
+
+	@property
+	def lookback(self):
+		return self.period + 1
+
+	def reset(self):
+		self.window = RingBuffer(self.period, 2)
+		self.prev_price = None
+		self.count = 0
+		self.value = None
+
+	def update(self, price, high, low, volume):
+		raw_mf = round(round((high + low + price) / 3, 2) * volume, 2)
+
+		if self.prev_price is None or price == self.prev_price:
+			self.window.append(0.00, 0.00)
+		elif price > self.prev_price:
+			self.window.append(raw_mf, 0.00)
+		else:
+			self.window.append(0.00, raw_mf)
+
+		self.prev_price = price
+		self.count += 1
+
+		if self.count <= self.period + 1:
+			self.value = 0.00
+		else:
+			ratio = round(self.window.column_sum(0), 2) / round(max(self.window.column_sum(1), 1), 2)
+			self.value = round(100 - 100 / (1 + ratio), 2)
+
+		return self.value
+
 class TrueStrengthIndex(AbstractPriceIndicator):
 
+	outputs = ('tsi',)
+
 	def __init__(self, prices=[], r_period=25, s_period=13):
 		self.r_period = r_period
 		self.s_period = s_period
@@ -361,21 +534,23 @@ class TrueStrengthIndex(AbstractPriceIndicator):
 
 		return (self.momentum, self.abs_momentum)
 
-	def calculate(self):
+	def calculate(self, backend=None):
 		if len(self.tsi) != 0:
 			return self.tsi
 
 		momentum, abs_momentum = self.get_momentums()
+		backend = self.select_backend(backend)
 
 		ema = ExponentialMovingAverage(momentum, self.r_period)
-		momentum_ema = ema.calculate()
+		momentum_ema = ema.calculate(backend)
 		ema.reset(momentum_ema, self.s_period)
-		smoothed_momentum_ema = ema.calculate()
+		smoothed_momentum_ema = ema.calculate(backend)
 
 		ema.reset(abs_momentum, self.r_period)
-		abs_momentum_ema = ema.calculate()
+		abs_momentum_ema = ema.calculate(backend)
 		ema.reset(abs_momentum_ema, self.s_period)
-		smoothed_abs_momentum_ema = ema.calculate()
+		smoothed_abs_momentum_ema = ema.calculate(backend)
+		self.set_backend_used(ema)
 
 		for i in range(len(smoothed_momentum_ema)):
 			if i == 0:
@@ -385,7 +560,58 @@ class TrueStrengthIndex(AbstractPriceIndicator):
 
 		return self.tsi
 
+	def get_stream(self):
+		return TrueStrengthIndexStream(self.r_period, self.s_period)
+
+class TrueStrengthIndexStream(AbstractStreamingIndicator):
+
+	__slots__ = ('r_period', 's_period', 'momentum_ema', 'smoothed_momentum_ema', 'abs_momentum_ema', 'smoothed_abs_momentum_ema', 'prev_price')
+
+	def __init__(self, r_period=25, s_period=13):
+		self.r_period = r_period
+		self.s_period = s_period
+		self.momentum_ema = ExponentialMovingAverageStream(r_period)
+		self.smoothed_momentum_ema = ExponentialMovingAverageStream(s_period)
+		self.abs_momentum_ema = ExponentialMovingAverageStream(r_period)
+		self.smoothed_abs_momentum_ema = ExponentialMovingAverageStream(s_period)
+		super().__init__()
+
+	@property
+	def lookback(self):
+		return self.momentum_ema.lookback + self.smoothed_momentum_ema.lookback + 1
+
+	@property
+	def recursive(self):
+		return True
+
+	def reset(self):
+		self.momentum_ema.reset()
+		self.smoothed_momentum_ema.reset()
+		self.abs_momentum_ema.reset()
+		self.smoothed_abs_momentum_ema.reset()
+		self.prev_price = None
+		self.value = None
+
+	def update(self, price):
+		if self.prev_price is None:
+			momentum = 0
+		else:
+			momentum = price - self.prev_price
+		self.prev_price = price
+
+		smoothed_momentum_ema = self.smoothed_momentum_ema.update(self.momentum_ema.update(momentum))
+		smoothed_abs_momentum_ema = self.smoothed_abs_momentum_ema.update(self.abs_momentum_ema.update(abs(momentum)))
+
+		if self.value is None:
+			self.value = 0.00
+		else:
+			self.value = round(100 * (smoothed_momentum_ema / smoothed_abs_momentum_ema), 2)
+
+		return self.value
+
 class UltimateOscillator(AbstractHighLowPriceIndicator):
+
+	outputs = ('uo',)
 	
 	def __init__(self, prices=[], high=[], low=[], s_period=7, m_period=14, l_period=28, s_weight=4, m_weight=2, l_weight=1):
 		self.s_period = s_period
@@ -482,10 +708,12 @@ class UltimateOscillator(AbstractHighLowPriceIndicator):
 		
 		return period_avg
 
-	def calculate(self):
+	def calculate(self, backend=None):
 		if len(self.uo) != 0:
 			return self.uo
 
+		self.set_backend_used()
+
 		s_period_avg = self.get_period_avg(self.s_period)
 		m_period_avg = self.get_period_avg(self.m_period)
 		l_period_avg = self.get_period_avg(self.l_period)
@@ -498,7 +726,65 @@ class UltimateOscillator(AbstractHighLowPriceIndicator):
 
 		return self.uo
 
+	def get_stream(self):
+		return UltimateOscillatorStream(self.s_period, self.m_period, self.l_period, self.s_weight, self.m_weight, self.l_weight)
+
+class UltimateOscillatorStream(AbstractStreamingIndicator):
+
+	__slots__ = ('s_period', 'm_period', 'l_period', 's_weight', 'm_weight', 'l_weight', 'window', 'prev_price', 'count')
+
+	def __init__(self, s_period=7, m_period=14, l_period=28, s_weight=4, m_weight=2, l_weight=1):
+		for name, period in (('s_period', s_period), ('m_period', m_period), ('l_period', l_period)):
+			if period is None or period <= 0:
+				raise Exception("`{}` cannot be None.".format(name))
+
+		self.s_period = s_period
+		self.m_period = m_period
+		self.l_period = l_period
+		self.s_weight = s_weight
+		self.m_weight = m_weight
+		self.l_weight = l_weight
+		super().__init__()
+
+	@property
+	def lookback(self):
+		return max(self.s_period, self.m_period, self.l_period)
+
+	def reset(self):
+		self.window = RingBuffer(max(self.s_period, self.m_period, self.l_period), 2)
+		self.prev_price = None
+		self.count = 0
+		self.value = None
+
+	def get_period_avg(self, period):
+		if self.count <= period:
+			return 0.00
+
+		return round(sum(self.window.tail(period, 0)) / sum(self.window.tail(period, 1)), 2)
+
+	def update(self, price, high, low):
+		if self.prev_price is None:
+			self.window.append(0.00, 0.00)
+		else:
+			self.window.append(round(price - min(low, self.prev_price), 2), round(max(high, self.prev_price) - min(low, self.prev_price), 2))
+
+		self.prev_price = price
+		self.count += 1
+
+		s_period_avg = self.get_period_avg(self.s_period)
+		m_period_avg = self.get_period_avg(self.m_period)
+		l_period_avg = self.get_period_avg(self.l_period)
+
+		if self.count <= self.l_period:
+			self.value = 0.00
+		else:
+			self.value = round( 100 * ((self.s_weight * s_period_avg) + (self.m_weight * m_period_avg) + (self.l_weight * l_period_avg)) / (self.s_weight + self.m_weight + self.l_weight),2)
+
+		return self.value
+
 class Williams(AbstractHighLowPriceIndicator):
+
+	outputs = ('williams',)
 	
 	def __init__(self, prices=[], high=[], low=[], period=14):
 		self.period = period
@@ -524,10 +810,12 @@ class Williams(AbstractHighLowPriceIndicator):
 		if len(self.messages) > 0:
 			raise Exception(", ".join(self.messages))
 
-	def calculate(self):
+	def calculate(self, backend=None):
 		if len(self.williams) != 0:
 			return self.williams
 
+		self.set_backend_used()
+
 		for i in range(len(self.prices)):
 			if i < self.period - 1:
 				self.williams.append(0.00)
@@ -538,8 +826,44 @@ class Williams(AbstractHighLowPriceIndicator):
 		
 		return self.williams
 
+	def get_stream(self):
+		return WilliamsStream(self.period)
+
+class WilliamsStream(AbstractStreamingIndicator):
+
+	__slots__ = ('period', 'window')
+
+	def __init__(self, period=14):
+		if period is None or period <= 0:
+			raise Exception("`period` cannot be None.")
+
+		self.period = period
+		super().__init__()
+
+	@property
+	def lookback(self):
+		return self.period - 1
+
+	def reset(self):
+		self.window = RingBuffer(self.period, 2)
+		self.value = None
+
+	def update(self, price, high, low):
+		self.window.append(high, low)
+
+		if not self.window.is_full():
+			self.value = 0.00
+		else:
+			hh = max(self.window.column(0))
+			ll = min(self.window.column(1))
+			self.value = round( -100 * ((hh - price) / (hh - ll)),2)
+
+		return self.value
+
 class KnowSureThingOscillator(AbstractPriceIndicator):
 
+	outputs = ('kst', 'kst_signal')
+
 	def __init__(self, prices=[], ss_roc_period=10, s_roc_period=15, m_roc_period=20, l_roc_period=30, ss_ma_period=10
 			, s_ma_period=10, m_ma_period=10, l_ma_period=15, ss_weight=1, s_weight=2, m_weight=3, l_weight=4, signal_period=9):
 		self.ss_roc_period = ss_roc_period
@@ -635,31 +959,32 @@ class KnowSureThingOscillator(AbstractPriceIndicator):
 		if len(self.messages) > 0:
 			raise Exception(", ".join(self.messages))
 
-	def calculate(self):
+	def calculate(self, backend=None):
 		if len(self.kst) != 0 and len(self.kst_signal) != 0:
 			return (self.kst, self.kst_signal)
 
 		self.validate()
+		backend = self.select_backend(backend)
 
 		roc = RateOfChange(self.prices, self.ss_roc_period)
 		ss_roc = roc.calculate()
 		sma = SimpleMovingAverage(ss_roc, self.ss_ma_period)
-		ss_ma = sma.calculate()
+		ss_ma = sma.calculate(backend)
 
 		roc.reset(self.prices, self.s_roc_period)
 		s_roc = roc.calculate()
 		sma.reset(s_roc, self.s_ma_period)
-		s_ma = sma.calculate()
+		s_ma = sma.calculate(backend)
 
 		roc.reset(self.prices, self.m_roc_period)
 		m_roc = roc.calculate()
 		sma.reset(m_roc, self.m_ma_period)
-		m_ma = sma.calculate()
+		m_ma = sma.calculate(backend)
 
 		roc.reset(self.prices, self.l_roc_period)
 		l_roc = roc.calculate()
 		sma.reset(l_roc, self.l_ma_period)
-		l_ma = sma.calculate()
+		l_ma = sma.calculate(backend)
 
 		for i in range(len(self.prices)):
 			if i < self.l_roc_period + self.l_ma_period - 1:
@@ -668,6 +993,87 @@ class KnowSureThingOscillator(AbstractPriceIndicator):
 				self.kst.append(round((ss_ma[i] * self.ss_weight) + (s_ma[i] * self.s_weight) + (m_ma[i] * self.m_weight) + (l_ma[i] * self.l_weight), 2))
 
 		sma.reset(self.kst, self.signal_period)
-		self.kst_signal = sma.calculate()
+		self.kst_signal = sma.calculate(backend)
+		self.set_backend_used(sma)
 
 		return (self.kst, self.kst_signal)
+
+	def get_stream(self):
+		return KnowSureThingOscillatorStream(**self.get_params())
+
+class KnowSureThingOscillatorStream(AbstractStreamingIndicator):
+
+	n_outputs = 2
+	__slots__ = ('l_roc_period', 'l_ma_period', 'weights', 'rocs', 'smas', 'signal', 'count')
+
+	def __init__(self, ss_roc_period=10, s_roc_period=15, m_roc_period=20, l_roc_period=30, ss_ma_period=10
+			, s_ma_period=10, m_ma_period=10, l_ma_period=15, ss_weight=1, s_weight=2, m_weight=3, l_weight=4, signal_period=9):
+		self.l_roc_period = l_roc_period
+		self.l_ma_period = l_ma_period
+		self.weights = (ss_weight, s_weight, m_weight, l_weight)
+		self.rocs = [RateOfChangeStream(period) for period in (ss_roc_period, s_roc_period, m_roc_period, l_roc_period)]
+		self.smas = [SimpleMovingAverageStream(period) for period in (ss_ma_period, s_ma_period, m_ma_period, l_ma_period)]
+		self.signal = SimpleMovingAverageStream(signal_period)
+		super().__init__()
+
+	@property
+	def lookback(self):
+		return max([roc.lookback + sma.lookback for roc, sma in zip(self.rocs, self.smas)] + [self.l_roc_period + self.l_ma_period - 1]) + self.signal.lookback
+
+	def reset(self):
+		for stream in self.rocs + self.smas:
+			stream.reset()
+		self.signal.reset()
+		self.count = 0
+		self.value = None
+
+	def update(self, price):
+		ss_ma, s_ma, m_ma, l_ma = [sma.update(roc.update(price)) for roc, sma in zip(self.rocs, self.smas)]
+		ss_weight, s_weight, m_weight, l_weight = self.weights
+		self.count += 1
+
+		if self.count < self.l_roc_period + self.l_ma_period:
+			kst = 0.00
+		else:
+			kst = round((ss_ma * ss_weight) + (s_ma * s_weight) + (m_ma * m_weight) + (l_ma * l_weight), 2)
+
+		self.value = (kst, self.signal.update(kst))
+
+		return self.value
+
+@register('relative_strength_index', 'python')
+def _relative_strength_index(prices, period):
+	rs = RelativeStrengthIndex(prices, period).get_rs()
+	rsi = []
+	for i in range(len(rs)):
+		if i < period:
+			rsi.append(0.00)
+		elif rs[i] == float('inf'):
+			rsi.append(100.00)
+		else:
+			rsi.append(round((100 - 100 / (1 + rs[i])), 2))
+
+	return rsi
+
+@register('relative_strength_index', 'numpy')
+def _relative_strength_index_numpy(prices, period):
+	return vectorized.relative_strength_index(prices, period).tolist()
+
+@register('money_flow_index', 'python')
+def _money_flow_index(prices, high, low, volume, period):
+	indicator = MoneyFlowIndex(prices, high, low, volume, period)
+	period_pos_mf = indicator.get_period_pos_mf()
+	period_neg_mf = indicator.get_period_neg_mf()
+	mfi = []
+	for i in range(len(prices)):
+		if i < period + 1:
+			mfi.append(0.00)
+		else:
+			ratio = period_pos_mf[i] / period_neg_mf[i]
+			mfi.append(round(100 - 100 / (1 + ratio), 2))
+
+	return mfi
+
+@register('money_flow_index', 'numpy')
+def _money_flow_index_numpy(prices, high, low, volume, period):
+	return vectorized.money_flow_index(prices, high, low, volume, period).tolist()
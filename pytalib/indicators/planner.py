@@ -0,0 +1,178 @@
+"""
+Dependency graphs of indicators.
+
+Indicators describe their computation as nodes: input series, indicator classes over other nodes,
+single outputs of multi-output nodes and elementwise operations. A `Plan` merges nodes with the same
+key, so an EMA(20) of the close needed by MACD, Keltner channels and the user shares one node, runs the
+nodes in topological order and drops every intermediate once its last consumer has run.
+"""
+
+import inspect
+from . import base
+
+def difference(a, b):
+	return [round(x - y, 2) for x, y in zip(a, b)]
+
+def band(ma, width, multiplier):
+	return [round(m + multiplier * w, 2) for m, w in zip(ma, width)]
+
+def detrend(prices, sma, period):
+	price_index = int(period / 2 + 1)
+	return [0.00 if i < period + price_index - 1 else prices[i] - sma[i - price_index] for i in range(len(sma))]
+
+def apply(operator, x, y):
+	"""
+	`x <operator> y` for one of + - * /, zero where a division is by zero
+	"""
+	if operator == '+':
+		return x + y
+	elif operator == '-':
+		return x - y
+	elif operator == '*':
+		return x * y
+
+	try:
+		return x / y
+	except ZeroDivisionError:
+		return 0.00
+
+def arithmetic(a, b, operator):
+	if not isinstance(a, list) and not isinstance(b, list):
+		return apply(operator, a, b)
+	elif not isinstance(a, list):
+		return [apply(operator, a, y) for y in b]
+	elif not isinstance(b, list):
+		return [apply(operator, x, b) for x in a]
+
+	return [apply(operator, x, y) for x, y in zip(a, b)]
+
+def negate(a):
+	return [-x for x in a] if isinstance(a, list) else -a
+
+OPERATIONS = {
+	'difference': difference,
+	'band': band,
+	'detrend': detrend,
+	'arithmetic': arithmetic,
+	'negate': negate,
+}
+
+class Node(object):
+	"""
+	one step of an indicator graph, identified by its key
+	"""
+
+	__slots__ = ('op', 'target', 'inputs', 'params', 'key')
+
+	def __init__(self, op, target, inputs=(), params=None):
+		self.op = op
+		self.target = target
+		self.inputs = tuple(inputs)
+		self.params = dict(params or {})
+		self.key = (op, target, tuple(node.key for node in self.inputs), tuple(sorted(self.params.items())))
+
+	def __repr__(self):
+		name = self.target.__name__ if inspect.isclass(self.target) else self.target
+		return "Node({}, {})".format(self.op, name)
+
+	def compute(self, values, series, backend=None, backends=None):
+		if self.op == 'source':
+			return series[self.target]
+		elif self.op == 'constant':
+			return self.target
+		elif self.op == 'output':
+			return values[0][self.target]
+		elif self.op == 'operation':
+			return OPERATIONS[self.target](*values, **self.params)
+
+		kwargs = dict(zip(base.get_input_names(self.target), values))
+		kwargs.update(self.params)
+		indicator = self.target(**kwargs)
+		result = indicator.calculate(backend=backend)
+		if backends is not None:
+			backends.append(indicator.backend_used)
+
+		return result
+
+def get_default_params(cls):
+	return {name: parameter.default for name, parameter in list(inspect.signature(cls.__init__).parameters.items())[1:]
+		if parameter.default is not inspect.Parameter.empty and name not in base.get_input_names(cls)}
+
+def source(name):
+	"""
+	input series such as "prices" or "high"
+	"""
+	return Node('source', name)
+
+def indicator(cls, *inputs, **params):
+	"""
+	outputs of the indicator class `cls` over `inputs`, with the unset parameters at their defaults
+	"""
+	if len(inputs) != len(base.get_input_names(cls)):
+		raise Exception("`{}` takes {} input series.".format(cls.__name__, len(base.get_input_names(cls))))
+
+	full = get_default_params(cls)
+	full.update(params)
+	return Node('indicator', cls, inputs, full)
+
+def constant(value):
+	return Node('constant', value)
+
+def output(node, index):
+	return Node('output', index, (node,))
+
+def operation(name, *inputs, **params):
+	if name not in OPERATIONS:
+		raise Exception("Unknown operation `{}`.".format(name))
+
+	return Node('operation', name, inputs, params)
+
+class Plan(object):
+	"""
+	execution order of the nodes needed for `outputs`, with identical nodes merged
+	"""
+
+	def __init__(self, outputs):
+		canonical = {}
+		self.steps = []
+
+		def visit(node):
+			if node.key in canonical:
+				return canonical[node.key]
+
+			for child in node.inputs:
+				visit(child)
+			canonical[node.key] = node
+			self.steps.append(node)
+			return node
+
+		self.outputs = [visit(node) for node in outputs]
+		self.sources = [node.target for node in self.steps if node.op == 'source']
+
+		self.last_use = {}
+		for i, node in enumerate(self.steps):
+			for child in node.inputs:
+				self.last_use[child.key] = i
+
+	def __len__(self):
+		return len(self.steps)
+
+	def run(self, series, backend=None):
+		"""
+		values of every output, given `series` by source name, with the indicators run on `backend`
+
+		`backends_used` lists the backend each indicator node ran on.
+		"""
+		kept = set(node.key for node in self.outputs)
+		values = {}
+		self.backends_used = []
+		for i, node in enumerate(self.steps):
+			values[node.key] = node.compute([values[child.key] for child in node.inputs], series, backend, self.backends_used)
+			for child in node.inputs:
+				if self.last_use[child.key] == i and child.key not in kept:
+					values.pop(child.key, None)
+
+		return [values[node.key] for node in self.outputs]
+
+def evaluate(nodes, series):
+	return Plan(nodes).run(series)
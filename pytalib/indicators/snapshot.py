@@ -0,0 +1,190 @@
+"""
+Versioned snapshots of streaming indicator state.
+
+A snapshot holds the slots of each stream: running sums, smoothed values, the previous bar and the raw
+contents of its ring buffers, so a restored stream continues with bit-identical output. An
+`IndicatorStore` is saved the same way, with the raw bytes of its numpy arrays. Snapshots are plain
+tuples, lists, numbers and bytes, and streams and array states are recreated by class name; the byte
+format is a pickle of those, so only load snapshots you wrote. A stream shared by several others, such
+as the ATR of Keltner channels, stays shared when it is saved together with them.
+"""
+
+import os
+import pickle
+import tempfile
+from array import array
+import numpy as np
+from .base import AbstractStreamingIndicator, RingBuffer
+from . import trend, momentum, volatility, volume, expression, store
+
+# version 2 added numpy arrays, array states and indicator stores, version 1 snapshots still load
+STATE_VERSION = 2
+VERSIONS = (1, 2)
+MAGIC = b'PTLS'
+
+def get_subclasses(base):
+	classes = {}
+	pending = [base]
+	while len(pending) > 0:
+		for cls in pending.pop().__subclasses__():
+			classes[cls.__name__] = cls
+			pending.append(cls)
+
+	return classes
+
+def get_stream_classes():
+	"""
+	every streaming indicator class by name
+	"""
+	return get_subclasses(AbstractStreamingIndicator)
+
+def get_array_state_classes():
+	"""
+	every array state class of `IndicatorStore` by name, and their window
+	"""
+	classes = get_subclasses(store.ArrayState)
+	classes[store.ArrayWindow.__name__] = store.ArrayWindow
+
+	return classes
+
+def get_slots(cls):
+	return [name for klass in reversed(cls.__mro__) for name in getattr(klass, '__slots__', ())]
+
+def _encode(value, memo):
+	if isinstance(value, AbstractStreamingIndicator):
+		if id(value) in memo:
+			return ('ref', memo[id(value)])
+		memo[id(value)] = len(memo)
+		fields = {name: _encode(getattr(value, name), memo) for name in get_slots(type(value)) if hasattr(value, name)}
+		return ('stream', type(value).__name__, fields)
+	elif isinstance(value, (store.ArrayState, store.ArrayWindow)):
+		fields = {name: _encode(getattr(value, name), memo) for name in get_slots(type(value)) if hasattr(value, name)}
+		return ('array_state', type(value).__name__, fields)
+	elif isinstance(value, store.IndicatorStore):
+		return ('store', list(value.symbols), list(value.specs), [_encode(state, memo) for state in value.states])
+	elif isinstance(value, np.ndarray):
+		return ('ndarray', value.dtype.str, value.shape, value.tobytes())
+	elif isinstance(value, RingBuffer):
+		return ('ring', value.capacity, value.width, value.start, value.size, value.data.tobytes())
+	elif isinstance(value, list):
+		return ('list', [_encode(item, memo) for item in value])
+	elif isinstance(value, tuple):
+		return ('tuple', [_encode(item, memo) for item in value])
+	elif isinstance(value, dict):
+		return ('dict', [(key, _encode(item, memo)) for key, item in value.items()])
+	elif value is None or isinstance(value, (bool, int, float, str, bytes)):
+		return value
+
+	raise Exception("cannot snapshot a value of type `{}`.".format(type(value).__name__))
+
+def _decode(value, streams, classes):
+	if not isinstance(value, tuple):
+		return value
+
+	kind = value[0]
+	if kind == 'ref':
+		return streams[value[1]]
+	elif kind == 'stream':
+		if value[1] not in classes:
+			raise Exception("unknown streaming indicator `{}`.".format(value[1]))
+		stream = object.__new__(classes[value[1]])
+		streams.append(stream)
+		for name, field in value[2].items():
+			setattr(stream, name, _decode(field, streams, classes))
+		return stream
+	elif kind == 'array_state':
+		array_classes = get_array_state_classes()
+		if value[1] not in array_classes:
+			raise Exception("unknown array state `{}`.".format(value[1]))
+		state = object.__new__(array_classes[value[1]])
+		for name, field in value[2].items():
+			setattr(state, name, _decode(field, streams, classes))
+		return state
+	elif kind == 'store':
+		indicator_store = store.IndicatorStore(value[1], value[2])
+		indicator_store.states = [_decode(state, streams, classes) for state in value[3]]
+		return indicator_store
+	elif kind == 'ndarray':
+		return np.frombuffer(value[3], dtype=np.dtype(value[1])).reshape(value[2]).copy()
+	elif kind == 'ring':
+		ring = RingBuffer.__new__(RingBuffer)
+		ring.capacity, ring.width, ring.start, ring.size = value[1:5]
+		ring.data = array('d')
+		ring.data.frombytes(value[5])
+		return ring
+	elif kind == 'list':
+		return [_decode(item, streams, classes) for item in value[1]]
+	elif kind == 'tuple':
+		return tuple(_decode(item, streams, classes) for item in value[1])
+	elif kind == 'dict':
+		return {key: _decode(item, streams, classes) for key, item in value[1]}
+
+	raise Exception("invalid snapshot entry `{}`.".format(kind))
+
+def check_version(version):
+	if version not in VERSIONS:
+		raise Exception("unsupported snapshot version {}, expected {}.".format(version, STATE_VERSION))
+
+def get_state(stream):
+	"""
+	snapshot of a single stream or `IndicatorStore`
+	"""
+	return (STATE_VERSION, _encode(stream, {}))
+
+def restore(state):
+	"""
+	new stream or `IndicatorStore` in the state captured by `get_state`
+	"""
+	version, tree = state
+	check_version(version)
+
+	return _decode(tree, [], get_stream_classes())
+
+def dumps(streams):
+	"""
+	serialize a mapping such as {(symbol, indicator): stream}, or an `IndicatorStore`, to bytes
+
+	Keys are kept as they are and must be picklable builtins such as strings and tuples.
+	"""
+	memo = {}
+	if isinstance(streams, store.IndicatorStore):
+		entries = _encode(streams, memo)
+	else:
+		entries = [(key, _encode(stream, memo)) for key, stream in streams.items()]
+
+	return MAGIC + bytes([STATE_VERSION]) + pickle.dumps(entries, protocol=pickle.HIGHEST_PROTOCOL)
+
+def loads(data):
+	"""
+	mapping of streams, or `IndicatorStore`, serialized by `dumps`
+	"""
+	if data[:len(MAGIC)] != MAGIC:
+		raise Exception("data is not a pytalib snapshot.")
+
+	check_version(data[len(MAGIC)])
+
+	streams = []
+	classes = get_stream_classes()
+	entries = pickle.loads(data[len(MAGIC) + 1:])
+	if isinstance(entries, tuple):
+		return _decode(entries, streams, classes)
+
+	return {key: _decode(tree, streams, classes) for key, tree in entries}
+
+def save(streams, path):
+	"""
+	write `dumps(streams)` to `path`, replacing the file atomically
+	"""
+	directory = os.path.dirname(os.path.abspath(path))
+	fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.snapshot-')
+	try:
+		with os.fdopen(fd, 'wb') as f:
+			f.write(dumps(streams))
+		os.replace(temp_path, path)
+	except BaseException:
+		os.unlink(temp_path)
+		raise
+
+def load(path):
+	with open(path, 'rb') as f:
+		return loads(f.read())
@@ -0,0 +1,134 @@
+import inspect
+from . import trend, momentum, volatility, volume
+from .base import AbstractIndicator, get_input_names
+from .planner import Plan
+
+MODULES = (trend, momentum, volatility, volume)
+INPUTS = {'prices': 'close', 'high': 'high', 'low': 'low', 'volume': 'volume'}
+
+def get_indicator_class(name):
+	for module in MODULES:
+		cls = getattr(module, name, None)
+		if inspect.isclass(cls) and issubclass(cls, AbstractIndicator) and not inspect.isabstract(cls):
+			return cls
+
+	raise Exception("Unknown indicator `{}`.".format(name))
+
+def get_inputs(cls):
+	"""
+	names of the series an indicator class is constructed from, in constructor order
+	"""
+	return get_input_names(cls)
+
+def get_series(ohlcv, name):
+	key = INPUTS.get(name, name)
+	if key in ohlcv:
+		return ohlcv[key]
+	if name in ohlcv:
+		return ohlcv[name]
+
+	raise Exception("`{}` is required but missing from the input series.".format(key))
+
+def normalize_spec(spec):
+	if isinstance(spec, str):
+		return (spec, {})
+
+	name, params = spec
+	return (name, dict(params or {}))
+
+def get_spec_name(spec):
+	"""
+	readable name of a spec, e.g. "RelativeStrengthIndex(period=14)"
+	"""
+	name, params = normalize_spec(spec)
+	if len(params) == 0:
+		return name
+
+	return "{}({})".format(name, ", ".join("{}={}".format(key, value) for key, value in params.items()))
+
+def get_columns(spec):
+	"""
+	column names of a spec, "<spec name>.<output>" for multi-output indicators
+	"""
+	name = get_spec_name(spec)
+	outputs = get_default_indicator(spec).outputs
+	if len(outputs) == 1:
+		return [name]
+
+	return ["{}.{}".format(name, output) for output in outputs]
+
+def get_default_indicator(spec):
+	"""
+	indicator described by `spec` over empty inputs, with every parameter filled in
+	"""
+	name, params = normalize_spec(spec)
+	cls = get_indicator_class(name)
+
+	return cls(**{input_name: [] for input_name in get_inputs(cls)}, **params)
+
+def build_indicator(spec, ohlcv, copy=True):
+	"""
+	construct the indicator described by `spec`, e.g. ("RelativeStrengthIndex", {"period": 14}), on `ohlcv`
+
+	`ohlcv` maps "open", "high", "low", "close" and "volume" to equal length series. The series are copied
+	into lists unless `copy` is False.
+	"""
+	name, params = normalize_spec(spec)
+	cls = get_indicator_class(name)
+
+	kwargs = {}
+	for input_name in get_inputs(cls):
+		series = get_series(ohlcv, input_name)
+		if not copy:
+			kwargs[input_name] = series
+		else:
+			kwargs[input_name] = series.tolist() if hasattr(series, 'tolist') else list(series)
+	kwargs.update(params)
+
+	return cls(**kwargs)
+
+def get_lookback(spec):
+	"""
+	bars of history the indicator described by `spec` needs before its first full-window output
+	"""
+	return get_default_indicator(spec).lookback
+
+def run_indicator(spec, ohlcv):
+	return build_indicator(spec, ohlcv).calculate()
+
+def run_indicator_array(spec, ohlcv):
+	"""
+	run `spec` on the numpy arrays of `ohlcv`, e.g. shared memory views
+
+	Indicators with a `calculate_array` method compute on the arrays themselves, the others on list copies
+	as in `run_indicator`.
+	"""
+	if not hasattr(get_indicator_class(normalize_spec(spec)[0]), 'calculate_array'):
+		return run_indicator(spec, ohlcv)
+
+	return build_indicator(spec, ohlcv, copy=False).calculate_array()
+
+def run_plan(specs, ohlcv):
+	"""
+	run many indicator specs on `ohlcv` as one plan and return {column: values}
+
+	Children shared between the specs, such as an EMA used by MACD, Keltner channels and an EMA spec of
+	the same period, are computed once. Columns are named as in `build_features`.
+	"""
+	specs = [normalize_spec(spec) for spec in specs]
+	nodes = []
+	for spec in specs:
+		indicator = build_indicator(spec, ohlcv)
+		indicator.validate()
+		nodes.extend(indicator.get_nodes())
+
+	plan = Plan(nodes)
+	series = {}
+	for name in plan.sources:
+		values = get_series(ohlcv, name)
+		series[name] = values.tolist() if hasattr(values, 'tolist') else list(values)
+
+	values = plan.run(series)
+	columns = [column for spec in specs for column in get_columns(spec)]
+
+	return dict(zip(columns, values))
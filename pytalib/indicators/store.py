@@ -0,0 +1,544 @@
+"""
+Streaming state of many symbols at once.
+
+`IndicatorStore` keeps the state of N symbols x M indicators in struct-of-arrays form: one float64 array
+per state variable and indicator, with one element per symbol, and ring buffers as (period, N) arrays.
+`update` advances every symbol by one bar with a few numpy operations per indicator, following the
+streaming classes step for step so the values are the same as running one stream per symbol.
+Indicators without an array state fall back to `StreamState`, one stream per symbol updated in a Python
+loop, so every bar costs a stream update per symbol instead of a few numpy operations.
+"""
+
+import numpy as np
+from .vectorized import round_exact
+from . import snapshot
+from .spec import normalize_spec, get_spec_name, get_default_indicator, get_indicator_class, get_inputs, INPUTS
+
+class ArrayState(object):
+	"""
+	state of one indicator for every symbol
+	"""
+
+	__slots__ = ('size', 'count', 'value')
+	n_outputs = 1
+
+	def __init__(self, size):
+		self.size = size
+		self.reset()
+
+	def reset(self):
+		self.count = 0
+		self.value = None
+
+class ArrayWindow(object):
+	"""
+	the last `period` rows of a value per symbol, summed oldest first like sum() does
+	"""
+
+	__slots__ = ('period', 'data', 'count')
+
+	def __init__(self, period, size):
+		self.period = period
+		self.data = np.zeros((period, size))
+		self.count = 0
+
+	def append(self, values):
+		evicted = self.data[self.count % self.period].copy() if self.count >= self.period else None
+		self.data[self.count % self.period] = values
+		self.count += 1
+
+		return evicted
+
+	def is_full(self):
+		return self.count >= self.period
+
+	def rows(self):
+		start = self.count % self.period if self.is_full() else 0
+		return [self.data[(start + j) % self.period] for j in range(min(self.count, self.period))]
+
+	def sum(self):
+		rows = self.rows()
+		total = rows[0].copy()
+		for row in rows[1:]:
+			total += row
+
+		return total
+
+class SimpleMovingAverageState(ArrayState):
+
+	__slots__ = ('period', 'window')
+
+	def __init__(self, size, period=20):
+		self.period = period
+		super().__init__(size)
+
+	def reset(self):
+		super().reset()
+		self.window = ArrayWindow(self.period, self.size)
+
+	def update(self, price):
+		self.window.append(price)
+		self.count += 1
+		if not self.window.is_full():
+			self.value = np.zeros(self.size)
+		else:
+			self.value = round_exact(self.window.sum() / self.period, 2)
+
+		return self.value
+
+class WeightedMovingAverageState(ArrayState):
+
+	__slots__ = ('period', 'denominator', 'window', 'numerator', 'total_price')
+
+	def __init__(self, size, period=20):
+		self.period = period
+		self.denominator = period * (period + 1) // 2
+		super().__init__(size)
+
+	def reset(self):
+		super().reset()
+		self.window = ArrayWindow(self.period, self.size)
+		self.numerator = None
+		self.total_price = None
+
+	def update(self, price):
+		evicted = self.window.append(price)
+		self.count += 1
+
+		if evicted is not None:
+			self.numerator = self.numerator + self.period * price - self.total_price
+			self.total_price = self.total_price + price - evicted
+		elif self.window.is_full():
+			self.numerator = np.zeros(self.size)
+			self.total_price = np.zeros(self.size)
+			for j, row in enumerate(self.window.rows()):
+				self.numerator += (j + 1) * row
+				self.total_price += row
+
+		if not self.window.is_full():
+			self.value = np.zeros(self.size)
+		else:
+			self.value = round_exact(self.numerator / self.denominator, 2)
+
+		return self.value
+
+class ExponentialMovingAverageState(ArrayState):
+
+	__slots__ = ('period', 'multiplier')
+
+	def __init__(self, size, period=20):
+		self.period = period
+		self.multiplier = 2 / (period + 1)
+		super().__init__(size)
+
+	def update(self, price):
+		if self.count == 0:
+			self.value = np.array(price, dtype=np.float64)
+		else:
+			self.value = round_exact((price - self.value) * self.multiplier + self.value, 2)
+		self.count += 1
+
+		return self.value
+
+def get_ma_state(size, period, ma_type='SMA'):
+	if ma_type == 'EMA':
+		return ExponentialMovingAverageState(size, period)
+	elif ma_type == 'WMA':
+		return WeightedMovingAverageState(size, period)
+
+	return SimpleMovingAverageState(size, period)
+
+class MovingAverageConvergenceDivergenceState(ArrayState):
+
+	__slots__ = ('f_ema', 's_ema', 'signal')
+	n_outputs = 2
+
+	def __init__(self, size, f_ema_period=12, s_ema_period=26, signal_period=9):
+		self.f_ema = ExponentialMovingAverageState(size, f_ema_period)
+		self.s_ema = ExponentialMovingAverageState(size, s_ema_period)
+		self.signal = ExponentialMovingAverageState(size, signal_period)
+		super().__init__(size)
+
+	def reset(self):
+		super().reset()
+		for ema in (self.f_ema, self.s_ema, self.signal):
+			ema.reset()
+
+	def update(self, price):
+		macd = round_exact(self.f_ema.update(price) - self.s_ema.update(price), 2)
+		self.value = (macd, self.signal.update(macd))
+		self.count += 1
+
+		return self.value
+
+class RelativeStrengthIndexState(ArrayState):
+	"""
+	relative strength index, 100 when the average loss is zero
+	"""
+
+	__slots__ = ('period', 'window', 'prev_price')
+
+	def __init__(self, size, period=14):
+		self.period = period
+		super().__init__(size)
+
+	def reset(self):
+		super().reset()
+		self.window = (ArrayWindow(self.period, self.size), ArrayWindow(self.period, self.size))
+		self.prev_price = None
+
+	def update(self, price):
+		if self.prev_price is None:
+			gain = loss = np.zeros(self.size)
+		else:
+			gain = round_exact(np.where(price > self.prev_price, price - self.prev_price, 0.0), 2)
+			loss = round_exact(np.where(price < self.prev_price, self.prev_price - price, 0.0), 2)
+		self.window[0].append(gain)
+		self.window[1].append(loss)
+
+		self.prev_price = np.array(price, dtype=np.float64)
+		self.count += 1
+
+		if self.count <= self.period:
+			self.value = np.zeros(self.size)
+		else:
+			avg_gain = round_exact(self.window[0].sum() / self.period, 2)
+			avg_loss = round_exact(self.window[1].sum() / self.period, 2)
+			with np.errstate(divide='ignore', invalid='ignore'):
+				rs = round_exact(avg_gain / avg_loss, 2)
+				self.value = np.where(avg_loss == 0, 100.0, round_exact(100 - 100 / (1 + rs), 2))
+
+		return self.value
+
+class AverageTrueRangeState(ArrayState):
+
+	__slots__ = ('ma', 'prev_price', 'prev_low')
+
+	def __init__(self, size, period=14, ma_type='SMA'):
+		self.ma = get_ma_state(size, period, ma_type)
+		super().__init__(size)
+
+	def reset(self):
+		super().reset()
+		self.ma.reset()
+		self.prev_price = None
+		self.prev_low = None
+
+	def update(self, price, high, low):
+		if self.prev_price is None:
+			tr = np.zeros(self.size)
+		else:
+			tr = round_exact(np.maximum(np.maximum(np.abs(high - low), np.abs(low - self.prev_low)), np.abs(high - self.prev_price)), 2)
+
+		self.prev_price = np.array(price, dtype=np.float64)
+		self.prev_low = np.array(low, dtype=np.float64)
+		self.value = self.ma.update(tr)
+		self.count += 1
+
+		return self.value
+
+class AverageDirectionalIndexState(ArrayState):
+
+	__slots__ = ('period', 'multiplier', 'prev_price', 'prev_high', 'prev_low', 'period_tr', 'pos_period_dm', 'neg_period_dm', 'pos_dm_ema', 'neg_dm_ema', 'pos_di', 'neg_di', 'adx')
+
+	def __init__(self, size, period=14):
+		self.period = period
+		self.multiplier = 2 / (period + 1)
+		super().__init__(size)
+
+	def reset(self):
+		super().reset()
+		self.prev_price = None
+		self.prev_high = None
+		self.prev_low = None
+		self.period_tr = np.zeros(self.size)
+		self.pos_period_dm = np.zeros(self.size)
+		self.neg_period_dm = np.zeros(self.size)
+		self.pos_dm_ema = np.zeros(self.size)
+		self.neg_dm_ema = np.zeros(self.size)
+		self.pos_di = np.zeros(self.size)
+		self.neg_di = np.zeros(self.size)
+		self.adx = np.zeros(self.size)
+
+	def smooth(self, period_value, value):
+		if self.count <= self.period:
+			return period_value + value
+
+		return round_exact(period_value - (period_value / self.period) + value, 2)
+
+	def update(self, price, high, low):
+		if self.count > 0:
+			tr = round_exact(np.maximum(np.maximum(np.abs(high - low), np.abs(low - self.prev_low)), np.abs(high - self.prev_price)), 2)
+			up_move = high - self.prev_high
+			down_move = self.prev_low - low
+			pos_dm = np.where((up_move > down_move) & (up_move > 0), round_exact(up_move, 2), 0.0)
+			neg_dm = np.where((down_move > up_move) & (down_move > 0), round_exact(down_move, 2), 0.0)
+
+			self.period_tr = self.smooth(self.period_tr, tr)
+			self.pos_period_dm = self.smooth(self.pos_period_dm, pos_dm)
+			self.neg_period_dm = self.smooth(self.neg_period_dm, neg_dm)
+
+		self.prev_price = np.array(price, dtype=np.float64)
+		self.prev_high = np.array(high, dtype=np.float64)
+		self.prev_low = np.array(low, dtype=np.float64)
+
+		if self.count == self.period:
+			self.period_tr = round_exact(self.period_tr, 2)
+			self.pos_period_dm = round_exact(self.pos_period_dm, 2)
+			self.neg_period_dm = round_exact(self.neg_period_dm, 2)
+
+		if self.count >= self.period:
+			self.pos_dm_ema = round_exact((self.pos_period_dm - self.pos_dm_ema) * self.multiplier + self.pos_dm_ema, 2)
+			self.neg_dm_ema = round_exact((self.neg_period_dm - self.neg_dm_ema) * self.multiplier + self.neg_dm_ema, 2)
+
+			with np.errstate(divide='ignore', invalid='ignore'):
+				self.pos_di = np.where(self.period_tr == 0, 0.0, round_exact((self.pos_dm_ema / self.period_tr) * 100, 2))
+				self.neg_di = np.where(self.period_tr == 0, 0.0, round_exact((self.neg_dm_ema / self.period_tr) * 100, 2))
+				total = self.pos_di + self.neg_di
+				self.adx = np.where(total == 0, 0.0, round_exact((np.abs(self.pos_di - self.neg_di) / total) * 100, 2))
+
+		self.count += 1
+		self.value = self.adx
+
+		return self.value
+
+class StandardDeviationState(ArrayState):
+	"""
+	population standard deviation, summed oldest first like the stream
+	"""
+
+	__slots__ = ('period', 'window')
+
+	def __init__(self, size, period=20):
+		self.period = period
+		super().__init__(size)
+
+	def reset(self):
+		super().reset()
+		self.window = ArrayWindow(self.period, self.size)
+
+	def update(self, price):
+		self.window.append(price)
+		self.count += 1
+		if not self.window.is_full():
+			self.value = np.zeros(self.size)
+		else:
+			mean = self.window.sum() / self.period
+			variance = np.zeros(self.size)
+			for row in self.window.rows():
+				variance += (row - mean) ** 2
+			self.value = round_exact(np.sqrt(variance / self.period), 2)
+
+		return self.value
+
+class BollingerBandsState(ArrayState):
+
+	__slots__ = ('num_std', 'ma', 'std')
+	n_outputs = 3
+
+	def __init__(self, size, period=20, ma_type='SMA', num_std=2):
+		self.num_std = num_std
+		self.ma = get_ma_state(size, period, ma_type)
+		self.std = StandardDeviationState(size, period)
+		super().__init__(size)
+
+	def reset(self):
+		super().reset()
+		self.ma.reset()
+		self.std.reset()
+
+	def update(self, price):
+		ma = self.ma.update(price)
+		std = self.std.update(price)
+		self.value = (round_exact(ma + self.num_std * std, 2), ma, round_exact(ma - self.num_std * std, 2))
+		self.count += 1
+
+		return self.value
+
+class StochasticOscillatorState(ArrayState):
+	"""
+	stochastic oscillator, 0 for a symbol whose window is flat where the stream raises ZeroDivisionError
+	"""
+
+	__slots__ = ('k_period', 'window', 'sma')
+	n_outputs = 2
+
+	def __init__(self, size, k_period=14, d_period=3):
+		self.k_period = k_period
+		self.sma = SimpleMovingAverageState(size, d_period)
+		super().__init__(size)
+
+	def reset(self):
+		super().reset()
+		self.window = (ArrayWindow(self.k_period, self.size), ArrayWindow(self.k_period, self.size))
+		self.sma.reset()
+
+	def update(self, price, high, low):
+		self.window[0].append(high)
+		self.window[1].append(low)
+		self.count += 1
+
+		if self.count <= self.k_period:
+			stc = np.zeros(self.size)
+		else:
+			period_high = np.max(self.window[0].data, axis=0)
+			period_low = np.min(self.window[1].data, axis=0)
+			spread = period_high - period_low
+			stc = round_exact(np.divide(100 * (price - period_low), spread, out=np.zeros(self.size), where=spread != 0), 2)
+
+		self.value = (stc, self.sma.update(stc))
+
+		return self.value
+
+class OnBalanceVolumeState(ArrayState):
+
+	__slots__ = ('prev_price',)
+
+	def __init__(self, size):
+		super().__init__(size)
+
+	def reset(self):
+		super().reset()
+		self.prev_price = None
+
+	def update(self, price, volume):
+		if self.prev_price is None:
+			self.value = np.zeros(self.size)
+		else:
+			direction = np.sign(price - self.prev_price)
+			self.value = round_exact(self.value + direction * volume, 2)
+
+		self.prev_price = np.array(price, dtype=np.float64)
+		self.count += 1
+
+		return self.value
+
+class StreamState(ArrayState):
+	"""
+	one streaming indicator per symbol, for indicators without an array state
+
+	`update` loops over the symbols in Python, so it is as slow as running the streams one by one. It
+	snapshots every stream first, so a stream that raises leaves all of them as they were and `rollback`
+	can undo the last update.
+	"""
+
+	__slots__ = ('streams', 'n_outputs', 'previous')
+
+	def __init__(self, size, indicator):
+		self.streams = [indicator.get_stream() for i in range(size)]
+		self.n_outputs = len(indicator.outputs)
+		super().__init__(size)
+
+	def reset(self):
+		super().reset()
+		for stream in self.streams:
+			stream.reset()
+		self.previous = None
+
+	def rollback(self):
+		states, self.count, self.value = self.previous
+		self.streams = [snapshot.restore(state) for state in states]
+
+	def update(self, *columns):
+		self.previous = ([snapshot.get_state(stream) for stream in self.streams], self.count, self.value)
+		try:
+			values = [stream.update(*bar) for stream, bar in zip(self.streams, zip(*[column.tolist() for column in columns]))]
+		except BaseException:
+			self.rollback()
+			raise
+		self.count += 1
+
+		if self.n_outputs > 1:
+			self.value = tuple(np.asarray(column, dtype=np.float64) for column in zip(*values))
+		else:
+			self.value = np.asarray(values, dtype=np.float64)
+
+		return self.value
+
+ARRAY_STATES = {
+	'SimpleMovingAverage': SimpleMovingAverageState,
+	'WeightedMovingAverage': WeightedMovingAverageState,
+	'ExponentialMovingAverage': ExponentialMovingAverageState,
+	'MovingAverageConvergenceDivergence': MovingAverageConvergenceDivergenceState,
+	'RelativeStrengthIndex': RelativeStrengthIndexState,
+	'AverageTrueRange': AverageTrueRangeState,
+	'AverageDirectionalIndex': AverageDirectionalIndexState,
+	'StandardDeviation': StandardDeviationState,
+	'BollingerBands': BollingerBandsState,
+	'StochasticOscillator': StochasticOscillatorState,
+	'OnBalanceVolume': OnBalanceVolumeState,
+}
+
+def get_state(spec, size):
+	"""
+	array state of the indicator described by `spec` for `size` symbols
+	"""
+	name, params = normalize_spec(spec)
+	indicator = get_default_indicator(spec)
+	if name in ARRAY_STATES:
+		return ARRAY_STATES[name](size, **indicator.get_params())
+
+	return StreamState(size, indicator)
+
+class IndicatorStore(object):
+	"""
+	streaming state of every indicator spec for every symbol
+
+	`specs` are given as in `run_universe`, e.g. [("RelativeStrengthIndex", {"period": 14}), "OnBalanceVolume"].
+	Each `update` takes one bar per symbol as arrays under "close", "high", "low" and "volume", in the
+	order of `symbols`, and returns {spec name: values}, with a tuple of arrays for multi-output indicators.
+	"""
+
+	def __init__(self, symbols, specs):
+		self.symbols = list(symbols)
+		self.specs = [normalize_spec(spec) for spec in specs]
+		self.names = [get_spec_name(spec) for spec in self.specs]
+		self.inputs = [[INPUTS.get(name, name) for name in get_inputs(get_indicator_class(spec[0]))] for spec in self.specs]
+		self.states = [get_state(spec, len(self.symbols)) for spec in self.specs]
+
+		if len(set(self.names)) != len(self.names):
+			raise Exception("`specs` cannot contain the same indicator twice.")
+
+	def __len__(self):
+		return len(self.symbols)
+
+	def __getitem__(self, name):
+		return self.states[self.names.index(name)].value
+
+	def reset(self):
+		for state in self.states:
+			state.reset()
+
+	def update(self, bars):
+		"""
+		advance every symbol by one bar
+
+		Either every state advances or none does: the bars are checked before any state changes, the
+		per-symbol streams run first and are rolled back if one of them raises, and array states do not
+		raise.
+		"""
+		columns = {}
+		for inputs in self.inputs:
+			for key in inputs:
+				if key not in columns:
+					if key not in bars:
+						raise Exception("`{}` is required but missing from the bars.".format(key))
+					columns[key] = np.asarray(bars[key], dtype=np.float64)
+					if columns[key].shape != (len(self.symbols),):
+						raise Exception("`{}` must have one value per symbol.".format(key))
+
+		streams = [i for i, state in enumerate(self.states) if isinstance(state, StreamState)]
+		values = {}
+		try:
+			for i in streams:
+				values[i] = self.states[i].update(*[columns[key] for key in self.inputs[i]])
+		except BaseException:
+			for i in values:
+				self.states[i].rollback()
+			raise
+
+		for i, state in enumerate(self.states):
+			if i not in values:
+				values[i] = state.update(*[columns[key] for key in self.inputs[i]])
+
+		return {name: values[i] for i, name in enumerate(self.names)}
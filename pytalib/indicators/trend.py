@@ -1,7 +1,12 @@
-from .base import AbstractPriceIndicator, AbstractMovingAverages, AbstractHighLowPriceIndicator
+import numpy as np
+from .base import AbstractPriceIndicator, AbstractMovingAverages, AbstractHighLowPriceIndicator, AbstractStreamingIndicator, RingBuffer
+from . import kernels, vectorized, planner
+from .backend import register
 
 class MovingAverageConvergenceDivergence(AbstractPriceIndicator):
 
+	outputs = ('macd', 'macd_signal_line')
+
 	def __init__(self, prices=[], f_ema_period=12, s_ema_period=26, signal_period=9):
 		self.f_ema_period = f_ema_period
 		self.s_ema_period = s_ema_period
@@ -36,19 +41,12 @@ class MovingAverageConvergenceDivergence(AbstractPriceIndicator):
 		if len(self.messages) > 0:
 			raise Exception(", ".join(self.messages))
 
-	def get_macd(self):
+	def get_macd(self, backend=None):
 		if len(self.macd) != 0:
 			return self.macd
 
 		self.validate()
-		f_ema = ExponentialMovingAverage(self.prices, self.f_ema_period).calculate()
-		s_ema = ExponentialMovingAverage(self.prices, self.s_ema_period).calculate()
-
-		if len(f_ema) != len(s_ema):
-			raise Exception("Different len(f_ema) and len(s_ema)!")
-
-		for i in range(len(f_ema)):
-			self.macd.append(round(f_ema[i] - s_ema[i], 2))
+		self.macd, self.macd_signal_line = self.evaluate_nodes(self.get_nodes(), backend)
 
 		return self.macd
 
@@ -56,14 +54,60 @@ class MovingAverageConvergenceDivergence(AbstractPriceIndicator):
 		if len(self.macd_signal_line) != 0:
 			return self.macd_signal_line
 
-		self.macd_signal_line = ExponentialMovingAverage(self.get_macd(), self.signal_period).calculate()
+		self.get_macd()
 
 		return self.macd_signal_line
 
-	def calculate(self):
-		return (self.get_macd(), self.get_macd_signal_line())
+	def get_nodes(self, prices=None):
+		prices = prices if prices is not None else planner.source('prices')
+		macd = planner.operation('difference', planner.indicator(ExponentialMovingAverage, prices, period=self.f_ema_period),
+			planner.indicator(ExponentialMovingAverage, prices, period=self.s_ema_period))
+
+		return [macd, planner.indicator(ExponentialMovingAverage, macd, period=self.signal_period)]
+
+	def calculate(self, backend=None):
+		return (self.get_macd(backend), self.get_macd_signal_line())
+
+	def get_stream(self):
+		return MovingAverageConvergenceDivergenceStream(self.f_ema_period, self.s_ema_period, self.signal_period)
+
+class MovingAverageConvergenceDivergenceStream(AbstractStreamingIndicator):
+
+	n_outputs = 2
+	__slots__ = ('f_ema_period', 's_ema_period', 'signal_period', 'f_ema', 's_ema', 'signal')
+
+	def __init__(self, f_ema_period=12, s_ema_period=26, signal_period=9):
+		self.f_ema_period = f_ema_period
+		self.s_ema_period = s_ema_period
+		self.signal_period = signal_period
+		self.f_ema = ExponentialMovingAverageStream(f_ema_period)
+		self.s_ema = ExponentialMovingAverageStream(s_ema_period)
+		self.signal = ExponentialMovingAverageStream(signal_period)
+		super().__init__()
+
+	@property
+	def lookback(self):
+		return max(self.f_ema.lookback, self.s_ema.lookback) + self.signal.lookback
+
+	@property
+	def recursive(self):
+		return True
+
+	def reset(self):
+		self.f_ema.reset()
+		self.s_ema.reset()
+		self.signal.reset()
+		self.value = None
+
+	def update(self, price):
+		macd = round(self.f_ema.update(price) - self.s_ema.update(price), 2)
+		self.value = (macd, self.signal.update(macd))
+
+		return self.value
 
 class SimpleMovingAverage(AbstractMovingAverages):
+
+	outputs = ('sma',)
 	
 	def __init__(self, prices=[], period=20):
 		self.sma = []
@@ -74,22 +118,23 @@ class SimpleMovingAverage(AbstractMovingAverages):
 		self.period = period
 		self.sma = []
 
-	def calculate(self):
+	def calculate(self, backend=None):
 		if len(self.sma) != 0:
 			return self.sma
 
 		self.validate()
 
-		for i in range(len(self.prices)):
-			if i < self.period - 1:
-				self.sma.append(0)
-			else:
-				self.sma.append(round(sum(self.prices[i + 1 - self.period : i + 1]) / self.period, 2))
+		self.sma = self.dispatch('simple_moving_average', self.prices, self.period, backend=backend)
 
 		return self.sma
 
+	def get_stream(self):
+		return SimpleMovingAverageStream(self.period)
+
 class WeightedMovingAverage(AbstractMovingAverages):
 
+	outputs = ('wma',)
+
 	def __init__(self, prices=[], period=20):
 		self.wma = []
 		super().__init__(prices, period)
@@ -99,38 +144,23 @@ class WeightedMovingAverage(AbstractMovingAverages):
 		self.period = period
 		self.wma = []
 
-	def calculate(self):
+	def calculate(self, backend=None):
 		if len(self.wma) != 0:
 			return self.wma
 
 		self.validate()
 
-		multiplier = []
-		denominator = 0
-		for i in range(1, self.period + 1):
-			multiplier.append(i)
-			denominator += i
-
-		total_price = 0
-		numerator = 0
-		for i in range(len(self.prices)):
-			if i < self.period - 1:
-				self.wma.append(0.00)
-			elif i == self.period - 1:
-				total_price = sum(self.prices[i - self.period + 1 : i + 1])
-				numerator = 0
-				for j in range(self.period):
-					numerator += multiplier[j] * self.prices[j]
-				self.wma.append(round(numerator / denominator, 2))
-			else:
-				numerator = numerator + self.period * self.prices[i] - total_price
-				total_price = total_price + self.prices[i] - self.prices[i - self.period]
-				self.wma.append(round(numerator / denominator, 2))
+		self.wma = self.dispatch('weighted_moving_average', self.prices, self.period, backend=backend)
 
 		return self.wma
 
+	def get_stream(self):
+		return WeightedMovingAverageStream(self.period)
+
 class ExponentialMovingAverage(AbstractMovingAverages):
 
+	outputs = ('ema',)
+
 	def __init__(self, prices=[], period=20):
 		self.ema = []
 		super().__init__(prices, period)
@@ -140,23 +170,160 @@ class ExponentialMovingAverage(AbstractMovingAverages):
 		self.period = period
 		self.ema = []
 
-	def calculate(self):
+	def calculate(self, backend=None):
 		if len(self.ema) != 0:
 			return self.ema
 
 		self.validate()
-		multiplier = 2 / (self.period + 1)
 
-		for i in range(len(self.prices)):
-			if i == 0:
-				self.ema.append(self.prices[i])
-			else:
-				self.ema.append(round((self.prices[i] - self.ema[i - 1]) * multiplier + self.ema[i - 1], 2))
+		self.ema = self.dispatch('exponential_moving_average', self.prices, self.period, backend=backend)
 
 		return self.ema
 
+	def get_stream(self):
+		return ExponentialMovingAverageStream(self.period)
+
+class SimpleMovingAverageStream(AbstractStreamingIndicator):
+
+	__slots__ = ('period', 'window', 'total', 'magnitude')
+
+	def __init__(self, period=20):
+		if period is None or period <= 0:
+			raise Exception("`period` cannot be None.")
+
+		self.period = period
+		super().__init__()
+
+	@property
+	def lookback(self):
+		return self.period - 1
+
+	def reset(self):
+		self.window = RingBuffer(self.period)
+		self.total = 0.0
+		self.magnitude = 0.0
+		self.value = None
+
+	def update(self, price):
+		evicted = self.window.append(price)
+		if evicted is not None and self.window.start == 0:
+			self.total = self.window.column_sum()
+			self.magnitude = sum([abs(x) for x in self.window.column()])
+		else:
+			self.total += price
+			self.magnitude += abs(price)
+			if evicted is not None:
+				self.total -= evicted[0]
+
+		if not self.window.is_full():
+			self.value = 0
+		else:
+			# the running total drifts by a few ulps of every value added or evicted since the last re-sum
+			mean = self.total / self.period
+			if vectorized.is_near_tie(mean, 2, vectorized.SUM_DRIFT * self.magnitude):
+				mean = sum(self.window.column()) / self.period
+			self.value = round(mean, 2)
+
+		return self.value
+
+class WeightedMovingAverageStream(AbstractStreamingIndicator):
+
+	__slots__ = ('period', 'denominator', 'window', 'total_price', 'numerator')
+
+	def __init__(self, period=20):
+		if period is None or period <= 0:
+			raise Exception("`period` cannot be None.")
+
+		self.period = period
+		self.denominator = period * (period + 1) // 2
+		super().__init__()
+
+	@property
+	def lookback(self):
+		return self.period - 1
+
+	@property
+	def recursive(self):
+		# the numerator is carried from bar to bar like the batch class does, so the float result depends on earlier bars
+		return True
+
+	def reset(self):
+		self.window = RingBuffer(self.period)
+		self.total_price = 0
+		self.numerator = 0
+		self.value = None
+
+	def update(self, price):
+		evicted = self.window.append(price)
+
+		if evicted is not None:
+			self.numerator = self.numerator + self.period * price - self.total_price
+			self.total_price = self.total_price + price - evicted[0]
+		elif self.window.is_full():
+			self.numerator = 0
+			self.total_price = 0
+			for j in range(self.period):
+				self.numerator += (j + 1) * self.window.get(j)
+				self.total_price += self.window.get(j)
+
+		if not self.window.is_full():
+			self.value = 0.00
+		else:
+			self.value = round(self.numerator / self.denominator, 2)
+
+		return self.value
+
+class ExponentialMovingAverageStream(AbstractStreamingIndicator):
+
+	__slots__ = ('period', 'multiplier')
+
+	def __init__(self, period=20):
+		if period is None or period <= 0:
+			raise Exception("`period` cannot be None.")
+
+		self.period = period
+		self.multiplier = 2 / (period + 1)
+		super().__init__()
+
+	@property
+	def lookback(self):
+		return self.period - 1
+
+	@property
+	def recursive(self):
+		return True
+
+	def reset(self):
+		self.value = None
+
+	def update(self, price):
+		if self.value is None:
+			self.value = price
+		else:
+			self.value = round((price - self.value) * self.multiplier + self.value, 2)
+
+		return self.value
+
+def get_ma_class(ma_type='SMA'):
+	if ma_type == 'EMA':
+		return ExponentialMovingAverage
+	elif ma_type == 'WMA':
+		return WeightedMovingAverage
+
+	return SimpleMovingAverage
+
+def get_ma_stream(period, ma_type='SMA'):
+	if ma_type == 'EMA':
+		return ExponentialMovingAverageStream(period)
+	elif ma_type == 'WMA':
+		return WeightedMovingAverageStream(period)
+
+	return SimpleMovingAverageStream(period)
+
 class Trix(AbstractMovingAverages):
 
+	outputs = ('trix',)
+
 	def __init__(self, prices=[], period=15):
 		self.trix = []
 		super().__init__(prices, period)
@@ -166,15 +333,16 @@ class Trix(AbstractMovingAverages):
 		self.period = period
 		self.trix = []
 
-	def calculate(self):
+	def calculate(self, backend=None):
 		if len(self.trix) != 0:
 			return self.trix
 
 		self.validate()
 		ema = ExponentialMovingAverage(self.prices, self.period)
 		for i in range(3):
-			self.trix = ema.calculate()
+			self.trix = ema.calculate(self.select_backend(backend))
 			ema.reset(self.trix, self.period)
+		self.set_backend_used(ema)
 
 		i = len(self.trix) - 1
 		while i >= 0:
@@ -186,7 +354,48 @@ class Trix(AbstractMovingAverages):
 
 		return self.trix
 
+	def get_stream(self):
+		return TrixStream(self.period)
+
+class TrixStream(AbstractStreamingIndicator):
+
+	__slots__ = ('period', 'emas', 'prev_ema')
+
+	def __init__(self, period=15):
+		self.period = period
+		self.emas = [ExponentialMovingAverageStream(period) for i in range(3)]
+		super().__init__()
+
+	@property
+	def lookback(self):
+		return sum(ema.lookback for ema in self.emas) + 1
+
+	@property
+	def recursive(self):
+		return True
+
+	def reset(self):
+		for ema in self.emas:
+			ema.reset()
+		self.prev_ema = None
+		self.value = None
+
+	def update(self, price):
+		ema = price
+		for stream in self.emas:
+			ema = stream.update(ema)
+
+		if self.prev_ema is None:
+			self.value = 0
+		else:
+			self.value = round((ema - self.prev_ema) / self.prev_ema, 4)
+		self.prev_ema = ema
+
+		return self.value
+
 class AverageDirectionalIndex(AbstractHighLowPriceIndicator):
+
+	outputs = ('adx',)
 	
 	def __init__(self, prices=[], high=[], low=[], period=14):
 		self.period = period
@@ -375,15 +584,116 @@ class AverageDirectionalIndex(AbstractHighLowPriceIndicator):
 	
 		return self.adx
 
-	def calculate(self):
+	def calculate(self, backend=None):
 		if len(self.adx) != 0:
 			return self.adx
 
 		self.validate()
 
-		return self.get_adx()
+		self.adx, self.pos_period_di, self.neg_period_di = self.dispatch('average_directional_index', self.prices, self.high, self.low, self.period, backend=backend)
+
+		return self.adx
+
+	def get_stream(self):
+		return AverageDirectionalIndexStream(self.period)
+
+class AverageDirectionalIndexStream(AbstractStreamingIndicator):
+
+	__slots__ = ('period', 'with_di', 'n_outputs', 'multiplier', 'prev_price', 'prev_high', 'prev_low', 'count', 'period_tr', 'pos_period_dm', 'neg_period_dm', 'pos_dm_ema', 'neg_dm_ema', 'pos_di', 'neg_di', 'adx')
+
+	def __init__(self, period=14, with_di=False):
+		if period is None or period <= 0:
+			raise Exception("`period` cannot be None.")
+
+		self.period = period
+		self.with_di = with_di
+		self.n_outputs = 3 if with_di else 1
+		self.multiplier = 2 / (period + 1)
+		super().__init__()
+
+	@property
+	def lookback(self):
+		return 2 * self.period - 1
+
+	@property
+	def recursive(self):
+		return True
+
+	def reset(self):
+		self.prev_price = None
+		self.prev_high = None
+		self.prev_low = None
+		self.count = 0
+		self.period_tr = 0.0
+		self.pos_period_dm = 0.0
+		self.neg_period_dm = 0.0
+		self.pos_dm_ema = 0.0
+		self.neg_dm_ema = 0.0
+		self.pos_di = 0.00
+		self.neg_di = 0.00
+		self.adx = 0.00
+		self.value = None
+
+	def smooth(self, period_value, value):
+		if self.count <= self.period:
+			return period_value + value
+
+		return round(period_value - (period_value / self.period) + value, 2)
+
+	def update(self, price, high, low):
+		if self.count == 0:
+			tr = 0.00
+			pos_dm = 0.00
+			neg_dm = 0.00
+		else:
+			tr = round(max(abs(high - low), abs(low - self.prev_low), abs(high - self.prev_price)), 2)
+			up_move = high - self.prev_high
+			down_move = self.prev_low - low
+			pos_dm = round(up_move, 2) if up_move > down_move and up_move > 0 else 0.00
+			neg_dm = round(down_move, 2) if down_move > up_move and down_move > 0 else 0.00
+
+		self.prev_price = price
+		self.prev_high = high
+		self.prev_low = low
+
+		if self.count > 0:
+			self.period_tr = self.smooth(self.period_tr, tr)
+			self.pos_period_dm = self.smooth(self.pos_period_dm, pos_dm)
+			self.neg_period_dm = self.smooth(self.neg_period_dm, neg_dm)
+
+		if self.count == self.period:
+			self.period_tr = round(self.period_tr, 2)
+			self.pos_period_dm = round(self.pos_period_dm, 2)
+			self.neg_period_dm = round(self.neg_period_dm, 2)
+
+		if self.count >= self.period:
+			self.pos_dm_ema = round((self.pos_period_dm - self.pos_dm_ema) * self.multiplier + self.pos_dm_ema, 2)
+			self.neg_dm_ema = round((self.neg_period_dm - self.neg_dm_ema) * self.multiplier + self.neg_dm_ema, 2)
+
+			if self.period_tr == 0:
+				self.pos_di = 0.00
+				self.neg_di = 0.00
+			else:
+				self.pos_di = round((self.pos_dm_ema / self.period_tr) * 100, 2)
+				self.neg_di = round((self.neg_dm_ema / self.period_tr) * 100, 2)
+
+			if self.pos_di + self.neg_di == 0:
+				self.adx = 0.00
+			else:
+				self.adx = round((abs(self.pos_di - self.neg_di) / (self.pos_di + self.neg_di)) * 100, 2)
+
+		self.count += 1
+
+		if self.with_di:
+			self.value = (self.adx, self.pos_di, self.neg_di)
+		else:
+			self.value = self.adx
+
+		return self.value
 
 class CommodityChannelIndex(AbstractHighLowPriceIndicator):
+
+	outputs = ('cci',)
 	
 	def __init__(self, prices=[], high=[], low=[], period=14, cci_constant=0.015):
 		self.period = period
@@ -442,12 +752,14 @@ class CommodityChannelIndex(AbstractHighLowPriceIndicator):
 
 		return self.mean_sd
 
-	def calculate(self):
+	def calculate(self, backend=None):
 		if len(self.cci) != 0:
 			return self.cci
 
 		self.validate()
-		sma = SimpleMovingAverage(self.get_tp(), self.period).calculate()
+		indicator = SimpleMovingAverage(self.get_tp(), self.period)
+		sma = indicator.calculate(self.select_backend(backend))
+		self.set_backend_used(indicator)
 		
 		for i in range(len(sma)):
 			if i < self.period - 1:
@@ -457,7 +769,52 @@ class CommodityChannelIndex(AbstractHighLowPriceIndicator):
 
 		return self.cci
 
+	def get_stream(self):
+		return CommodityChannelIndexStream(self.period, self.cci_constant)
+
+class CommodityChannelIndexStream(AbstractStreamingIndicator):
+
+	__slots__ = ('period', 'cci_constant', 'sma', 'window')
+
+	def __init__(self, period=14, cci_constant=0.015):
+		if period is None or period <= 0:
+			raise Exception("`period` cannot be None.")
+
+		self.period = period
+		self.cci_constant = cci_constant
+		self.sma = SimpleMovingAverageStream(period)
+		super().__init__()
+
+	@property
+	def lookback(self):
+		return self.period - 1
+
+	def reset(self):
+		self.sma.reset()
+		self.window = RingBuffer(self.period)
+		self.value = None
+
+	def update(self, price, high, low):
+		tp = round((high + low + price) / 3, 2)
+		sma = self.sma.update(tp)
+		self.window.append(tp)
+
+		if not self.window.is_full():
+			self.value = 0.00
+		else:
+			window = self.window.column()
+			mean = sum(window) / self.period
+			abs_sum = 0
+			for value in window:
+				abs_sum += abs(value - mean)
+
+			self.value = round((tp - sma) / (self.cci_constant * round(abs_sum / self.period, 2)), 2)
+
+		return self.value
+
 class DetrendedPriceOscillator(AbstractMovingAverages):
+
+	outputs = ('dpo',)
 	
 	def __init__(self, prices=[], period=20):
 		self.dpo = []
@@ -468,24 +825,61 @@ class DetrendedPriceOscillator(AbstractMovingAverages):
 		self.period = period
 		self.dpo = []
 
-	def calculate(self):
+	def calculate(self, backend=None):
 		if len(self.dpo) != 0:
 			return self.dpo
 
 		self.validate()
-		sma = SimpleMovingAverage(self.prices, self.period).calculate()
-		price_index = int(self.period / 2 + 1)
+		self.dpo = self.evaluate_nodes(self.get_nodes(), backend)[0]
 
+		return self.dpo
 
-		for i in range(len(sma)):
-			if i < self.period + price_index - 1:
-				self.dpo.append(0.00)
-			else:
-				self.dpo.append(self.prices[i] - sma[i - price_index])
+	def get_nodes(self, prices=None):
+		prices = prices if prices is not None else planner.source('prices')
+		sma = planner.indicator(SimpleMovingAverage, prices, period=self.period)
 
-		return self.dpo
+		return [planner.operation('detrend', prices, sma, period=self.period)]
+
+	def get_stream(self):
+		return DetrendedPriceOscillatorStream(self.period)
+
+class DetrendedPriceOscillatorStream(AbstractStreamingIndicator):
+
+	__slots__ = ('period', 'price_index', 'sma', 'window', 'count')
+
+	def __init__(self, period=20):
+		if period is None or period <= 0:
+			raise Exception("`period` cannot be None.")
+
+		self.period = period
+		self.price_index = int(period / 2 + 1)
+		self.sma = SimpleMovingAverageStream(period)
+		super().__init__()
+
+	@property
+	def lookback(self):
+		return self.period + self.price_index - 1
+
+	def reset(self):
+		self.sma.reset()
+		self.window = RingBuffer(self.price_index + 1)
+		self.count = 0
+		self.value = None
+
+	def update(self, price):
+		self.window.append(self.sma.update(price))
+		self.count += 1
+
+		if self.count < self.period + self.price_index:
+			self.value = 0.00
+		else:
+			self.value = price - self.window.get(0)
+
+		return self.value
 
 class MassIndex(AbstractHighLowPriceIndicator):
+
+	outputs = ('mi',)
 	
 	def __init__(self, prices=[], high=[], low=[], mi_period=25, ema_period=9):
 		self.high = high
@@ -521,7 +915,7 @@ class MassIndex(AbstractHighLowPriceIndicator):
 		self.ema_period = ema_period
 		self.mi = []
 
-	def calculate(self):
+	def calculate(self, backend=None):
 		if len(self.mi) != 0:
 			return self.mi
 
@@ -530,9 +924,10 @@ class MassIndex(AbstractHighLowPriceIndicator):
 		diff_h_l = [ self.high[i] - self.low[i] for i in range(len(self.high))]
 
 		ema = ExponentialMovingAverage(diff_h_l, self.ema_period)
-		single_ema = ema.calculate()
+		single_ema = ema.calculate(self.select_backend(backend))
 		ema.reset(single_ema, self.ema_period)
-		double_ema = ema.calculate()
+		double_ema = ema.calculate(self.select_backend(backend))
+		self.set_backend_used(ema)
 
 		ema_ratio = []
 		for i in range(len(single_ema)):
@@ -549,7 +944,52 @@ class MassIndex(AbstractHighLowPriceIndicator):
 		
 		return self.mi
 
+	def get_stream(self):
+		return MassIndexStream(self.mi_period, self.ema_period)
+
+class MassIndexStream(AbstractStreamingIndicator):
+
+	__slots__ = ('mi_period', 'ema_period', 'single_ema', 'double_ema', 'window')
+
+	def __init__(self, mi_period=25, ema_period=9):
+		if mi_period is None or mi_period <= 0:
+			raise Exception("`mi_period` cannot be None.")
+
+		self.mi_period = mi_period
+		self.ema_period = ema_period
+		self.single_ema = ExponentialMovingAverageStream(ema_period)
+		self.double_ema = ExponentialMovingAverageStream(ema_period)
+		super().__init__()
+
+	@property
+	def lookback(self):
+		return self.single_ema.lookback + self.double_ema.lookback + self.mi_period - 1
+
+	@property
+	def recursive(self):
+		return True
+
+	def reset(self):
+		self.single_ema.reset()
+		self.double_ema.reset()
+		self.window = RingBuffer(self.mi_period)
+		self.value = None
+
+	def update(self, price, high, low):
+		single_ema = self.single_ema.update(high - low)
+		double_ema = self.double_ema.update(single_ema)
+		self.window.append(0 if double_ema == 0 else round(single_ema / double_ema, 2))
+
+		if not self.window.is_full():
+			self.value = 0.00
+		else:
+			self.value = round(sum(self.window.column()), 2)
+
+		return self.value
+
 class VortexIndicator(AbstractHighLowPriceIndicator):
+
+	outputs = ('pos_vi', 'neg_vi')
 	
 	def __init__(self, prices=[], high=[], low=[], period=21):
 		self.period = period
@@ -564,6 +1004,7 @@ class VortexIndicator(AbstractHighLowPriceIndicator):
 		super().__init__(prices, high, low)
 
 	def reset(self, prices=[], high=[], low=[], period=21):
+		self.prices = prices
 		self.high = high
 		self.low = low
 		self.period = period
@@ -666,22 +1107,146 @@ class VortexIndicator(AbstractHighLowPriceIndicator):
 
 		return self.period_neg_vm
 		
-	def calculate(self):
-		if len(self.pos_vi) != 0 and len(neg_vi) != 0:
+	def calculate(self, backend=None):
+		if len(self.pos_vi) != 0 and len(self.neg_vi) != 0:
 			return (self.pos_vi, self.neg_vi)
 
 		self.validate()
-		
-		for i in range(len(self.get_period_tr())):
-			if i < self.period - 1:
-				self.pos_vi.append(0.00)
-				self.neg_vi.append(0.00)
-			else:
-				self.pos_vi.append(round(self.get_period_pos_vm()[i] / self.get_period_tr()[i], 2))
-				self.neg_vi.append(round(self.get_period_neg_vm()[i] / self.get_period_tr()[i], 2))
+
+		self.pos_vi, self.neg_vi = VortexIndicatorStream(self.period).run(self.prices, self.high, self.low)
+		self.set_backend_used()
 
 		return (self.pos_vi, self.neg_vi)
 
+	def get_stream(self):
+		return VortexIndicatorStream(self.period)
 
+class VortexIndicatorStream(AbstractStreamingIndicator):
 
+	n_outputs = 2
+	__slots__ = ('period', 'window', 'sum_tr', 'sum_pos_vm', 'sum_neg_vm', 'prev_price', 'prev_high', 'prev_low', 'count')
 
+	def __init__(self, period=21):
+		if period is None or period <= 0:
+			raise Exception("`period` cannot be None.")
+
+		self.period = period
+		super().__init__()
+
+	@property
+	def lookback(self):
+		return self.period
+
+	def reset(self):
+		self.window = RingBuffer(self.period, 3)
+		self.sum_tr = 0.0
+		self.sum_pos_vm = 0.0
+		self.sum_neg_vm = 0.0
+		self.prev_price = None
+		self.prev_high = None
+		self.prev_low = None
+		self.count = 0
+		self.value = None
+
+	def update(self, price, high, low):
+		if self.count == 0:
+			tr = 0.00
+			pos_vm = 0.00
+			neg_vm = 0.00
+		else:
+			tr = round(max(abs(high - low), abs(low - self.prev_low), abs(high - self.prev_price)), 2)
+			pos_vm = round(abs(high - self.prev_low), 2)
+			neg_vm = round(abs(low - self.prev_high), 2)
+
+		evicted = self.window.append(tr, pos_vm, neg_vm)
+		if evicted is not None and self.window.start == 0:
+			self.sum_tr = self.window.column_sum(0)
+			self.sum_pos_vm = self.window.column_sum(1)
+			self.sum_neg_vm = self.window.column_sum(2)
+		else:
+			self.sum_tr += tr
+			self.sum_pos_vm += pos_vm
+			self.sum_neg_vm += neg_vm
+			if evicted is not None:
+				self.sum_tr -= evicted[0]
+				self.sum_pos_vm -= evicted[1]
+				self.sum_neg_vm -= evicted[2]
+
+		self.prev_price = price
+		self.prev_high = high
+		self.prev_low = low
+		self.count += 1
+
+		period_tr = round(self.sum_tr, 2)
+		if self.count < self.period or period_tr == 0:
+			self.value = (0.00, 0.00)
+		else:
+			self.value = (round(round(self.sum_pos_vm, 2) / period_tr, 2), round(round(self.sum_neg_vm, 2) / period_tr, 2))
+
+		return self.value
+
+@register('simple_moving_average', 'python')
+def _simple_moving_average(prices, period):
+	sma = []
+	for i in range(len(prices)):
+		if i < period - 1:
+			sma.append(0)
+		else:
+			sma.append(round(sum(prices[i + 1 - period : i + 1]) / period, 2))
+
+	return sma
+
+@register('simple_moving_average', 'numpy')
+def _simple_moving_average_numpy(prices, period):
+	return vectorized.simple_moving_average(prices, period).tolist()
+
+@register('weighted_moving_average', 'python')
+def _weighted_moving_average(prices, period):
+	denominator = period * (period + 1) // 2
+	wma = []
+	total_price = 0
+	numerator = 0
+	for i in range(len(prices)):
+		if i < period - 1:
+			wma.append(0.00)
+		elif i == period - 1:
+			total_price = sum(prices[i - period + 1 : i + 1])
+			numerator = 0
+			for j in range(period):
+				numerator += (j + 1) * prices[j]
+			wma.append(round(numerator / denominator, 2))
+		else:
+			numerator = numerator + period * prices[i] - total_price
+			total_price = total_price + prices[i] - prices[i - period]
+			wma.append(round(numerator / denominator, 2))
+
+	return wma
+
+@register('weighted_moving_average', 'numba')
+def _weighted_moving_average_numba(prices, period):
+	return kernels.weighted_moving_average(np.asarray(prices, dtype=np.float64), period).tolist()
+
+@register('exponential_moving_average', 'python')
+def _exponential_moving_average(prices, period):
+	multiplier = 2 / (period + 1)
+	ema = []
+	for i in range(len(prices)):
+		if i == 0:
+			ema.append(prices[i])
+		else:
+			ema.append(round((prices[i] - ema[i - 1]) * multiplier + ema[i - 1], 2))
+
+	return ema
+
+@register('exponential_moving_average', 'numba')
+def _exponential_moving_average_numba(prices, period):
+	return kernels.exponential_moving_average(np.asarray(prices, dtype=np.float64), period).tolist()
+
+@register('average_directional_index', 'python')
+def _average_directional_index(prices, high, low, period):
+	return AverageDirectionalIndexStream(period, with_di=True).run(prices, high, low)
+
+@register('average_directional_index', 'numba')
+def _average_directional_index_numba(prices, high, low, period):
+	adx, pos_di, neg_di = kernels.average_directional_index(np.asarray(prices, dtype=np.float64), np.asarray(high, dtype=np.float64), np.asarray(low, dtype=np.float64), period)
+	return (adx.tolist(), pos_di.tolist(), neg_di.tolist())
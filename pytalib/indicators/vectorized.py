@@ -0,0 +1,346 @@
+"""
+numpy versions of indicator computations that return the same values as the indicator classes
+
+Every function computes in float64. A `dtype` argument only sets the type of the returned array: the
+result is cast once at the end, so float32 output saves memory but not arithmetic.
+"""
+
+import numpy as np
+from . import kernels
+
+FLOAT32_RELATIVE_ERROR = 2.0 ** -24
+TIE_TOLERANCE = 1e-6
+# drift of a running sum, relative to the sum of the magnitudes added to and removed from it
+SUM_DRIFT = 1e-15
+
+def near_tie(values, decimals=2, error=0.0):
+	"""
+	mask of values within floating point noise of a rounding tie
+
+	`error` bounds how far each value may be from the exact one, and widens the test by that much.
+	"""
+	with np.errstate(invalid='ignore'):
+		scaled = np.abs(values) * 10 ** decimals
+		return np.abs(scaled - np.floor(scaled) - 0.5) < TIE_TOLERANCE + error * 10 ** decimals
+
+def is_near_tie(value, decimals=2, error=0.0):
+	"""
+	`near_tie` of one float, without numpy overhead
+	"""
+	scaled = abs(value) * 10 ** decimals
+	return abs(scaled % 1 - 0.5) < TIE_TOLERANCE + error * 10 ** decimals
+
+def round_exact(values, decimals=2):
+	"""
+	numpy rounding corrected to agree with builtin round() on values close to a tie
+	"""
+	values = np.asarray(values, dtype=np.float64)
+	rounded = np.round(values, decimals)
+
+	ties = np.flatnonzero(near_tie(values, decimals))
+	if ties.size > 0:
+		rounded.flat[ties] = round_ties(values.flat[ties], decimals)
+
+	return rounded
+
+def round_ties(values, decimals=2):
+	"""
+	builtin round() of values close to a rounding tie, the same exact test as kernels.round_half_even
+	"""
+	scale = 10.0 ** decimals
+	with np.errstate(over='ignore', invalid='ignore'):
+		scaled = values * scale
+		splitter = 134217729.0 * values
+		values_hi = splitter - (splitter - values)
+		error = (values_hi * scale - scaled) + (values - values_hi) * scale
+
+		rounded = np.floor(scaled)
+		fraction = scaled - rounded
+		up = (fraction > 0.5) | ((fraction == 0.5) & ((error > 0) | ((error == 0) & (rounded % 2 == 1))))
+		result = np.copysign((rounded + up) / scale, values)
+
+	for i in np.flatnonzero(~np.isfinite(scaled) | (np.abs(scaled) >= 4503599627370496.0)):
+		result[i] = round(float(values[i]), decimals)
+
+	return result
+
+def rolling_sum(values, period):
+	"""
+	float64 sums of every full window, element i covers values[i : i + period]
+
+	Each window is added left to right like sum() does, so the sums are bit-identical to the python
+	implementation at any magnitude; a cumulative sum difference drifts by more than a rounding tie
+	on long series of large values. This costs `period` vectorized passes instead of one, O(n * period).
+	"""
+	values = np.asarray(values, dtype=np.float64)
+	count = len(values) - period + 1
+	totals = values[:count].copy()
+	for j in range(1, period):
+		totals += values[j : j + count]
+
+	return totals
+
+def rolling_mean(values, period):
+	"""
+	rounded window means that match sum(window) / period of the python implementation
+	"""
+	means = rolling_sum(values, period) / period
+	rounded = np.round(means, 2)
+
+	for i in np.flatnonzero(near_tie(means)):
+		rounded[i] = round(sum(values[i : i + period].tolist()) / period, 2)
+
+	return rounded
+
+def simple_moving_average(prices, period, dtype=np.float64):
+	"""
+	simple moving average, zero before the first full window
+
+	The window sums are accumulated in float64 whatever `dtype` is.
+	"""
+	values = np.asarray(prices, dtype=np.float64)
+	sma = np.zeros(len(values))
+	if period <= 0 or len(values) < period:
+		return sma.astype(dtype)
+
+	sma[period - 1:] = rolling_mean(values, period)
+
+	return sma.astype(dtype)
+
+def weighted_moving_average(prices, period, dtype=np.float64):
+	"""
+	linearly weighted moving average, zero before the first full window
+	"""
+	values = np.asarray(prices, dtype=np.float64)
+	if period <= 0 or len(values) < period:
+		return np.zeros(len(values), dtype=dtype)
+
+	return kernels.weighted_moving_average(values, period).astype(dtype)
+
+def exponential_moving_average(prices, period, dtype=np.float64):
+	"""
+	exponential moving average seeded with the first price
+	"""
+	return kernels.exponential_moving_average(np.asarray(prices, dtype=np.float64), period).astype(dtype)
+
+def moving_average(prices, period, ma_type='SMA', dtype=np.float64):
+	if ma_type == 'EMA':
+		return exponential_moving_average(prices, period, dtype)
+	elif ma_type == 'WMA':
+		return weighted_moving_average(prices, period, dtype)
+
+	return simple_moving_average(prices, period, dtype)
+
+def gain_loss(prices):
+	"""
+	rounded gain and loss of every bar against the previous close
+	"""
+	values = np.asarray(prices, dtype=np.float64)
+	change = np.zeros(len(values))
+	change[1:] = values[1:] - values[:-1]
+
+	gain = round_exact(np.where(change > 0, change, 0.0), 2)
+	loss = round_exact(np.where(change < 0, -change, 0.0), 2)
+
+	return (gain, loss)
+
+def relative_strength_index(prices, period=14, dtype=np.float64):
+	"""
+	relative strength index over simple average gains and losses, 100 when the average loss is zero
+	"""
+	gain, loss = gain_loss(prices)
+	return relative_strength_index_from_gain_loss(gain, loss, period, dtype)
+
+def relative_strength_index_from_gain_loss(gain, loss, period=14, dtype=np.float64):
+	"""
+	relative strength index of the series `gain_loss` returned
+	"""
+	rsi = np.zeros(len(gain))
+	if period <= 0 or len(gain) <= period:
+		return rsi.astype(dtype)
+
+	avg_gain = rolling_mean(gain, period)[1:]
+	avg_loss = rolling_mean(loss, period)[1:]
+
+	with np.errstate(divide='ignore', invalid='ignore'):
+		rs = round_exact(avg_gain / avg_loss, 2)
+		rsi[period:] = np.where(avg_loss == 0, 100.0, round_exact(100 - 100 / (1 + rs), 2))
+
+	return rsi.astype(dtype)
+
+def standard_deviation(prices, period=20, dtype=np.float64):
+	"""
+	population standard deviation of every full window
+	"""
+	values = np.asarray(prices, dtype=np.float64)
+	std = np.zeros(len(values))
+	if period <= 0 or len(values) < period:
+		return std.astype(dtype)
+
+	windows = np.lib.stride_tricks.sliding_window_view(values, period)
+	deviation = np.sqrt(np.mean((windows - windows.mean(axis=1, keepdims=True)) ** 2, axis=1))
+	std[period - 1:] = np.round(deviation, 2)
+
+	for i in np.flatnonzero(near_tie(deviation)):
+		window = values[i : i + period].tolist()
+		mean = sum(window) / period
+		std[i + period - 1] = round((sum([(x - mean) ** 2 for x in window]) / period) ** 0.5, 2)
+
+	return std.astype(dtype)
+
+def bollinger_bands(prices, period=20, ma_type='SMA', num_std=2, dtype=np.float64):
+	"""
+	upper band, moving average and lower band
+	"""
+	ma = moving_average(prices, period, ma_type)
+	std = standard_deviation(prices, period)
+
+	return (round_exact(ma + num_std * std, 2).astype(dtype), ma.astype(dtype), round_exact(ma - num_std * std, 2).astype(dtype))
+
+def money_flow_index(prices, high, low, volume, period=14, dtype=np.float64):
+	"""
+	money flow index, the negative money flow of a window is floored at 1
+	"""
+	return money_flow_index_from_typical_price(typical_price(prices, high, low), prices, volume, period, dtype)
+
+def typical_price(prices, high, low):
+	"""
+	rounded average of high, low and close
+	"""
+	return round_exact((np.asarray(high, dtype=np.float64) + np.asarray(low, dtype=np.float64) + np.asarray(prices, dtype=np.float64)) / 3, 2)
+
+def money_flow_index_from_typical_price(tp, prices, volume, period=14, dtype=np.float64):
+	"""
+	money flow index of the series `typical_price` returned
+	"""
+	prices = np.asarray(prices, dtype=np.float64)
+	raw_mf = round_exact(tp * np.asarray(volume, dtype=np.float64), 2)
+
+	up = np.zeros(len(prices), dtype=bool)
+	down = np.zeros(len(prices), dtype=bool)
+	up[1:] = prices[1:] > prices[:-1]
+	down[1:] = prices[1:] < prices[:-1]
+
+	mfi = np.zeros(len(prices))
+	if period <= 0 or len(prices) <= period + 1:
+		return mfi.astype(dtype)
+
+	pos_mf = round_exact(rolling_sum(np.where(up, raw_mf, 0.0), period), 2)[2:]
+	neg_mf = round_exact(np.maximum(rolling_sum(np.where(down, raw_mf, 0.0), period), 1), 2)[2:]
+	mfi[period + 1:] = round_exact(100 - 100 / (1 + pos_mf / neg_mf), 2)
+
+	return mfi.astype(dtype)
+
+def ultimate_oscillator(prices, high, low, s_period=7, m_period=14, l_period=28, s_weight=4, m_weight=2, l_weight=1, dtype=np.float64):
+	"""
+	ultimate oscillator, zero until `l_period` bars have been seen
+	"""
+	prices = np.asarray(prices, dtype=np.float64)
+	high = np.asarray(high, dtype=np.float64)
+	low = np.asarray(low, dtype=np.float64)
+
+	n = len(prices)
+	bp = np.zeros(n)
+	tr = np.zeros(n)
+	bp[1:] = round_exact(prices[1:] - np.minimum(low[1:], prices[:-1]), 2)
+	tr[1:] = round_exact(np.maximum(high[1:], prices[:-1]) - np.minimum(low[1:], prices[:-1]), 2)
+
+	averages = []
+	for period in (s_period, m_period, l_period):
+		average = np.zeros(n)
+		if n > period:
+			bp_sum = rolling_sum(bp, period)[1:]
+			tr_sum = rolling_sum(tr, period)[1:]
+			with np.errstate(divide='ignore', invalid='ignore'):
+				ratio = np.where(tr_sum == 0, 0.0, bp_sum / tr_sum)
+			average[period:] = np.round(ratio, 2)
+			for i in np.flatnonzero(near_tie(ratio)):
+				window = slice(i + 1, i + 1 + period)
+				average[i + period] = round(sum(bp[window].tolist()) / sum(tr[window].tolist()), 2)
+		averages.append(average)
+
+	uo = np.zeros(n)
+	weighted = 100 * ((s_weight * averages[0]) + (m_weight * averages[1]) + (l_weight * averages[2])) / (s_weight + m_weight + l_weight)
+	uo[l_period:] = round_exact(weighted[l_period:], 2)
+
+	return uo.astype(dtype)
+
+def true_range(prices, high, low):
+	"""
+	true range of every bar as AverageTrueRange defines it, zero for the first bar
+	"""
+	prices = np.asarray(prices, dtype=np.float64)
+	high = np.asarray(high, dtype=np.float64)
+	low = np.asarray(low, dtype=np.float64)
+
+	tr = np.zeros(len(prices))
+	tr[1:] = round_exact(np.maximum(np.maximum(np.abs(high[1:] - low[1:]), np.abs(low[1:] - low[:-1])), np.abs(high[1:] - prices[:-1])), 2)
+
+	return tr
+
+def mf_multiplier(prices, high, low):
+	"""
+	money flow multiplier of each bar, zero range bars are filled with the largest multiplier
+	"""
+	prices = np.asarray(prices, dtype=np.float64)
+	high = np.asarray(high, dtype=np.float64)
+	low = np.asarray(low, dtype=np.float64)
+
+	spread = high - low
+	valid = spread != 0
+	multiplier = np.zeros(len(prices))
+	np.divide((prices - low) - (high - prices), spread, out=multiplier, where=valid)
+	multiplier = round_exact(multiplier, 2)
+
+	candidates = multiplier[valid & (multiplier != 0)]
+	multiplier[~valid] = candidates.max() if candidates.size > 0 else float("-inf")
+
+	return multiplier
+
+def accumulation_distribution_line(prices, high, low, volume):
+	"""
+	accumulation distribution line as the cumulative sum of money flow volume
+	"""
+	mf_volume = round_exact(mf_multiplier(prices, high, low) * np.asarray(volume, dtype=np.float64), 2)
+	return np.cumsum(mf_volume)
+
+def emv_distance(high, low):
+	"""
+	change of the high-low midpoint between consecutive bars
+	"""
+	high = np.asarray(high, dtype=np.float64)
+	low = np.asarray(low, dtype=np.float64)
+
+	distance = np.zeros(len(high))
+	midpoint = (high + low) / 2
+	distance[1:] = round_exact(midpoint[1:] - midpoint[:-1], 2)
+
+	return distance
+
+def box_ratio(high, low, volume):
+	"""
+	box ratio of each bar, zero range bars are filled with the largest ratio
+	"""
+	high = np.asarray(high, dtype=np.float64)
+	low = np.asarray(low, dtype=np.float64)
+	volume = np.asarray(volume, dtype=np.float64)
+
+	spread = high - low
+	valid = spread != 0
+	ratio = np.zeros(len(high))
+	np.divide(volume / 100000000, spread, out=ratio, where=valid)
+	ratio = round_exact(ratio, 2)
+
+	ratio[~valid] = ratio[valid].max() if valid.any() else float("-inf")
+
+	return ratio
+
+def ease_of_movement(high, low, volume):
+	"""
+	one period ease of movement, box ratios are floored at the smallest positive ratio
+	"""
+	ratio = box_ratio(high, low, volume)
+	positive = ratio[ratio > 0]
+	min_box_ratio = positive.min() if positive.size > 0 else float("inf")
+
+	return round_exact(emv_distance(high, low) / np.maximum(min_box_ratio, ratio), 2)
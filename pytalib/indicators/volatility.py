@@ -1,9 +1,13 @@
-from .base import VolatilityIndicator, AbstractPriceIndicator, AbstractHighLowPriceIndicator
-from .trend import SimpleMovingAverage, WeightedMovingAverage, ExponentialMovingAverage
+from .base import VolatilityIndicator, AbstractPriceIndicator, AbstractHighLowPriceIndicator, AbstractStreamingIndicator, RingBuffer
+from .trend import SimpleMovingAverage, WeightedMovingAverage, ExponentialMovingAverage, get_ma_class, get_ma_stream
+from . import planner, vectorized
+from .backend import register
 from math import sqrt
 
 class AverageTrueRange(AbstractHighLowPriceIndicator):
 
+	outputs = ('atr',)
+
 	def __init__(self, prices, high, low, period=14, ma_type='SMA'):
 		self.period = period
 		self.tr = []
@@ -54,18 +58,68 @@ class AverageTrueRange(AbstractHighLowPriceIndicator):
 
 		return  SimpleMovingAverage(series, period)
 
-	def calculate(self):
+	def calculate(self, backend=None):
 		if len(self.atr) != 0:
 			return self.atr
 
 		self.validate()
 
-		self.atr = self.get_ma(self.get_tr(), self.period, self.ma_type).calculate()
+		self.atr = self.dispatch('average_true_range', self.prices, self.high, self.low, self.period, self.ma_type, backend=backend)
 
 		return self.atr
 
+	def calculate_array(self):
+		"""
+		average true range as a float64 array, computed with numpy on the input arrays without copying them
+		"""
+		self.validate()
+
+		return vectorized.moving_average(vectorized.true_range(self.prices, self.high, self.low), self.period, self.ma_type)
+
+	def get_stream(self):
+		return AverageTrueRangeStream(self.period, self.ma_type)
+
+class AverageTrueRangeStream(AbstractStreamingIndicator):
+
+	__slots__ = ('period', 'ma_type', 'ma', 'prev_price', 'prev_low', 'tr')
+
+	def __init__(self, period=14, ma_type='SMA'):
+		self.period = period
+		self.ma_type = ma_type
+		self.ma = get_ma_stream(period, ma_type)
+		super().__init__()
+
+	@property
+	def lookback(self):
+		return self.ma.lookback + 1
+
+	@property
+	def recursive(self):
+		return self.ma.recursive
+
+	def reset(self):
+		self.ma.reset()
+		self.prev_price = None
+		self.prev_low = None
+		self.tr = None
+		self.value = None
+
+	def update(self, price, high, low):
+		if self.prev_price is None:
+			self.tr = 0.00
+		else:
+			self.tr = round(max(abs(high - low), abs(low - self.prev_low), abs(high - self.prev_price)), 2)
+
+		self.prev_price = price
+		self.prev_low = low
+		self.value = self.ma.update(self.tr)
+
+		return self.value
+
 class BollingerBands(AbstractPriceIndicator):
 
+	outputs = ('bb_up', 'ma', 'bb_down')
+
 	def __init__(self, prices=[], period=20, ma_type='SMA', num_std=2):
 		self.period = period
 		self.num_std = num_std
@@ -107,23 +161,71 @@ class BollingerBands(AbstractPriceIndicator):
 		if len(self.messages) > 0:
 			raise Exception(", ".join(self.messages))
 
-	def calculate(self):
+	def calculate(self, backend=None):
 		if len(self.bb_up) != 0 and len(self.ma) != 0 and len(self.bb_down) != 0:
 			return (self.bb_up, self.ma, self.bb_down)
 
 		self.validate()
+		self.bb_up, self.ma, self.bb_down = self.evaluate_nodes(self.get_nodes(), backend)
 
-		self.ma = self.get_ma(self.prices, self.period, self.ma_type).calculate()
-		std = StandardDeviation(self.prices, self.period).calculate()
+		return (self.bb_up, self.ma, self.bb_down)
 
-		for i in range(len(self.prices)):
-			self.bb_up.append(round(self.ma[i] + self.num_std * std[i], 2))
-			self.bb_down.append(round(self.ma[i] - self.num_std * std[i], 2))
+	def calculate_array(self):
+		"""
+		upper band, moving average and lower band as float64 arrays, computed with numpy on the input array
+		without copying it
+		"""
+		self.validate()
 
-		return (self.bb_up, self.ma, self.bb_down)
+		return vectorized.bollinger_bands(self.prices, self.period, self.ma_type, self.num_std)
+
+	def get_nodes(self, prices=None):
+		prices = prices if prices is not None else planner.source('prices')
+		ma = planner.indicator(get_ma_class(self.ma_type), prices, period=self.period)
+		std = planner.indicator(StandardDeviation, prices, period=self.period)
+
+		return [planner.operation('band', ma, std, multiplier=self.num_std), ma, planner.operation('band', ma, std, multiplier=-self.num_std)]
+
+	def get_stream(self):
+		return BollingerBandsStream(self.period, self.ma_type, self.num_std)
+
+class BollingerBandsStream(AbstractStreamingIndicator):
+
+	n_outputs = 3
+	__slots__ = ('period', 'ma_type', 'num_std', 'ma', 'std')
+
+	def __init__(self, period=20, ma_type='SMA', num_std=2):
+		self.period = period
+		self.ma_type = ma_type
+		self.num_std = num_std
+		self.ma = get_ma_stream(period, ma_type)
+		self.std = StandardDeviationStream(period)
+		super().__init__()
+
+	@property
+	def lookback(self):
+		return max(self.ma.lookback, self.std.lookback)
+
+	@property
+	def recursive(self):
+		return self.ma.recursive
+
+	def reset(self):
+		self.ma.reset()
+		self.std.reset()
+		self.value = None
+
+	def update(self, price):
+		ma = self.ma.update(price)
+		std = self.std.update(price)
+		self.value = (round(ma + self.num_std * std, 2), ma, round(ma - self.num_std * std, 2))
+
+		return self.value
 
 class PriceChannel(AbstractHighLowPriceIndicator):
 
+	outputs = ('pc_up', 'pc_mid', 'pc_down')
+
 	def __init__(self, prices, high, low, period=20):
 		self.period = period
 		self.pc_up = []
@@ -152,11 +254,12 @@ class PriceChannel(AbstractHighLowPriceIndicator):
 		if len(self.messages) > 0:
 			raise Exception(", ".join(self.messages))
 
-	def calculate(self):
+	def calculate(self, backend=None):
 		if len(self.pc_up) != 0 and len(self.pc_down) != 0 and len(self.pc_mid) != 0:
 			return (self.pc_up, self.pc_mid, self.pc_down)
 		
 		self.validate()
+		self.set_backend_used()
 
 		for i in range(len(self.prices)):
 			start = i
@@ -169,8 +272,50 @@ class PriceChannel(AbstractHighLowPriceIndicator):
 
 		return (self.pc_up, self.pc_mid, self.pc_down)
 
+	def get_stream(self):
+		return PriceChannelStream(self.period)
+
+class PriceChannelStream(AbstractStreamingIndicator):
+
+	n_outputs = 3
+	__slots__ = ('period', 'count', 'period_high', 'period_low')
+
+	def __init__(self, period=20):
+		if period is None or period <= 0:
+			raise Exception("`period` cannot be None.")
+
+		self.period = period
+		super().__init__()
+
+	@property
+	def lookback(self):
+		return self.period - 1
+
+	def reset(self):
+		self.count = 0
+		self.period_high = None
+		self.period_low = None
+		self.value = None
+
+	def update(self, price, high, low):
+		if self.count < self.period - 1:
+			self.period_high = high if self.period_high is None else max(self.period_high, high)
+			self.period_low = low if self.period_low is None else min(self.period_low, low)
+			pc_up = self.period_high
+			pc_down = self.period_low
+		else:
+			pc_up = high
+			pc_down = low
+		self.count += 1
+
+		self.value = (pc_up, (pc_up + pc_down) / 2, pc_down)
+
+		return self.value
+
 class KeltnerChannel(AbstractHighLowPriceIndicator):
 
+	outputs = ('kc_up', 'ma', 'kc_down')
+
 	def __init__(self, prices, high, low, ma_type='EMA', ma_period=20, atr_period=10, num_atr=2, atr_ma_type='SMA'):
 		self.ma_type = ma_type
 		self.ma_period = ma_period
@@ -180,6 +325,7 @@ class KeltnerChannel(AbstractHighLowPriceIndicator):
 		self.kc_up = []
 		self.ma = []
 		self.kc_down = []
+		self.atr = []
 		super().__init__(prices, high, low)
 
 	def reset(self, prices, high, low, ma_type='EMA', ma_period=20, atr_period=10, num_atr=2, atr_ma_type='SMA'):
@@ -194,6 +340,7 @@ class KeltnerChannel(AbstractHighLowPriceIndicator):
 		self.kc_up = []
 		self.ma = []
 		self.kc_down = []
+		self.atr = []
 
 	def get_ma(self, series, period, ma_type='SMA'):
 		if ma_type == 'EMA':
@@ -224,21 +371,93 @@ class KeltnerChannel(AbstractHighLowPriceIndicator):
 		if len(self.messages) > 0:
 			raise Exception(", ".join(self.messages))
 
-	def calculate(self):
+	def calculate(self, backend=None):
 		if len(self.kc_up) != 0 and len(self.ma) != 0 and len(self.kc_down) != 0:
 			return (self.kc_up, self.ma, self.kc_down)
 
-		self.ma = self.get_ma(self.prices, self.ma_period, self.ma_type).calculate()
-		atr = AverageTrueRange(self.prices, self.high, self.low, self.atr_period, self.atr_ma_type).calculate()
-
-		for i in range(len(self.prices)):
-			self.kc_up.append(round(self.ma[i] + self.num_atr * atr[i]  , 2))
-			self.kc_down.append(round(self.ma[i] - self.num_atr * atr[i]  , 2))
+		self.validate()
+		sources = [planner.source(name) for name in ('prices', 'high', 'low')]
+		self.kc_up, self.ma, self.kc_down, self.atr = self.evaluate_nodes(self.get_nodes(*sources) + [self.get_atr_node(*sources)], backend)
 
 		return (self.kc_up, self.ma, self.kc_down)
 
+	def get_atr_node(self, prices, high, low):
+		return planner.indicator(AverageTrueRange, prices, high, low, period=self.atr_period, ma_type=self.atr_ma_type)
+
+	def get_nodes(self, prices=None, high=None, low=None):
+		if prices is None:
+			prices, high, low = [planner.source(name) for name in ('prices', 'high', 'low')]
+		ma = planner.indicator(get_ma_class(self.ma_type), prices, period=self.ma_period)
+		atr = self.get_atr_node(prices, high, low)
+
+		return [planner.operation('band', ma, atr, multiplier=self.num_atr), ma, planner.operation('band', ma, atr, multiplier=-self.num_atr)]
+
+	def get_atr(self):
+		if len(self.atr) == 0:
+			self.calculate()
+
+		return self.atr
+
+	def get_stream(self):
+		return KeltnerChannelStream(self.ma_type, self.ma_period, self.atr_period, self.num_atr, self.atr_ma_type)
+
+class KeltnerChannelStream(AbstractStreamingIndicator):
+
+	n_outputs = 3
+	__slots__ = ('ma_type', 'ma_period', 'atr_period', 'num_atr', 'atr_ma_type', 'ma', 'shared_atr', 'atr')
+
+	def __init__(self, ma_type='EMA', ma_period=20, atr_period=None, num_atr=2, atr_ma_type=None, atr=None):
+		"""
+		`atr` is an `AverageTrueRangeStream` updated by the caller, whose period and moving average type are
+		used when `atr_period` and `atr_ma_type` are None and must match them otherwise
+		"""
+		if atr is not None:
+			if atr_period is not None and atr_period != atr.period:
+				raise Exception("`atr_period` must match the period of the shared `atr`.")
+			if atr_ma_type is not None and atr_ma_type != atr.ma_type:
+				raise Exception("`atr_ma_type` must match the moving average type of the shared `atr`.")
+			atr_period = atr.period
+			atr_ma_type = atr.ma_type
+
+		self.ma_type = ma_type
+		self.ma_period = ma_period
+		self.atr_period = atr_period if atr_period is not None else 10
+		self.num_atr = num_atr
+		self.atr_ma_type = atr_ma_type if atr_ma_type is not None else 'SMA'
+		self.ma = get_ma_stream(ma_period, ma_type)
+		self.shared_atr = atr is not None
+		self.atr = atr if atr is not None else AverageTrueRangeStream(self.atr_period, self.atr_ma_type)
+		super().__init__()
+
+	@property
+	def lookback(self):
+		return max(self.ma.lookback, self.atr.lookback)
+
+	@property
+	def recursive(self):
+		return self.ma.recursive or self.atr.recursive
+
+	def reset(self):
+		self.ma.reset()
+		if not self.shared_atr:
+			self.atr.reset()
+		self.value = None
+
+	def update(self, price, high, low):
+		ma = self.ma.update(price)
+		if self.shared_atr:
+			atr = self.atr.value
+		else:
+			atr = self.atr.update(price, high, low)
+
+		self.value = (round(ma + self.num_atr * atr, 2), ma, round(ma - self.num_atr * atr, 2))
+
+		return self.value
+
 class StandardDeviation(VolatilityIndicator):
 
+	outputs = ('std',)
+
 	def __init__(self, prices, period=20):
 		self.std = []
 		super().__init__(prices, period)
@@ -263,19 +482,71 @@ class StandardDeviation(VolatilityIndicator):
 
 		return sd
 
-	def calculate(self):
+	def calculate(self, backend=None):
 		if len(self.std) != 0:
 			return self.std
 
 		self.validate()
 
-		for i in range(len(self.prices)):
-			if i < self.period - 1:
-				self.std.append(0.00)
-			else:
-				std = self.standard_deviation(self.prices[i - self.period + 1 : i + 1])
-				self.std.append(round(std, 2))
+		self.std = self.dispatch('standard_deviation', self.prices, self.period, backend=backend)
 
 		return self.std
 
+	def get_stream(self):
+		return StandardDeviationStream(self.period)
+
+class StandardDeviationStream(AbstractStreamingIndicator):
+
+	__slots__ = ('period', 'window')
+
+	def __init__(self, period=20):
+		if period is None or period <= 0:
+			raise Exception("`period` cannot be None.")
+
+		self.period = period
+		super().__init__()
+
+	@property
+	def lookback(self):
+		return self.period - 1
+
+	def reset(self):
+		self.window = RingBuffer(self.period)
+		self.value = None
+
+	def update(self, price):
+		self.window.append(price)
+
+		if not self.window.is_full():
+			self.value = 0.00
+		else:
+			window = self.window.column()
+			mean = sum(window) / self.period
+			variance = sum([(x - mean) ** 2 for x in window]) / self.period
+			self.value = round(sqrt(variance), 2)
+
+		return self.value
+
+@register('average_true_range', 'python')
+def _average_true_range(prices, high, low, period, ma_type):
+	return AverageTrueRangeStream(period, ma_type).run(prices, high, low)
+
+@register('average_true_range', 'numpy')
+def _average_true_range_numpy(prices, high, low, period, ma_type):
+	return vectorized.moving_average(vectorized.true_range(prices, high, low), period, ma_type).tolist()
+
+@register('standard_deviation', 'python')
+def _standard_deviation(prices, period):
+	indicator = StandardDeviation(prices, period)
+	std = []
+	for i in range(len(prices)):
+		if i < period - 1:
+			std.append(0.00)
+		else:
+			std.append(round(indicator.standard_deviation(prices[i - period + 1 : i + 1]), 2))
+
+	return std
 
+@register('standard_deviation', 'numpy')
+def _standard_deviation_numpy(prices, period):
+	return vectorized.standard_deviation(prices, period).tolist()
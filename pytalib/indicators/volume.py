@@ -1,9 +1,13 @@
-from .base import VolumeIndicator, AbstractPriceIndicator, AbstractHighLowPriceIndicator
-from .trend import SimpleMovingAverage, WeightedMovingAverage, ExponentialMovingAverage
-from .momentum import RateOfChange
+import numpy as np
+from .base import VolumeIndicator, AbstractPriceIndicator, AbstractHighLowPriceIndicator, AbstractStreamingIndicator
+from .trend import SimpleMovingAverage, WeightedMovingAverage, ExponentialMovingAverage, get_ma_stream
+from . import vectorized
+from .backend import register, merge_backends
 
 class AccumulationDistributionLine(AbstractHighLowPriceIndicator):
 
+	outputs = ('adl',)
+
 	def __init__(self, prices, high, low, volume):
 		self.volume = volume
 		self.mf_multiplier = []
@@ -36,21 +40,7 @@ class AccumulationDistributionLine(AbstractHighLowPriceIndicator):
 		if len(self.mf_multiplier) != 0:
 			return self.mf_multiplier
 
-		for i in range(len(self.prices)):
-			try:
-				self.mf_multiplier.append(round(((self.prices[i] - self.low[i]) - (self.high[i] - self.prices[i])) / (self.high[i] - self.low[i]), 2))
-			except:
-				self.mf_multiplier.append(None)
-
-		max_mf_multiplier = float("-inf")
-		for i in range(len(self.mf_multiplier)):
-			if self.mf_multiplier[i]:
-				if self.mf_multiplier[i] > max_mf_multiplier:
-					max_mf_multiplier = self.mf_multiplier[i]
-
-		for i in range(len(self.mf_multiplier)):
-			if self.mf_multiplier[i] is None:
-				self.mf_multiplier[i] = max_mf_multiplier
+		self.mf_multiplier = vectorized.mf_multiplier(self.prices, self.high, self.low).tolist()
 
 		return self.mf_multiplier
 
@@ -64,23 +54,96 @@ class AccumulationDistributionLine(AbstractHighLowPriceIndicator):
 
 		return self.mf_volume
 
-	def calculate(self):
+	def calculate(self, backend=None):
 		if len(self.adl) != 0:
 			return self.adl
 		
 		self.validate()
 
-		mf_volume = self.get_mf_volume()
-		for i in range(len(self.prices)):
-			if i == 0:
-				self.adl.append(mf_volume[i])
-			else:
-				self.adl.append(self.adl[i - 1] + mf_volume[i])
+		self.adl = self.dispatch('accumulation_distribution_line', self.prices, self.high, self.low, self.volume, backend=backend)
 
 		return self.adl
 
+	def get_stream(self):
+		multiplier = np.asarray(self.get_mf_multiplier())
+		candidates = multiplier[(np.asarray(self.high, dtype=np.float64) != np.asarray(self.low, dtype=np.float64)) & (multiplier != 0)]
+
+		return AccumulationDistributionLineStream(float(candidates.max()) if candidates.size > 0 else float("-inf"))
+
+	def requires_recompute(self, stream, prices, high, low, volume):
+		"""
+		flat bars take the largest multiplier of the whole series, new bars that raise it change those bars
+		"""
+		probe = AccumulationDistributionLineStream()
+		probe.run(prices, high, low, volume)
+
+		fill = max([value for value in (stream.mf_multiplier_fill, probe.max_mf_multiplier) if value is not None], default=None)
+		if fill == stream.mf_multiplier_fill:
+			return False
+		if stream.flat or probe.flat:
+			return True
+
+		stream.mf_multiplier_fill = fill
+		return False
+
+class AccumulationDistributionLineStream(AbstractStreamingIndicator):
+	"""
+	accumulation distribution line
+
+	The batch class gives a flat bar the largest non-zero multiplier of the whole series, or -inf when
+	there is none. A stream cannot see later bars, so a standalone stream uses the largest multiplier seen
+	so far, or 0, and differs from the batch result when a later bar has a larger multiplier.
+	`get_stream()` passes the fill of the whole series instead.
+	"""
+
+	__slots__ = ('mf_multiplier_fill', 'max_mf_multiplier', 'flat')
+
+	def __init__(self, mf_multiplier_fill=None):
+		"""
+		flat bars use `mf_multiplier_fill` when given, otherwise the largest multiplier seen so far
+		"""
+		self.mf_multiplier_fill = mf_multiplier_fill
+		super().__init__()
+
+	@property
+	def lookback(self):
+		return 0
+
+	@property
+	def recursive(self):
+		return True
+
+	def reset(self):
+		self.max_mf_multiplier = None
+		self.flat = False
+		self.value = None
+
+	def update(self, price, high, low, volume):
+		if high - low != 0:
+			mf_multiplier = round(((price - low) - (high - price)) / (high - low), 2)
+			if mf_multiplier and (self.max_mf_multiplier is None or mf_multiplier > self.max_mf_multiplier):
+				self.max_mf_multiplier = mf_multiplier
+		else:
+			self.flat = True
+			if self.mf_multiplier_fill is not None:
+				mf_multiplier = self.mf_multiplier_fill
+			elif self.max_mf_multiplier is not None:
+				mf_multiplier = self.max_mf_multiplier
+			else:
+				mf_multiplier = 0.00
+
+		mf_volume = round(mf_multiplier * volume, 2)
+		if self.value is None:
+			self.value = mf_volume
+		else:
+			self.value = self.value + mf_volume
+
+		return self.value
+
 class EaseOfMovement(AbstractHighLowPriceIndicator):
 
+	outputs = ('period_emv',)
+
 	def __init__(self, prices, high, low, volume, period=14, ma_type='SMA'):
 		self.volume = volume
 		self.period = period
@@ -133,11 +196,7 @@ class EaseOfMovement(AbstractHighLowPriceIndicator):
 		if len(self.distance) != 0:
 			return self.distance
 
-		for i in range(len(self.prices)):
-			if i == 0:
-				self.distance.append(0.00)
-			else:
-				self.distance.append(round((self.high[i] + self.low[i]) / 2 - (self.high[i - 1] + self.low[i - 1]) / 2, 2))
+		self.distance = vectorized.emv_distance(self.high, self.low).tolist()
 
 		return self.distance
 
@@ -145,53 +204,132 @@ class EaseOfMovement(AbstractHighLowPriceIndicator):
 		if len(self.box_ratio) != 0:
 			return self.box_ratio
 
-		for i in range(len(self.prices)):
-			try:
-				self.box_ratio.append(round((self.volume[i] / 100000000) / (self.high[i] - self.low[i]) , 2))
-			except:
-				self.box_ratio.append(None)
-
-		max_box_ratio = float("-inf")
-		for i in range(len(self.box_ratio)):
-			if self.box_ratio[i] is not None and self.box_ratio[i] > max_box_ratio:
-				max_box_ratio = self.box_ratio[i]
-
-		for i in range(len(self.box_ratio)):
-			if self.box_ratio[i] is None:
-				self.box_ratio[i] = max_box_ratio
+		self.box_ratio = vectorized.box_ratio(self.high, self.low, self.volume).tolist()
 
 		return self.box_ratio
 
-	def get_emv(self):
+	def get_emv(self, backend=None):
 		if len(self.emv) != 0:
 			return self.emv
 
-		distance = self.get_distance()
-		box_ratio = self.get_box_ratio()
-
-		min_box_ratio = float("inf")
-		for i in range(len(box_ratio)):
-			if box_ratio[i] > 0 and box_ratio[i] < min_box_ratio:
-				min_box_ratio = box_ratio[i]
-				
-		for i in range(len(self.prices)):
-			self.emv.append(round(distance[i] / max(min_box_ratio, box_ratio[i]), 2))
+		self.emv = self.dispatch('ease_of_movement', self.high, self.low, self.volume, backend=backend)
 
 		return self.emv
 
-	def calculate(self):
+	def calculate(self, backend=None):
 		if len(self.period_emv) != 0:
 			return self.period_emv
 
 		self.validate()
 
-		emv = self.get_emv()
-		self.period_emv = self.get_ma(emv, self.period, self.ma_type).calculate()
+		emv = self.get_emv(backend)
+		ma = self.get_ma(emv, self.period, self.ma_type)
+		self.period_emv = ma.calculate(self.select_backend(backend))
+		self.backend_used = merge_backends([self.backend_used, ma.backend_used])
 
 		return self.period_emv
 
+	def get_stream(self):
+		high = np.asarray(self.high, dtype=np.float64)
+		low = np.asarray(self.low, dtype=np.float64)
+		box_ratio = vectorized.box_ratio(high, low, self.volume)
+		valid = box_ratio[high != low]
+		positive = valid[valid > 0]
+
+		return EaseOfMovementStream(self.period, self.ma_type, float(positive.min()) if positive.size > 0 else None, float(valid.max()) if valid.size > 0 else None)
+
+	def requires_recompute(self, stream, prices, high, low, volume):
+		"""
+		box ratios are floored at the smallest positive ratio and flat bars take the largest ratio of the
+		whole series, new bars that move either bound change earlier bars
+		"""
+		probe = EaseOfMovementStream(None)
+		probe.run(prices, high, low, volume)
+
+		min_box_ratio = min([value for value in (stream.min_box_ratio, probe.min_positive_box_ratio) if value is not None], default=None)
+		max_box_ratio = max([value for value in (stream.max_box_ratio, probe.max_valid_box_ratio) if value is not None], default=None)
+		if min_box_ratio != stream.min_box_ratio:
+			return True
+		if max_box_ratio != stream.max_box_ratio and (stream.flat or probe.flat):
+			return True
+
+		stream.max_box_ratio = max_box_ratio
+		return False
+
+class EaseOfMovementStream(AbstractStreamingIndicator):
+
+	__slots__ = ('period', 'ma_type', 'min_box_ratio', 'max_box_ratio', 'ma', 'prev_high', 'prev_low', 'min_positive_box_ratio', 'max_valid_box_ratio', 'flat', 'emv')
+
+	def __init__(self, period=14, ma_type='SMA', min_box_ratio=None, max_box_ratio=None):
+		"""
+		box ratios are floored at `min_box_ratio` and flat bars use `max_box_ratio` when given, otherwise
+		the smallest positive and the largest ratio seen so far; `period=None` gives the unsmoothed values
+		"""
+		self.period = period
+		self.ma_type = ma_type
+		self.min_box_ratio = min_box_ratio
+		self.max_box_ratio = max_box_ratio
+		self.ma = get_ma_stream(period, ma_type) if period is not None else None
+		super().__init__()
+
+	@property
+	def lookback(self):
+		return self.ma.lookback + 1 if self.ma is not None else 1
+
+	@property
+	def recursive(self):
+		return True
+
+	def reset(self):
+		if self.ma is not None:
+			self.ma.reset()
+		self.prev_high = None
+		self.prev_low = None
+		self.min_positive_box_ratio = None
+		self.max_valid_box_ratio = None
+		self.flat = False
+		self.emv = None
+		self.value = None
+
+	def update(self, price, high, low, volume):
+		if high - low == 0:
+			self.flat = True
+			if self.max_box_ratio is not None:
+				box_ratio = self.max_box_ratio
+			elif self.max_valid_box_ratio is not None:
+				box_ratio = self.max_valid_box_ratio
+			else:
+				box_ratio = float("-inf")
+		else:
+			box_ratio = round((volume / 100000000) / (high - low), 2)
+			if self.max_valid_box_ratio is None or box_ratio > self.max_valid_box_ratio:
+				self.max_valid_box_ratio = box_ratio
+			if box_ratio > 0 and (self.min_positive_box_ratio is None or box_ratio < self.min_positive_box_ratio):
+				self.min_positive_box_ratio = box_ratio
+
+		if self.min_box_ratio is not None:
+			min_box_ratio = self.min_box_ratio
+		elif self.min_positive_box_ratio is not None:
+			min_box_ratio = self.min_positive_box_ratio
+		else:
+			min_box_ratio = float("inf")
+
+		if self.prev_high is None:
+			distance = 0.00
+		else:
+			distance = round((high + low) / 2 - (self.prev_high + self.prev_low) / 2, 2)
+		self.prev_high = high
+		self.prev_low = low
+
+		self.emv = round(distance / max(min_box_ratio, box_ratio), 2)
+		self.value = self.ma.update(self.emv) if self.ma is not None else self.emv
+
+		return self.value
+
 class ForceIndex(AbstractPriceIndicator):
 
+	outputs = ('period_fi',)
+
 	def __init__(self, prices, volume, period=13, ma_type='EMA'):
 		self.volume = volume
 		self.period = period
@@ -238,27 +376,64 @@ class ForceIndex(AbstractPriceIndicator):
 		if len(self.fi) != 0:
 			return self.fi
 
-		for i in range(len(self.prices)):
-			if i == 0:
-				self.fi.append(0.00)
-			else:
-				self.fi.append(round((self.prices[i] - self.prices[i - 1]) * self.volume[i], 2))
+		self.fi = ForceIndexStream(None).run(self.prices, self.volume)
 
 		return self.fi
 
-	def calculate(self):
+	def calculate(self, backend=None):
 		if len(self.period_fi) != 0:
 			return self.period_fi
 
 		self.validate()
 
-		fi = self.get_fi()
-		self.period_fi = self.get_ma(fi, self.period, self.ma_type).calculate()
+		self.period_fi = ForceIndexStream(self.period, self.ma_type).run(self.prices, self.volume)
+		self.set_backend_used()
 
 		return self.period_fi
 
+	def get_stream(self):
+		return ForceIndexStream(self.period, self.ma_type)
+
+class ForceIndexStream(AbstractStreamingIndicator):
+
+	__slots__ = ('period', 'ma_type', 'ma', 'prev_price', 'fi')
+
+	def __init__(self, period=13, ma_type='EMA'):
+		self.period = period
+		self.ma_type = ma_type
+		self.ma = get_ma_stream(period, ma_type) if period is not None else None
+		super().__init__()
+
+	@property
+	def lookback(self):
+		return self.ma.lookback + 1 if self.ma is not None else 1
+
+	@property
+	def recursive(self):
+		return self.ma is not None and self.ma.recursive
+
+	def reset(self):
+		if self.ma is not None:
+			self.ma.reset()
+		self.prev_price = None
+		self.fi = None
+		self.value = None
+
+	def update(self, price, volume):
+		if self.prev_price is None:
+			self.fi = 0.00
+		else:
+			self.fi = round((price - self.prev_price) * volume, 2)
+
+		self.prev_price = price
+		self.value = self.ma.update(self.fi) if self.ma is not None else self.fi
+
+		return self.value
+
 class NegativeVolumeIndex(AbstractPriceIndicator):
 
+	outputs = ('nvi', 'signal')
+
 	def __init__(self, prices, volume, period=255, ma_type='EMA'):
 		self.volume = volume
 		self.period = period
@@ -305,20 +480,7 @@ class NegativeVolumeIndex(AbstractPriceIndicator):
 		if len(self.nvi) != 0:
 			return self.nvi
 
-		roc = RateOfChange(self.prices, 1)
-		roc_price = roc.calculate()
-		roc.reset(self.volume, 1)
-		roc_volume = roc.calculate()
-
-		for i in range(len(self.prices)):
-			if i == 0:
-				self.nvi.append(1000.00)
-				continue
-
-			if roc_volume[i] >= 0:
-				self.nvi.append(self.nvi[i - 1])
-			else:
-				self.nvi.append(self.nvi[i - 1] + roc_price[i])
+		self.nvi = NegativeVolumeIndexStream(None).run(self.prices, self.volume)
 
 		return self.nvi
 
@@ -331,16 +493,73 @@ class NegativeVolumeIndex(AbstractPriceIndicator):
 
 		return self.signal
 
-	def calculate(self):
+	def calculate(self, backend=None):
 		if len(self.nvi) != 0 and len(self.signal) != 0:
 			return (self.nvi, self.signal)
 
 		self.validate()
 
-		return (self.get_nvi(), self.get_signal())
+		self.nvi, self.signal = NegativeVolumeIndexStream(self.period, self.ma_type).run(self.prices, self.volume)
+		self.set_backend_used()
+
+		return (self.nvi, self.signal)
+
+	def get_stream(self):
+		return NegativeVolumeIndexStream(self.period, self.ma_type)
+
+class NegativeVolumeIndexStream(AbstractStreamingIndicator):
+
+	__slots__ = ('period', 'ma_type', 'ma', 'n_outputs', 'prev_price', 'prev_volume', 'nvi')
+
+	def __init__(self, period=255, ma_type='EMA'):
+		self.period = period
+		self.ma_type = ma_type
+		self.ma = get_ma_stream(period, ma_type) if period is not None else None
+		self.n_outputs = 2 if period is not None else 1
+		super().__init__()
+
+	@property
+	def lookback(self):
+		return self.ma.lookback if self.ma is not None else 0
+
+	@property
+	def recursive(self):
+		return True
+
+	def reset(self):
+		if self.ma is not None:
+			self.ma.reset()
+		self.prev_price = None
+		self.prev_volume = None
+		self.nvi = None
+		self.value = None
+
+	def rate_of_change(self, current, previous):
+		try:
+			return round((current - previous) / previous, 2)
+		except ZeroDivisionError:
+			return 0.00
+
+	def update(self, price, volume):
+		if self.nvi is None:
+			self.nvi = 1000.00
+		elif self.rate_of_change(volume, self.prev_volume) < 0:
+			self.nvi = self.nvi + self.rate_of_change(price, self.prev_price)
+
+		self.prev_price = price
+		self.prev_volume = volume
+
+		if self.ma is not None:
+			self.value = (self.nvi, self.ma.update(self.nvi))
+		else:
+			self.value = self.nvi
+
+		return self.value
 
 class OnBalanceVolume(AbstractPriceIndicator):
 
+	outputs = ('obv',)
+
 	def __init__(self, prices, volume):
 		self.volume = volume
 		self.obv = []
@@ -363,28 +582,57 @@ class OnBalanceVolume(AbstractPriceIndicator):
 		if len(self.messages) > 0:
 			raise Exception(", ".join(self.messages))
 	
-	def calculate(self):
+	def calculate(self, backend=None):
 		if len(self.obv) != 0:
 			return self.obv
 
 		self.validate()
 
-		for i in range(len(self.prices)):
-			if i == 0:
-				self.obv.append(0.00)
-				continue
-
-			if self.prices[i] > self.prices[i - 1]:
-				self.obv.append(round(self.obv[i - 1] + self.volume[i] , 2))
-			elif self.prices[i] < self.prices[i - 1]:
-				self.obv.append(round(self.obv[i - 1] - self.volume[i] , 2))
-			else:
-				self.obv.append(round(self.obv[i - 1], 2))
+		self.obv = OnBalanceVolumeStream().run(self.prices, self.volume)
+		self.set_backend_used()
 
 		return self.obv
 
+	def get_stream(self):
+		return OnBalanceVolumeStream()
+
+class OnBalanceVolumeStream(AbstractStreamingIndicator):
+
+	__slots__ = ('prev_price',)
+
+	def __init__(self):
+		super().__init__()
+
+	@property
+	def lookback(self):
+		return 0
+
+	@property
+	def recursive(self):
+		return True
+
+	def reset(self):
+		self.prev_price = None
+		self.value = None
+
+	def update(self, price, volume):
+		if self.prev_price is None:
+			self.value = 0.00
+		elif price > self.prev_price:
+			self.value = round(self.value + volume, 2)
+		elif price < self.prev_price:
+			self.value = round(self.value - volume, 2)
+		else:
+			self.value = round(self.value, 2)
+
+		self.prev_price = price
+
+		return self.value
+
 class PutCallRatio(AbstractPriceIndicator):
 
+	outputs = ('pc_ratio',)
+
 	def __init__(self, prices, put_volume, call_volume):
 		self.put_volume = put_volume
 		self.call_volume = call_volume
@@ -412,13 +660,84 @@ class PutCallRatio(AbstractPriceIndicator):
 		if len(self.messages) > 0:
 			raise Exception(", ".join(self.messages))
 
-	def calculate(self):
+	def calculate(self, backend=None):
 		if len(self.pc_ratio) != 0:
 			return self.pc_ratio
 
 		self.validate()
+		self.set_backend_used()
 
 		for i in range(len(self.prices)):
 			self.pc_ratio.append(round(self.put_volume[i] / self.call_volume[i] , 2))
 
 		return self.pc_ratio
+
+	def get_stream(self):
+		return PutCallRatioStream()
+
+class PutCallRatioStream(AbstractStreamingIndicator):
+
+	__slots__ = ()
+
+	def __init__(self):
+		super().__init__()
+
+	@property
+	def lookback(self):
+		return 0
+
+	def reset(self):
+		self.value = None
+
+	def update(self, price, put_volume, call_volume):
+		self.value = round(put_volume / call_volume , 2)
+
+		return self.value
+
+def _fill_none(values, fill):
+	return [fill if value is None else value for value in values]
+
+@register('accumulation_distribution_line', 'python')
+def _accumulation_distribution_line(prices, high, low, volume):
+	mf_multiplier = []
+	for i in range(len(prices)):
+		if high[i] - low[i] == 0:
+			mf_multiplier.append(None)
+		else:
+			mf_multiplier.append(round(((prices[i] - low[i]) - (high[i] - prices[i])) / (high[i] - low[i]), 2))
+
+	mf_multiplier = _fill_none(mf_multiplier, max([value for value in mf_multiplier if value], default=float("-inf")))
+
+	adl = []
+	for i in range(len(prices)):
+		mf_volume = round(mf_multiplier[i] * volume[i], 2)
+		adl.append(mf_volume if i == 0 else adl[i - 1] + mf_volume)
+
+	return adl
+
+@register('accumulation_distribution_line', 'numpy')
+def _accumulation_distribution_line_numpy(prices, high, low, volume):
+	return vectorized.accumulation_distribution_line(prices, high, low, volume).tolist()
+
+@register('ease_of_movement', 'python')
+def _ease_of_movement(high, low, volume):
+	box_ratio = []
+	for i in range(len(high)):
+		if high[i] - low[i] == 0:
+			box_ratio.append(None)
+		else:
+			box_ratio.append(round((volume[i] / 100000000) / (high[i] - low[i]), 2))
+
+	box_ratio = _fill_none(box_ratio, max([value for value in box_ratio if value is not None], default=float("-inf")))
+	min_box_ratio = min([value for value in box_ratio if value > 0], default=float("inf"))
+
+	emv = []
+	for i in range(len(high)):
+		distance = 0.00 if i == 0 else round((high[i] + low[i]) / 2 - (high[i - 1] + low[i - 1]) / 2, 2)
+		emv.append(round(distance / max(min_box_ratio, box_ratio[i]), 2))
+
+	return emv
+
+@register('ease_of_movement', 'numpy')
+def _ease_of_movement_numpy(high, low, volume):
+	return vectorized.ease_of_movement(high, low, volume).tolist()
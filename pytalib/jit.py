@@ -0,0 +1,18 @@
+try:
+	from numba import njit
+	HAS_NUMBA = True
+except ImportError:
+	njit = None
+	HAS_NUMBA = False
+
+def jit(function):
+	"""
+	compile `function` with numba when it is installed, otherwise return it unchanged
+
+	Compiled functions keep the pure python version in `function.py_func`.
+	"""
+	if HAS_NUMBA:
+		return njit(cache=True, nogil=True)(function)
+
+	function.py_func = function
+	return function
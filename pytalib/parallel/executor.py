@@ -0,0 +1,127 @@
+import math
+import multiprocessing
+import numpy as np
+from ..indicators.spec import normalize_spec, run_indicator, run_indicator_array
+from .shared_memory import SharedArrays, SharedUniverse
+
+_universe = None
+_specs = None
+
+def _initialize(universe, specs):
+	global _universe, _specs
+	_universe = universe
+	_specs = specs
+
+def _run_chunk(symbols, run=run_indicator):
+	results = []
+	for symbol in symbols:
+		ohlcv = _universe[symbol]
+		results.append((symbol, [np.asarray(run(spec, ohlcv), dtype=np.float64) for spec in _specs]))
+
+	return results
+
+def _initialize_shared(manifest, specs):
+	_initialize(SharedUniverse.attach(manifest), specs)
+
+def _run_chunk_shared(symbols):
+	results = _run_chunk(symbols, run_indicator_array)
+	shared = SharedArrays.publish({(symbol, i): output for symbol, outputs in results for i, output in enumerate(outputs)})
+	manifest = shared.manifest
+	shared.owner = False
+	shared.close()
+
+	return manifest
+
+def _collect_shared(manifest):
+	with SharedArrays.attach(manifest, owner=True) as shared:
+		results = {}
+		for (symbol, i), output in shared.copy().items():
+			results.setdefault(symbol, {})[i] = output
+
+	return [(symbol, [outputs[i] for i in range(len(outputs))]) for symbol, outputs in results.items()]
+
+def chunk(items, size):
+	return [items[i : i + size] for i in range(0, len(items), size)]
+
+def run_universe(universe, specs, processes=None, chunksize=None, transport='inherit'):
+	"""
+	run every indicator spec on every symbol of `universe` across a process pool
+
+	`universe` maps symbol to a mapping of "open", "high", "low", "close" and "volume" series, `specs` is a list
+	such as [("RelativeStrengthIndex", {"period": 14}), ("AverageTrueRange", {"period": 10})].
+
+	Returns {symbol: [float64 array per spec]}, multi-output indicators give one row per output.
+	Where the platform supports fork, workers inherit `universe` instead of receiving it pickled;
+	only symbol names travel to the workers and result arrays travel back.
+
+	With transport="shared_memory" the inputs are published once in a shared memory block that every
+	worker maps instead of unpickling, and each chunk of results comes back through a block of its own;
+	only block manifests are pickled. Indicators with a numpy implementation, such as AverageTrueRange
+	and BollingerBands, compute on the mapped arrays; the others copy each input series into a list.
+	Every chunk runs to completion and the result blocks of all chunks that succeeded are collected and
+	unlinked before the first worker error, if any, is raised.
+	"""
+	if transport not in ('inherit', 'shared_memory'):
+		raise Exception("transport must be 'inherit' or 'shared_memory'")
+
+	specs = [normalize_spec(spec) for spec in specs]
+	symbols = list(universe)
+	if processes is None:
+		processes = multiprocessing.cpu_count()
+	processes = max(1, min(processes, len(symbols)))
+	if chunksize is None:
+		chunksize = max(1, math.ceil(len(symbols) / (processes * 4)))
+
+	results = {}
+	if processes == 1:
+		_initialize(universe, specs)
+		try:
+			for batch in chunk(symbols, chunksize):
+				results.update(_run_chunk(batch))
+		finally:
+			_initialize(None, None)
+		return results
+
+	if transport == 'shared_memory':
+		return _run_universe_shared(universe, specs, symbols, processes, chunksize)
+
+	if 'fork' in multiprocessing.get_all_start_methods():
+		context = multiprocessing.get_context('fork')
+		_initialize(universe, specs)
+		pool = context.Pool(processes)
+	else:
+		context = multiprocessing.get_context()
+		pool = context.Pool(processes, _initialize, (universe, specs))
+
+	try:
+		for batch in pool.imap_unordered(_run_chunk, chunk(symbols, chunksize)):
+			results.update(batch)
+	finally:
+		pool.close()
+		pool.join()
+		_initialize(None, None)
+
+	return results
+
+def _run_universe_shared(universe, specs, symbols, processes, chunksize):
+	results = {}
+	errors = []
+	with SharedUniverse.publish(universe) as shared:
+		pool = multiprocessing.Pool(processes, _initialize_shared, (shared.manifest, specs))
+		pending = []
+		try:
+			for batch in chunk(symbols, chunksize):
+				pending.append(pool.apply_async(_run_chunk_shared, (batch,)))
+		finally:
+			pool.close()
+			pool.join()
+			for result in pending:
+				try:
+					results.update(_collect_shared(result.get()))
+				except Exception as e:
+					errors.append(e)
+
+	if len(errors) > 0:
+		raise errors[0]
+
+	return results
@@ -0,0 +1,134 @@
+from multiprocessing import shared_memory
+import numpy as np
+
+ALIGNMENT = 64
+
+class SharedArrays(object):
+
+	def __init__(self, shm, layout, owner):
+		self.shm = shm
+		self.name = shm.name
+		self.layout = layout
+		self.owner = owner
+		self.arrays = {}
+		for key, offset, shape, dtype in layout:
+			count = int(np.prod(shape)) if len(shape) > 0 else 1
+			self.arrays[key] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf, offset=offset) if count > 0 else np.empty(shape, dtype=np.dtype(dtype))
+
+	@classmethod
+	def allocate(cls, shapes, dtype=np.float64):
+		"""
+		create a block holding one zeroed array per key of `shapes`, the calling process owns the block
+		"""
+		layout = []
+		offset = 0
+		for key, shape in shapes.items():
+			shape = tuple(shape) if isinstance(shape, (tuple, list)) else (shape,)
+			layout.append((key, offset, shape, np.dtype(dtype).str))
+			size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+			offset += (size + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+		shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+		shared = cls(shm, layout, True)
+		for array in shared.arrays.values():
+			array.fill(0)
+
+		return shared
+
+	@classmethod
+	def publish(cls, arrays, dtype=np.float64):
+		"""
+		copy `arrays`, a mapping of key to 1-d or 2-d series, into a new block
+		"""
+		arrays = {key: np.asarray(value, dtype=dtype) for key, value in arrays.items()}
+		shared = cls.allocate({key: value.shape for key, value in arrays.items()}, dtype)
+		for key, value in arrays.items():
+			shared.arrays[key][...] = value
+
+		return shared
+
+	@classmethod
+	def attach(cls, manifest, owner=False):
+		"""
+		map an existing block from its `manifest`, the arrays are views on the shared buffer
+
+		With `owner` the attaching process takes over the block and unlinks it on close.
+		"""
+		name, layout = manifest
+		return cls(shared_memory.SharedMemory(name=name), layout, owner)
+
+	@property
+	def manifest(self):
+		return (self.name, self.layout)
+
+	def __getitem__(self, key):
+		return self.arrays[key]
+
+	def __contains__(self, key):
+		return key in self.arrays
+
+	def keys(self):
+		return self.arrays.keys()
+
+	def copy(self):
+		return {key: np.array(value) for key, value in self.arrays.items()}
+
+	def close(self):
+		if self.shm is None:
+			return
+
+		self.arrays = {}
+		self.shm.close()
+		if self.owner:
+			self.shm.unlink()
+		self.shm = None
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+
+class SharedUniverse(object):
+
+	def __init__(self, shared):
+		self.shared = shared
+		self.index = {}
+		for (symbol, field), array in shared.arrays.items():
+			self.index.setdefault(symbol, {})[field] = array
+
+	@classmethod
+	def publish(cls, universe, dtype=np.float64):
+		"""
+		publish a {symbol: {field: series}} universe in one shared block
+		"""
+		arrays = {}
+		for symbol, ohlcv in universe.items():
+			for field, series in ohlcv.items():
+				arrays[(symbol, field)] = series
+
+		return cls(SharedArrays.publish(arrays, dtype))
+
+	@classmethod
+	def attach(cls, manifest):
+		return cls(SharedArrays.attach(manifest))
+
+	@property
+	def manifest(self):
+		return self.shared.manifest
+
+	def symbols(self):
+		return list(self.index)
+
+	def __getitem__(self, symbol):
+		return self.index[symbol]
+
+	def close(self):
+		self.index = {}
+		self.shared.close()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
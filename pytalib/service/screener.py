@@ -0,0 +1,266 @@
+"""
+Screener service answering "latest values of these indicators for these symbols" over a local socket.
+
+The service keeps the bar history of every symbol and one stream per symbol and indicator in memory.
+A stream is built on first request by replaying the history in a worker thread; later bars advance it
+by one update each, so answers after that cost a lookup. Concurrent requests for the same symbol and
+indicator while its stream is being built wait for that one computation instead of starting their own.
+
+The protocol is HTTP/1.1 with JSON bodies, served on a TCP port of localhost or on a Unix socket:
+
+	POST /bars    {"AAPL": {"close": [...], "high": [...], "low": [...], "volume": [...]}}
+	POST /latest  {"symbols": ["AAPL"], "specs": [["RelativeStrengthIndex", {"period": 14}], "AverageTrueRange"]}
+	GET  /health
+
+`/latest` answers {spec name: {symbol: value}}, with a list for multi-output indicators, null for
+symbols without bars and {"error": message} for symbols whose indicator failed. A stream that fails on
+a bar is dropped and rebuilt from the history on the next request, so failures stay with their symbol
+and indicator.
+"""
+
+import argparse
+import asyncio
+import json
+from ..indicators.spec import normalize_spec, get_spec_name, get_default_indicator, get_indicator_class, get_inputs, INPUTS
+
+FIELDS = ('close', 'high', 'low', 'volume', 'open')
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed'}
+
+class ScreenerState(object):
+	"""
+	bar history and streams of every symbol, with coalesced stream builds
+	"""
+
+	def __init__(self):
+		self.history = {}
+		self.streams = {}
+		self.pending = {}
+		self.computations = 0
+
+	def add_bars(self, symbol, bars):
+		"""
+		append bars to a symbol; every field must have the same number of values
+		"""
+		sizes = set(len(values) for values in bars.values())
+		if len(sizes) != 1:
+			raise Exception("every field of `{}` must have the same number of bars.".format(symbol))
+
+		for key in bars:
+			if key not in FIELDS:
+				raise Exception("unknown field `{}`.".format(key))
+
+		history = self.history.setdefault(symbol, {})
+		if len(history) > 0 and set(history) != set(bars):
+			raise Exception("bars of `{}` must have the fields {}.".format(symbol, ", ".join(sorted(history))))
+		for key, values in bars.items():
+			history.setdefault(key, []).extend(float(value) for value in values)
+
+		streams = self.streams.get(symbol, {})
+		for name, entry in list(streams.items()):
+			try:
+				self.catch_up(symbol, entry)
+			except Exception:
+				del streams[name]
+
+	def get_size(self, symbol):
+		history = self.history.get(symbol, {})
+		return len(next(iter(history.values()))) if len(history) > 0 else 0
+
+	def get_columns(self, symbol, spec):
+		history = self.history[symbol]
+		columns = []
+		for name in get_inputs(get_indicator_class(normalize_spec(spec)[0])):
+			key = INPUTS.get(name, name)
+			if key not in history:
+				raise Exception("`{}` requires `{}` bars but `{}` has none.".format(get_spec_name(spec), key, symbol))
+			columns.append(history[key])
+
+		return columns
+
+	def catch_up(self, symbol, entry):
+		"""
+		advance a stream over the bars added since it last ran, counting each bar once it is applied
+		"""
+		stream, spec, count = entry
+		size = self.get_size(symbol)
+		for bar in zip(*[values[count:size] for values in self.get_columns(symbol, spec)]):
+			stream.update(*bar)
+			entry[2] += 1
+
+	def build(self, spec, columns):
+		stream = get_default_indicator(spec).get_stream()
+		for bar in zip(*columns):
+			stream.update(*bar)
+
+		return stream
+
+	async def compute(self, symbol, spec, key):
+		try:
+			size = self.get_size(symbol)
+			columns = [values[:size] for values in self.get_columns(symbol, spec)]
+			self.computations += 1
+			stream = await asyncio.get_running_loop().run_in_executor(None, self.build, spec, columns)
+
+			entry = [stream, spec, size]
+			self.catch_up(symbol, entry)
+			self.streams.setdefault(symbol, {})[key[1]] = entry
+		finally:
+			del self.pending[key]
+
+	async def latest(self, symbol, spec):
+		"""
+		value of `spec` at the last bar of `symbol`, None without bars
+		"""
+		spec = normalize_spec(spec)
+		if self.get_size(symbol) == 0:
+			return None
+
+		key = (symbol, get_spec_name(spec))
+		if key[1] not in self.streams.get(symbol, {}):
+			if key not in self.pending:
+				self.pending[key] = asyncio.ensure_future(self.compute(symbol, spec, key))
+			await asyncio.shield(self.pending[key])
+
+		value = self.streams[symbol][key[1]][0].value
+		return list(value) if isinstance(value, tuple) else value
+
+	async def screen(self, symbols, specs):
+		specs = [normalize_spec(spec) for spec in specs]
+		for name, params in specs:
+			get_indicator_class(name)
+		values = await asyncio.gather(*[self.latest(symbol, spec) for spec in specs for symbol in symbols], return_exceptions=True)
+		for value in values:
+			if isinstance(value, BaseException) and not isinstance(value, Exception):
+				raise value
+		values = [{'error': str(value)} if isinstance(value, Exception) else value for value in values]
+
+		result = {}
+		for i, spec in enumerate(specs):
+			result[get_spec_name(spec)] = dict(zip(symbols, values[i * len(symbols):(i + 1) * len(symbols)]))
+
+		return result
+
+def parse_specs(specs):
+	if not isinstance(specs, list):
+		raise Exception("`specs` must be a list.")
+
+	return [spec if isinstance(spec, str) else (spec[0], spec[1] if len(spec) > 1 else {}) for spec in specs]
+
+class ScreenerService(object):
+	"""
+	HTTP front end of a `ScreenerState`
+	"""
+
+	def __init__(self, state=None):
+		self.state = state if state is not None else ScreenerState()
+		self.server = None
+
+	async def start(self, host='127.0.0.1', port=0, path=None):
+		"""
+		listen on `host`:`port`, or on the Unix socket `path` when given; port 0 picks a free port
+		"""
+		if path is not None:
+			self.server = await asyncio.start_unix_server(self.handle, path=path)
+		else:
+			self.server = await asyncio.start_server(self.handle, host, port)
+
+		return self.server
+
+	@property
+	def port(self):
+		return self.server.sockets[0].getsockname()[1]
+
+	async def stop(self):
+		self.server.close()
+		await self.server.wait_closed()
+
+	async def dispatch(self, method, path, body):
+		if path == '/health':
+			return 200, {'symbols': len(self.state.history), 'streams': sum(len(streams) for streams in self.state.streams.values())}
+		elif path == '/bars':
+			if method != 'POST':
+				return 405, {'error': 'use POST.'}
+			for symbol, bars in body.items():
+				self.state.add_bars(symbol, bars)
+			return 200, {symbol: self.state.get_size(symbol) for symbol in body}
+		elif path == '/latest':
+			if method != 'POST':
+				return 405, {'error': 'use POST.'}
+			return 200, await self.state.screen(list(body.get('symbols', [])), parse_specs(body.get('specs', [])))
+
+		return 404, {'error': "unknown path `{}`.".format(path)}
+
+	async def handle(self, reader, writer):
+		try:
+			request_line = await reader.readline()
+			if not request_line:
+				return
+			method, path, version = request_line.decode('latin-1').split()
+
+			headers = {}
+			while True:
+				line = (await reader.readline()).decode('latin-1').strip()
+				if line == '':
+					break
+				name, value = line.split(':', 1)
+				headers[name.strip().lower()] = value.strip()
+
+			data = await reader.readexactly(int(headers.get('content-length', 0)))
+			try:
+				status, result = await self.dispatch(method, path.split('?')[0], json.loads(data) if data else {})
+			except Exception as e:
+				status, result = 400, {'error': str(e)}
+
+			payload = json.dumps(result).encode()
+			writer.write("HTTP/1.1 {} {}\r\nContent-Type: application/json\r\nContent-Length: {}\r\nConnection: close\r\n\r\n".format(
+				status, REASONS[status], len(payload)).encode('latin-1') + payload)
+			await writer.drain()
+		except (ValueError, ConnectionError, asyncio.IncompleteReadError):
+			pass
+		finally:
+			writer.close()
+
+async def request(method, path, body=None, host='127.0.0.1', port=None, unix_path=None):
+	"""
+	send one request to a screener service and return (status, JSON result)
+	"""
+	if unix_path is not None:
+		reader, writer = await asyncio.open_unix_connection(unix_path)
+	else:
+		reader, writer = await asyncio.open_connection(host, port)
+
+	payload = json.dumps(body).encode() if body is not None else b''
+	writer.write("{} {} HTTP/1.1\r\nHost: {}\r\nContent-Type: application/json\r\nContent-Length: {}\r\n\r\n".format(
+		method, path, host, len(payload)).encode('latin-1') + payload)
+	await writer.drain()
+
+	status = int((await reader.readline()).split()[1])
+	headers = {}
+	while True:
+		line = (await reader.readline()).decode('latin-1').strip()
+		if line == '':
+			break
+		name, value = line.split(':', 1)
+		headers[name.strip().lower()] = value.strip()
+	data = await reader.readexactly(int(headers.get('content-length', 0)))
+	writer.close()
+
+	return status, json.loads(data)
+
+def main():
+	parser = argparse.ArgumentParser(description="pytalib screener service")
+	parser.add_argument('--host', default='127.0.0.1')
+	parser.add_argument('--port', type=int, default=8787)
+	parser.add_argument('--unix', default=None, help="serve on this Unix socket instead of TCP")
+	args = parser.parse_args()
+
+	async def serve():
+		service = ScreenerService()
+		server = await service.start(args.host, args.port, args.unix)
+		async with server:
+			await server.serve_forever()
+
+	asyncio.run(serve())
+
+if __name__ == '__main__':
+	main()
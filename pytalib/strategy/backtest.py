@@ -0,0 +1,164 @@
+"""
+Event-driven backtests over streaming indicator state.
+
+Every bar advances an `IndicatorStore` for all symbols at once, hands the new indicator values to the
+strategy and executes its orders through a fill model. Indicators only ever see bars up to the current
+one, so there is no lookahead, and each bar costs one streaming update instead of a recompute of the
+whole history.
+
+A strategy is any callable `strategy(index, values, bars, portfolio)` returning one order quantity per
+symbol (positive to buy, negative to sell, 0 for none) or None. `values` maps spec names to arrays as
+`IndicatorStore.update` returns them.
+"""
+
+import numpy as np
+from ..indicators.store import IndicatorStore
+
+class FillModel(object):
+	"""
+	when and at which price orders are filled
+
+	`submit` receives the orders of a bar after the strategy ran and `open` is called with the next bar
+	before the strategy sees it. Each returns (quantities, prices) of the orders filled, or None.
+	"""
+
+	def __init__(self, commission=0.0, slippage=0.0):
+		self.commission = commission
+		self.slippage = slippage
+		self.reset()
+
+	def reset(self):
+		pass
+
+	def get_prices(self, quantities, prices):
+		return prices * (1 + self.slippage * np.sign(quantities))
+
+	def open(self, bars):
+		return None
+
+	def submit(self, orders, bars):
+		return None
+
+class CloseFill(FillModel):
+	"""
+	fill at the close of the bar the order was made on
+	"""
+
+	def submit(self, orders, bars):
+		return (orders, self.get_prices(orders, np.asarray(bars['close'], dtype=np.float64)))
+
+class NextOpenFill(FillModel):
+	"""
+	fill at the open of the bar after the order, which needs "open" in the bars
+	"""
+
+	def reset(self):
+		self.pending = None
+
+	def open(self, bars):
+		if self.pending is None:
+			return None
+
+		orders, self.pending = self.pending, None
+		return (orders, self.get_prices(orders, np.asarray(bars['open'], dtype=np.float64)))
+
+	def submit(self, orders, bars):
+		self.pending = orders if self.pending is None else self.pending + orders
+		return None
+
+class Portfolio(object):
+	"""
+	cash and positions of every symbol
+	"""
+
+	__slots__ = ('cash', 'positions', 'commissions')
+
+	def __init__(self, size, cash=0.0):
+		self.cash = float(cash)
+		self.positions = np.zeros(size)
+		self.commissions = 0.0
+
+	def execute(self, quantities, prices, commission=0.0):
+		traded = np.abs(quantities * prices).sum()
+		self.positions += quantities
+		self.cash -= float(np.dot(quantities, prices)) + commission * traded
+		self.commissions += commission * traded
+
+	def get_equity(self, prices):
+		return self.cash + float(np.dot(self.positions, prices))
+
+class BacktestResult(object):
+	"""
+	equity after every bar, the final portfolio and every fill as parallel arrays
+	"""
+
+	def __init__(self, equity, portfolio, trade_index, trade_symbol, trade_quantity, trade_price):
+		self.equity = equity
+		self.portfolio = portfolio
+		self.trade_index = trade_index
+		self.trade_symbol = trade_symbol
+		self.trade_quantity = trade_quantity
+		self.trade_price = trade_price
+
+	def __len__(self):
+		return len(self.equity)
+
+class Backtest(object):
+	"""
+	run `strategy` over bars of many symbols in lockstep
+
+	`specs` are the indicators the strategy reads, given as in `IndicatorStore`.
+	"""
+
+	def __init__(self, symbols, specs, strategy, fill_model=None, cash=0.0):
+		self.store = IndicatorStore(symbols, specs)
+		self.symbols = self.store.symbols
+		self.strategy = strategy
+		self.fill_model = fill_model if fill_model is not None else CloseFill()
+		self.cash = cash
+
+	def run(self, bars):
+		"""
+		run over an iterable of bars, each mapping "close", "high", "low", "volume" (and "open" for
+		`NextOpenFill`) to one value per symbol
+		"""
+		self.store.reset()
+		self.fill_model.reset()
+		portfolio = Portfolio(len(self.symbols), self.cash)
+		equity = []
+		trades = []
+
+		def execute(index, fill):
+			if fill is None:
+				return
+			quantities, prices = fill
+			traded = np.flatnonzero(quantities)
+			if len(traded) > 0:
+				portfolio.execute(quantities, prices, self.fill_model.commission)
+				trades.append((np.full(len(traded), index), traded, quantities[traded], prices[traded]))
+
+		for index, bar in enumerate(bars):
+			execute(index, self.fill_model.open(bar))
+
+			values = self.store.update(bar)
+			orders = self.strategy(index, values, bar, portfolio)
+			if orders is not None:
+				orders = np.asarray(orders, dtype=np.float64)
+				if orders.shape != (len(self.symbols),):
+					raise Exception("the strategy must return one order quantity per symbol.")
+				execute(index, self.fill_model.submit(orders, bar))
+
+			equity.append(portfolio.get_equity(np.asarray(bar['close'], dtype=np.float64)))
+
+		columns = [np.concatenate(column) for column in zip(*trades)] if len(trades) > 0 else [np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0)]
+
+		return BacktestResult(np.array(equity), portfolio, *columns)
+
+	def run_arrays(self, ohlcv):
+		"""
+		run over arrays of shape (bars, symbols) under "close", "high", "low", "volume" and "open"
+		"""
+		ohlcv = {key: np.asarray(values, dtype=np.float64) for key, values in ohlcv.items()}
+		size = len(ohlcv['close'])
+
+		return self.run({key: values[i] for key, values in ohlcv.items()} for i in range(size))
@@ -0,0 +1,200 @@
+"""
+Signals from indicator outputs: crossovers, threshold entries and exits and band breaks.
+
+Vectorized functions take series of shape (bars,) or (bars, symbols), with levels that broadcast
+against them, and return int8 arrays of the same shape: +1 and -1 on the bars where an event fires,
+0 elsewhere. `get_events` turns such an array into compact index, symbol and kind arrays. The streams
+give the same events one bar at a time, for scalars or arrays of one value per symbol.
+
+Events are edge-triggered: a crossover fires on the bar where `a > b` holds and `a <= b` held on the
+previous bar. Bars up to `start`, e.g. the lookback of an indicator still warming up, never fire.
+"""
+
+import numpy as np
+
+def _pair(a, b):
+	a = np.asarray(a, dtype=np.float64)
+	return a, np.broadcast_to(np.asarray(b, dtype=np.float64), a.shape)
+
+def _edges(up, down, start):
+	signal = np.zeros(up.shape, dtype=np.int8)
+	signal[up] = 1
+	signal[down] = -1
+	signal[:start + 1] = 0
+
+	return signal
+
+def crossover(a, b, start=0):
+	"""
+	+1 where `a` crosses above `b`
+	"""
+	a, b = _pair(a, b)
+	up = np.zeros(a.shape, dtype=bool)
+	up[1:] = (a[1:] > b[1:]) & (a[:-1] <= b[:-1])
+
+	return _edges(up, np.zeros(a.shape, dtype=bool), start)
+
+def crossunder(a, b, start=0):
+	"""
+	-1 where `a` crosses below `b`
+	"""
+	a, b = _pair(a, b)
+	down = np.zeros(a.shape, dtype=bool)
+	down[1:] = (a[1:] < b[1:]) & (a[:-1] >= b[:-1])
+
+	return _edges(np.zeros(a.shape, dtype=bool), down, start)
+
+def cross(a, b, start=0):
+	"""
+	+1 where `a` crosses above `b` and -1 where it crosses below
+	"""
+	return crossover(a, b, start) + crossunder(a, b, start)
+
+def threshold(values, enter, exit, start=0):
+	"""
+	+1 on entering and -1 on leaving a zone, with separate levels for both
+
+	With `enter` below `exit`, e.g. RSI 30 and 70, the zone is entered when `values` cross below `enter`
+	and left when they cross above `exit`; with `enter` above `exit` the directions are reversed. The
+	direction is chosen elementwise, so each symbol can have its own.
+	Crossings that do not change the state, such as a second entry, do not fire.
+	"""
+	values = np.asarray(values, dtype=np.float64)
+	below = np.asarray(enter) <= np.asarray(exit)
+	entries = np.where(below, crossunder(values, enter, start) != 0, crossover(values, enter, start) != 0)
+	exits = np.where(below, crossover(values, exit, start) != 0, crossunder(values, exit, start) != 0)
+
+	marks = np.where(entries, 1, np.where(exits, -1, 0)).astype(np.int8)
+	rows = np.arange(len(values)).reshape((-1,) + (1,) * (values.ndim - 1))
+	last = np.maximum.accumulate(np.where(marks != 0, rows, 0), axis=0)
+	state = (np.take_along_axis(marks, last, axis=0) == 1).astype(np.int8)
+
+	signal = np.zeros(values.shape, dtype=np.int8)
+	signal[0] = state[0]
+	signal[1:] = state[1:] - state[:-1]
+
+	return signal
+
+def band_break(values, upper, lower, start=0):
+	"""
+	+1 where `values` cross above `upper` and -1 where they cross below `lower`
+	"""
+	return crossover(values, upper, start) + crossunder(values, lower, start)
+
+class Events(object):
+	"""
+	events as parallel arrays, ordered by bar and then symbol
+	"""
+
+	__slots__ = ('index', 'symbol', 'kind')
+
+	def __init__(self, index, symbol, kind):
+		self.index = index
+		self.symbol = symbol
+		self.kind = kind
+
+	def __len__(self):
+		return len(self.index)
+
+def get_events(signal):
+	"""
+	bar index, symbol column and kind (+1 or -1) of every non-zero entry of `signal`
+	"""
+	signal = np.asarray(signal)
+	if signal.ndim == 1:
+		index = np.flatnonzero(signal)
+		symbol = np.zeros(len(index), dtype=np.int32)
+	else:
+		index, symbol = np.nonzero(signal)
+
+	return Events(index.astype(np.int64), symbol.astype(np.int32), signal[(index, symbol) if signal.ndim > 1 else index].astype(np.int8))
+
+def _result(signal):
+	return int(signal) if signal.ndim == 0 else signal
+
+class CrossStream(object):
+	"""
+	edge-triggered crossing of `a` over `b`: +1 above, -1 below, bar by bar
+
+	`direction` limits the events to "over" or "under".
+	"""
+
+	__slots__ = ('start', 'direction', 'count', 'prev_a', 'prev_b')
+
+	def __init__(self, start=0, direction=None):
+		if direction not in (None, 'over', 'under'):
+			raise Exception("`direction` must be None, 'over' or 'under'.")
+
+		self.start = start
+		self.direction = direction
+		self.reset()
+
+	def reset(self):
+		self.count = 0
+		self.prev_a = None
+		self.prev_b = None
+
+	def update(self, a, b):
+		a, b = _pair(a, b)
+		signal = np.zeros(a.shape, dtype=np.int8)
+		if self.count > self.start:
+			if self.direction != 'under':
+				signal[(a > b) & (self.prev_a <= self.prev_b)] = 1
+			if self.direction != 'over':
+				signal[(a < b) & (self.prev_a >= self.prev_b)] = -1
+
+		self.prev_a = a
+		self.prev_b = b
+		self.count += 1
+
+		return _result(signal)
+
+class ThresholdStream(object):
+	"""
+	edge-triggered zone entries (+1) and exits (-1), as `threshold` computes them
+	"""
+
+	__slots__ = ('enter', 'exit', 'start', 'below', 'entries', 'exits', 'state')
+
+	def __init__(self, enter, exit, start=0):
+		self.enter = enter
+		self.exit = exit
+		self.start = start
+		self.reset()
+
+	def reset(self):
+		self.below = np.asarray(self.enter) <= np.asarray(self.exit)
+		self.entries = CrossStream(self.start)
+		self.exits = CrossStream(self.start)
+		self.state = None
+
+	def update(self, value):
+		enter_cross = np.asarray(self.entries.update(value, self.enter))
+		exit_cross = np.asarray(self.exits.update(value, self.exit))
+		entered = np.where(self.below, enter_cross == -1, enter_cross == 1)
+		exited = np.where(self.below, exit_cross == 1, exit_cross == -1)
+
+		state = np.zeros(entered.shape, dtype=np.int8) if self.state is None else self.state
+		new_state = np.where(entered, 1, np.where(exited, 0, state)).astype(np.int8)
+		signal = new_state - state
+		self.state = new_state
+
+		return _result(signal)
+
+class BandBreakStream(object):
+	"""
+	+1 when a value crosses above the upper band and -1 when it crosses below the lower band
+	"""
+
+	__slots__ = ('upper', 'lower')
+
+	def __init__(self, start=0):
+		self.upper = CrossStream(start, 'over')
+		self.lower = CrossStream(start, 'under')
+
+	def reset(self):
+		self.upper.reset()
+		self.lower.reset()
+
+	def update(self, value, upper, lower):
+		return _result(np.asarray(self.upper.update(value, upper)) + np.asarray(self.lower.update(value, lower)))
@@ -0,0 +1,131 @@
+from unittest import TestCase
+import inspect
+import warnings
+from ..indicators import backend, spec
+from ..indicators.base import AbstractIndicator
+from ..indicators.backend import register, set_backend, get_backend, use_backend, dispatch, implementations
+from ..indicators.trend import SimpleMovingAverage, WeightedMovingAverage, ExponentialMovingAverage
+from ..indicators.momentum import RelativeStrengthIndex, MoneyFlowIndex
+from ..indicators.volatility import AverageTrueRange, StandardDeviation, BollingerBands, KeltnerChannel
+
+class BackendTest(TestCase):
+
+	def setUp(self):
+		self.prices = [1,2,3,4,5,6,7,8,9,10]
+
+	def tearDown(self):
+		set_backend('auto')
+
+	def test_set_backend(self):
+		set_backend('python')
+		indicator = SimpleMovingAverage(self.prices, 3)
+		indicator.calculate()
+
+		self.assertEqual('python', get_backend())
+		self.assertEqual('python', indicator.backend_used)
+
+	def test_use_backend(self):
+		with use_backend('numpy'):
+			indicator = SimpleMovingAverage(self.prices, 3)
+			result = indicator.calculate()
+
+		self.assertEqual('auto', get_backend())
+		self.assertEqual('numpy', indicator.backend_used)
+		self.assertEqual([0,0,2,3,4,5,6,7,8,9], result)
+
+	def test_per_call_backend(self):
+		with use_backend('numpy'):
+			indicator = SimpleMovingAverage(self.prices, 3)
+			indicator.calculate(backend='python')
+
+		self.assertEqual('python', indicator.backend_used)
+
+	def test_unregistered_backend_falls_back_to_python(self):
+		indicator = ExponentialMovingAverage(self.prices, 3)
+		indicator.calculate(backend='numpy')
+
+		self.assertEqual('python', indicator.backend_used)
+		self.assertEqual([1, 1.5, 2.25, 3.12, 4.06, 5.03,6.02,7.01,8.00,9.00], indicator.ema)
+
+	def test_failing_backend_falls_back_to_python(self):
+		register('test_failing', 'python')(lambda value: value)
+
+		def failing(value):
+			raise ValueError("broken")
+		register('test_failing', 'numpy')(failing)
+
+		with warnings.catch_warnings(record=True) as caught:
+			warnings.simplefilter('always')
+			self.assertEqual((1, 'python'), dispatch('test_failing', 1, backend='numpy'))
+
+		self.assertEqual(1, len(caught))
+
+	def test_implementations(self):
+		self.assertIn('python', implementations('simple_moving_average'))
+		self.assertIn('numpy', implementations('simple_moving_average'))
+
+	def test_unknown_backend(self):
+		self.assertRaises(Exception, set_backend, 'gpu')
+
+	def test_backends_agree(self):
+		prices = [44.34,44.09,44.15,43.61,44.33,44.83,45.10,45.42,45.84,46.08,45.89,46.03,45.61,46.28,46.28,46.00,46.03,46.41,46.22,45.64]
+		high = [price + 0.5 for price in prices]
+		low = [price - 0.25 * (i % 3) for i, price in enumerate(prices)]
+		volume = [1000 + 10 * i for i in range(len(prices))]
+		indicators = [
+			lambda: WeightedMovingAverage(prices, 5),
+			lambda: RelativeStrengthIndex(prices, 5),
+			lambda: MoneyFlowIndex(prices, high, low, volume, 5),
+			lambda: AverageTrueRange(prices, high, low, 5, 'EMA'),
+			lambda: StandardDeviation(prices, 5),
+		]
+
+		for make in indicators:
+			expected = make().calculate(backend='python')
+			for name in ('numpy', 'numba'):
+				self.assertEqual(expected, make().calculate(backend=name))
+
+		for name in ('relative_strength_index', 'money_flow_index', 'average_true_range', 'standard_deviation'):
+			self.assertIn('numpy', implementations(name))
+
+	def test_every_indicator_accepts_backend(self):
+		prices = [100 + (i % 17) - (i % 5) * 0.5 + i * 0.1 for i in range(300)]
+		ohlcv = {
+			'close': prices,
+			'high': [price + 1 + i % 3 for i, price in enumerate(prices)],
+			'low': [price - 1 - i % 2 for i, price in enumerate(prices)],
+			'volume': [1000 + 37 * (i % 7) for i in range(len(prices))],
+			'put_volume': [10 + i for i in range(len(prices))],
+			'call_volume': [20 + i for i in range(len(prices))],
+		}
+
+		for module in spec.MODULES:
+			for name, cls in inspect.getmembers(module, inspect.isclass):
+				if cls.__module__ != module.__name__ or not issubclass(cls, AbstractIndicator) or inspect.isabstract(cls):
+					continue
+
+				indicator = spec.build_indicator(name, ohlcv)
+				expected = indicator.calculate(backend='python')
+				self.assertEqual('python', indicator.backend_used, name)
+				for backend_name in ('numpy', 'numba'):
+					indicator = spec.build_indicator(name, ohlcv)
+					self.assertEqual(expected, indicator.calculate(backend=backend_name), name)
+					self.assertIsNotNone(indicator.backend_used, name)
+
+	def test_composite_backend_used(self):
+		prices = [44.34,44.09,44.15,43.61,44.33,44.83,45.10,45.42,45.84,46.08,45.89,46.03,45.61,46.28,46.28,46.00,46.03,46.41,46.22,45.64]
+		high = [price + 0.5 for price in prices]
+		low = [price - 0.25 * (i % 3) for i, price in enumerate(prices)]
+
+		indicator = BollingerBands(prices, 5)
+		indicator.calculate(backend='numpy')
+		self.assertEqual('numpy', indicator.backend_used)
+
+		indicator = KeltnerChannel(prices, high, low, 'EMA', 5, 5)
+		indicator.calculate(backend='numba')
+		self.assertEqual('numba+python', indicator.backend_used)
+
+		with use_backend('numpy'):
+			indicator = spec.build_indicator('RateOfChange', {'close': prices})
+			indicator.calculate()
+		self.assertEqual('python', indicator.backend_used)
@@ -0,0 +1,68 @@
+from unittest import TestCase
+import numpy as np
+from ..strategy.backtest import Backtest, CloseFill, NextOpenFill
+from ..strategy.signals import CrossStream
+from ..indicators.trend import SimpleMovingAverage
+
+class BacktestTest(TestCase):
+
+	def setUp(self):
+		rng = np.random.default_rng(5)
+		self.close = np.round(100 + rng.normal(0, 1, (120, 3)).cumsum(axis=0), 2)
+		self.ohlcv = {
+			'open': np.round(self.close + rng.normal(0, 0.2, self.close.shape), 2),
+			'close': self.close,
+			'high': self.close + 1,
+			'low': self.close - 1,
+			'volume': np.ones(self.close.shape),
+		}
+		self.specs = [("SimpleMovingAverage", {"period": 3}), ("SimpleMovingAverage", {"period": 8})]
+
+	def make_strategy(self):
+		cross = CrossStream(start=8)
+
+		def strategy(index, values, bars, portfolio):
+			return cross.update(values['SimpleMovingAverage(period=3)'], values['SimpleMovingAverage(period=8)'])
+
+		return strategy
+
+	def get_crossings(self, j):
+		fast = SimpleMovingAverage(self.close[:, j].tolist(), 3).calculate()
+		slow = SimpleMovingAverage(self.close[:, j].tolist(), 8).calculate()
+		crossings = []
+		for i in range(9, len(fast)):
+			if fast[i] > slow[i] and fast[i - 1] <= slow[i - 1]:
+				crossings.append((i, 1))
+			elif fast[i] < slow[i] and fast[i - 1] >= slow[i - 1]:
+				crossings.append((i, -1))
+
+		return crossings
+
+	def test_close_fill(self):
+		result = Backtest(['A', 'B', 'C'], self.specs, self.make_strategy(), CloseFill(), cash=1000).run_arrays(self.ohlcv)
+		self.assertEqual(len(self.close), len(result))
+
+		cash = 1000
+		for j in range(3):
+			crossings = self.get_crossings(j)
+			traded = result.trade_symbol == j
+			self.assertEqual([i for i, side in crossings], result.trade_index[traded].tolist())
+			self.assertEqual([side for i, side in crossings], result.trade_quantity[traded].tolist())
+			self.assertEqual(sum(side for i, side in crossings), result.portfolio.positions[j])
+			cash -= sum(side * self.close[i, j] for i, side in crossings)
+
+		self.assertAlmostEqual(cash, result.portfolio.cash)
+		self.assertAlmostEqual(cash + np.dot(result.portfolio.positions, self.close[-1]), result.equity[-1])
+
+	def test_next_open_fill(self):
+		result = Backtest(['A', 'B', 'C'], self.specs, self.make_strategy(), NextOpenFill(commission=0.001)).run_arrays(self.ohlcv)
+
+		crossings = [i + 1 for i, side in self.get_crossings(1) if i + 1 < len(self.close)]
+		traded = result.trade_symbol == 1
+		self.assertEqual(crossings, result.trade_index[traded].tolist())
+		self.assertEqual(self.ohlcv['open'][crossings, 1].tolist(), result.trade_price[traded].tolist())
+		self.assertGreater(result.portfolio.commissions, 0)
+
+	def test_invalid_orders(self):
+		backtest = Backtest(['A', 'B', 'C'], self.specs, lambda index, values, bars, portfolio: [1, 2])
+		self.assertRaises(Exception, backtest.run_arrays, self.ohlcv)
@@ -0,0 +1,74 @@
+from unittest import TestCase
+import os
+import tempfile
+import time
+from ..indicators import cache
+from ..indicators.cache import ResultCache, get_key, get_source_hash, STALE_SECONDS
+from ..indicators.trend import MovingAverageConvergenceDivergence, SimpleMovingAverage
+from ..indicators.momentum import RelativeStrengthIndex
+
+class ResultCacheTest(TestCase):
+
+	def setUp(self):
+		self.prices = [44.34,44.09,44.15,43.61,44.33,44.83,45.10,45.42,45.84,46.08,45.89,46.03,45.61,46.28,46.28,46.00,46.03,46.41,46.22,45.64,46.21,46.25,45.71,46.45,45.78,45.35,44.03,44.18,44.22,44.57,43.42,42.66,43.13]
+		self.directory = tempfile.TemporaryDirectory()
+		self.addCleanup(self.directory.cleanup)
+
+	def test_calculate(self):
+		cache = ResultCache(self.directory.name)
+		expected = MovingAverageConvergenceDivergence(self.prices, 3, 6, 4).calculate()
+
+		self.assertEqual(expected, cache.calculate(MovingAverageConvergenceDivergence(self.prices, 3, 6, 4)))
+		self.assertEqual(expected, cache.calculate(MovingAverageConvergenceDivergence(list(self.prices), 3, 6, 4)))
+		self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+		self.assertEqual(RelativeStrengthIndex(self.prices, 14).calculate(), ResultCache(self.directory.name).calculate(RelativeStrengthIndex(self.prices, 14)))
+		self.assertNotEqual(get_key(RelativeStrengthIndex(self.prices, 14)), get_key(RelativeStrengthIndex(self.prices, 13)))
+		self.assertNotEqual(get_key(RelativeStrengthIndex(self.prices, 14)), get_key(RelativeStrengthIndex(self.prices[1:], 14)))
+
+	def test_evict(self):
+		cache = ResultCache(self.directory.name, max_bytes=1000)
+		for period in range(2, 8):
+			cache.calculate(SimpleMovingAverage(self.prices, period))
+
+		self.assertLessEqual(cache.get_size(), 1000)
+		self.assertIsNotNone(cache.get(get_key(SimpleMovingAverage(self.prices, 7))))
+		self.assertIsNone(cache.get(get_key(SimpleMovingAverage(self.prices, 2))))
+
+	def test_corrupt_entry(self):
+		cache = ResultCache(self.directory.name)
+		indicator = RelativeStrengthIndex(self.prices, 14)
+		cache.calculate(indicator)
+		with open(cache.get_path(get_key(indicator)), 'r+b') as f:
+			f.truncate(20)
+
+		self.assertIsNone(cache.get(get_key(indicator)))
+		self.assertEqual([], os.listdir(self.directory.name))
+
+	def test_source_hash(self):
+		indicator = SimpleMovingAverage(self.prices, 5)
+		key = get_key(indicator)
+		source_hash = get_source_hash(SimpleMovingAverage.__module__)
+		try:
+			cache.SOURCE_HASHES[SimpleMovingAverage.__module__] = 'edited'
+			self.assertNotEqual(key, get_key(indicator))
+		finally:
+			cache.SOURCE_HASHES[SimpleMovingAverage.__module__] = source_hash
+		self.assertEqual(key, get_key(indicator))
+
+	def test_stale_temporary_files(self):
+		stale = os.path.join(self.directory.name, '.entry-stale')
+		fresh = os.path.join(self.directory.name, '.entry-fresh')
+		for path in (stale, fresh):
+			with open(path, 'wb') as f:
+				f.write(b'partial')
+		os.utime(stale, (time.time() - 2 * STALE_SECONDS,) * 2)
+
+		cache = ResultCache(self.directory.name, max_bytes=100)
+		self.assertFalse(os.path.exists(stale))
+		self.assertTrue(os.path.exists(fresh))
+
+		os.utime(fresh, (time.time() - 2 * STALE_SECONDS,) * 2)
+		cache.calculate(SimpleMovingAverage(self.prices, 5))
+		cache.calculate(SimpleMovingAverage(self.prices, 6))
+		self.assertFalse(os.path.exists(fresh))
@@ -0,0 +1,43 @@
+from unittest import TestCase
+from ..indicators.expression import compile_expression
+from ..indicators.trend import ExponentialMovingAverage, SimpleMovingAverage
+from ..indicators.momentum import RateOfChange
+from ..indicators.volatility import AverageTrueRange
+
+class ExpressionTest(TestCase):
+
+	def setUp(self):
+		self.prices = [44.34,44.09,44.15,43.61,44.33,44.83,45.10,45.42,45.84,46.08,45.89,46.03,45.61,46.28,46.28,46.00,46.03,46.41,46.22,45.64,46.21,46.25,45.71,46.45,45.78,45.35,44.03,44.18,44.22,44.57,43.42,42.66,43.13]
+		self.high = [price + 0.5 + (i % 3) * 0.1 for i, price in enumerate(self.prices)]
+		self.low = [price - 0.4 for price in self.prices]
+		self.ohlcv = {'close': self.prices, 'high': self.high, 'low': self.low}
+
+	def test_calculate(self):
+		roc = RateOfChange(self.prices, 1).calculate()
+		expected = ExponentialMovingAverage(ExponentialMovingAverage(roc, 5).calculate(), 3).calculate()
+		self.assertEqual(expected, compile_expression("EMA(EMA(ROC(close, 1), 5), 3)").calculate(self.ohlcv))
+
+		sma = SimpleMovingAverage([h - l for h, l in zip(self.high, self.low)], 5).calculate()
+		atr = AverageTrueRange(self.prices, self.high, self.low, 4).calculate()
+		expected = [s / a if a != 0 else 0.0 for s, a in zip(sma, atr)]
+		self.assertEqual(expected, compile_expression("SMA(high - low, 5) / ATR(4)").calculate(self.ohlcv))
+
+	def test_stream(self):
+		for text in ("EMA(EMA(ROC(close, 1), 5), 3)", "SMA(high - low, 5) / ATR(4)", "MACD(close, 3, 6, 4).macd_signal_line - 2 * -close"):
+			expression = compile_expression(text)
+			stream = expression.get_stream()
+			series = [self.ohlcv['close' if name == 'prices' else name] for name in expression.inputs]
+			self.assertEqual(expression.calculate(self.ohlcv), stream.run(*series))
+
+		expression = compile_expression("EMA(EMA(ROC(close, 1), 5), 3)")
+		self.assertEqual(3, len(expression.plan) - 1)
+		self.assertEqual(1 + 4 + 2, expression.lookback)
+		self.assertTrue(expression.recursive)
+
+	def test_shared_subexpressions(self):
+		expression = compile_expression("SMA(close, 5) - SMA(close, 5) / ATR(4, 'SMA')")
+		self.assertEqual(1, len([node for node in expression.plan.steps if node.target is SimpleMovingAverage]))
+
+	def test_invalid(self):
+		for text in ("SMA(close, ", "FOO(close)", "SMA(close, 5) ** 2", "MACD(close)", "SMA(price, 5)", "1 + 2"):
+			self.assertRaises(Exception, compile_expression, text)
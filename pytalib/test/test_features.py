@@ -0,0 +1,51 @@
+from unittest import TestCase
+import numpy as np
+from ..indicators.features import build_features, Intermediates
+from ..indicators.spec import run_indicator
+
+class FeatureMatrixTest(TestCase):
+
+	def setUp(self):
+		self.prices = [44.34,44.09,44.15,43.61,44.33,44.83,45.10,45.42,45.84,46.08,45.89,46.03,45.61,46.28,46.28,46.00,46.03,46.41,46.22,45.64,46.21,46.25,45.71,46.45,45.78,45.35,44.03,44.18,44.22,44.57,43.42,42.66,43.13]
+		self.ohlcv = {
+			'close': self.prices,
+			'high': [price + 0.5 + (i % 3) * 0.1 for i, price in enumerate(self.prices)],
+			'low': [price - 0.4 for price in self.prices],
+			'volume': [1000 + 37 * i for i in range(len(self.prices))],
+		}
+		self.specs = [
+			("SimpleMovingAverage", {"period": 5}),
+			("MovingAverageConvergenceDivergence", {"f_ema_period": 3, "s_ema_period": 6, "signal_period": 4}),
+			("RelativeStrengthIndex", {"period": 14}),
+			("MoneyFlowIndex", {"period": 5}),
+			("AverageTrueRange", {"period": 5, "ma_type": "EMA"}),
+			("BollingerBands", {"period": 5}),
+			("KeltnerChannel", {"ma_period": 5, "atr_period": 5}),
+			("EaseOfMovement", {"period": 5}),
+			("ForceIndex", {"period": 5}),
+			"OnBalanceVolume",
+		]
+
+	def test_build_features(self):
+		features = build_features(self.specs, self.ohlcv)
+		self.assertEqual((len(self.prices), 15), features.values.shape)
+
+		expected = []
+		for spec in self.specs:
+			outputs = run_indicator(spec, self.ohlcv)
+			expected.extend(outputs if isinstance(outputs, tuple) else [outputs])
+		self.assertEqual(expected, [features[column].tolist() for column in features.columns])
+
+		self.assertEqual(features["BollingerBands(period=5).bb_up"].tolist(), features.values[:, 6].tolist())
+		self.assertEqual("OnBalanceVolume", features.columns[-1])
+
+	def test_shared_intermediates(self):
+		inter = Intermediates(self.ohlcv)
+		inter.true_range()
+		first = inter.moving_average(('true_range',), 5, 'EMA')
+		self.assertIs(first, inter.moving_average(('true_range',), 5, 'EMA'))
+
+	def test_validate(self):
+		self.assertRaises(Exception, build_features, [("SimpleMovingAverage", {"period": 50})], self.ohlcv)
+		self.assertRaises(Exception, build_features, ["SimpleMovingAverage", "SimpleMovingAverage"], self.ohlcv)
+		self.assertEqual(np.float32, build_features(self.specs[:1], self.ohlcv, dtype=np.float32).values.dtype)
@@ -0,0 +1,52 @@
+from unittest import TestCase
+from concurrent.futures import ThreadPoolExecutor
+import random
+import numpy as np
+from ..indicators import functional
+from ..indicators.trend import MovingAverageConvergenceDivergence, AverageDirectionalIndex
+from ..indicators.momentum import RelativeStrengthIndex
+from ..indicators.volatility import BollingerBands
+from ..indicators.volume import EaseOfMovement
+
+def make_bars(seed, length):
+	rng = random.Random(seed)
+	close = [round(50 + rng.gauss(0, 3), 2) for i in range(length)]
+	high = [round(price + abs(rng.gauss(0, 1)), 2) for price in close]
+	low = [round(price - abs(rng.gauss(0, 1)), 2) for price in close]
+	volume = [float(rng.randint(1000, 100000)) for i in range(length)]
+
+	return (close, high, low, volume)
+
+class FunctionalTest(TestCase):
+
+	def setUp(self):
+		self.close, self.high, self.low, self.volume = make_bars(0, 120)
+
+	def test_matches_classes(self):
+		self.assertEqual(RelativeStrengthIndex(self.close, 14).calculate(), functional.rsi(self.close, 14).tolist())
+		self.assertEqual(AverageDirectionalIndex(self.close, self.high, self.low, 14).calculate(), functional.adx(self.close, self.high, self.low, 14).tolist())
+		self.assertEqual(EaseOfMovement(self.close, self.high, self.low, self.volume, 14).calculate(), functional.emv(self.close, self.high, self.low, self.volume, 14).tolist())
+		self.assertEqual(list(BollingerBands(self.close, 20).calculate()[2]), functional.bollinger_bands(self.close, 20)[2].tolist())
+		self.assertEqual(list(MovingAverageConvergenceDivergence(self.close).calculate()[1]), functional.macd(np.asarray(self.close))[1].tolist())
+
+	def test_validate(self):
+		self.assertRaises(Exception, functional.rsi, self.close, 0)
+		self.assertRaises(Exception, functional.rsi, self.close[:5], 14)
+		self.assertRaises(Exception, functional.mfi, self.close, self.high, self.low[:-1], self.volume)
+
+	def test_messages_do_not_accumulate(self):
+		rsi = RelativeStrengthIndex([], 14)
+		self.assertRaises(Exception, rsi.validate)
+		messages = list(rsi.messages)
+		for i in range(3):
+			self.assertRaises(Exception, rsi.validate)
+		self.assertEqual(messages, rsi.messages)
+
+	def test_thread_pool(self):
+		series = [make_bars(seed, 200) for seed in range(16)]
+		expected = [(functional.rsi(close, 14).tolist(), functional.trix(close, 15).tolist()) for close, high, low, volume in series]
+
+		with ThreadPoolExecutor(4) as pool:
+			results = list(pool.map(lambda bars: (functional.rsi(bars[0], 14).tolist(), functional.trix(bars[0], 15).tolist()), series))
+
+		self.assertEqual(expected, results)
@@ -0,0 +1,61 @@
+from unittest import TestCase, skipUnless
+import numpy as np
+from ..jit import HAS_NUMBA
+from ..indicators import kernels
+from ..indicators.trend import ExponentialMovingAverageStream, AverageDirectionalIndexStream
+from ..graph.kernels import hvg_edges, vg_fast_edges
+
+class RoundHalfEvenTest(TestCase):
+
+	def test_matches_builtin_round(self):
+		values = [0.125, 0.135, 2.675, 1.005, -3.125, -2.675, 1234.565, 0.0, 12.3449999, 1e20]
+		for value in values:
+			self.assertEqual(round(value, 2), kernels.round_half_even(value, 2))
+			self.assertEqual(round(value, 4), kernels.round_half_even(value, 4))
+
+class KernelParityTest(TestCase):
+
+	def setUp(self):
+		self.prices = np.array([23.89,23.95,23.67,23.78,23.50,23.32,23.75,23.79,24.14,23.81,23.78,23.86,23.70,24.96,24.88,24.96,25.18,25.07,25.27,25.00])
+		self.high = np.array([24.20,24.07,24.04,23.87,23.67,23.59,23.80,23.80,24.30,24.15,24.05,24.06,23.88,25.14,25.20,25.07,25.22,25.37,25.36,25.26])
+		self.low = np.array([23.85,23.72,23.64,23.37,23.46,23.18,23.40,23.57,24.05,23.77,23.60,23.84,23.64,23.94,24.74,24.77,24.90,24.93,24.96,24.93])
+
+	def test_exponential_moving_average(self):
+		expected = ExponentialMovingAverageStream(5).run(self.prices.tolist())
+		self.assertEqual(expected, kernels.exponential_moving_average(self.prices, 5).tolist())
+
+	def test_average_directional_index(self):
+		expected = AverageDirectionalIndexStream(5, with_di=True).run(self.prices.tolist(), self.high.tolist(), self.low.tolist())
+		adx, pos_di, neg_di = kernels.average_directional_index(self.prices, self.high, self.low, 5)
+
+		self.assertEqual(expected, (adx.tolist(), pos_di.tolist(), neg_di.tolist()))
+
+	@skipUnless(HAS_NUMBA, "numba is not installed")
+	def test_compiled_matches_python(self):
+		self.assertEqual(kernels.exponential_moving_average.py_func(self.prices, 5).tolist(), kernels.exponential_moving_average(self.prices, 5).tolist())
+
+		compiled = kernels.average_directional_index(self.prices, self.high, self.low, 5)
+		python = kernels.average_directional_index.py_func(self.prices, self.high, self.low, 5)
+		for i in range(3):
+			self.assertEqual(python[i].tolist(), compiled[i].tolist())
+
+class GraphKernelTest(TestCase):
+
+	def setUp(self):
+		self.series = np.array([1,3,2,4,5,6,9,8,9,10], dtype=np.float64)
+
+	def edge_set(self, edges):
+		return sorted(tuple(sorted(edge)) for edge in edges.tolist())
+
+	def test_hvg_edges(self):
+		expected = [(0, 1), (1, 2), (1, 3), (2, 3), (3, 4), (4, 5), (5, 6), (6, 7), (6, 8), (6, 9), (7, 8), (8, 9)]
+		self.assertEqual(expected, self.edge_set(hvg_edges(self.series)))
+
+	def test_vg_fast_edges(self):
+		expected = [(0, 1), (1, 2), (1, 3), (1, 4), (1, 5), (1, 6), (2, 3), (3, 4), (3, 6), (4, 5), (4, 6), (5, 6), (6, 7), (6, 8), (6, 9), (7, 8), (8, 9)]
+		self.assertEqual(expected, self.edge_set(vg_fast_edges(self.series)))
+
+	@skipUnless(HAS_NUMBA, "numba is not installed")
+	def test_compiled_matches_python(self):
+		self.assertEqual(self.edge_set(hvg_edges.py_func(self.series)), self.edge_set(hvg_edges(self.series)))
+		self.assertEqual(self.edge_set(vg_fast_edges.py_func(self.series)), self.edge_set(vg_fast_edges(self.series)))
@@ -1,4 +1,5 @@
 from unittest import TestCase
+import random
 from ..indicators.momentum import *
 
 class RateOfChangeTest(TestCase):
@@ -24,6 +25,39 @@ class RelativeStrengthIndexTest(TestCase):
 		
 		self.assertEqual(expected, self.indicator.calculate())
 
+	def test_zero_average_loss(self):
+		prices = [1, 2, 3, 4, 5, 5, 6, 7]
+		expected = [0.00, 0.00, 0.00, 100.00, 100.00, 100.00, 100.00, 100.00]
+		self.assertEqual(expected, RelativeStrengthIndex(prices, 3).calculate())
+
+		stream = RelativeStrengthIndexStream(3)
+		self.assertEqual(expected, [stream.update(price) for price in prices])
+
+	def test_zero_average_loss_contract(self):
+		# the contract before the change, which divided by the average loss and raised on zero
+		def old_rsi(prices, period, i):
+			avg_gain, avg_loss = RelativeStrengthIndex(prices, period).get_avg_gain_loss()
+			if i < period:
+				return 0.00
+			return round((100 - 100 / (1 + round(avg_gain[i] / avg_loss[i], 2))), 2)
+
+		rng = random.Random(5)
+		for n in range(50):
+			prices = [round(10 + rng.choice([0, 0, 1, -1]) * rng.random(), 2)]
+			for i in range(30):
+				prices.append(round(prices[-1] + rng.choice([0, 0.5, 1, -0.25]) * rng.random(), 2))
+
+			expected = []
+			for i in range(len(prices)):
+				try:
+					expected.append(old_rsi(prices, 5, i))
+				except ZeroDivisionError:
+					expected.append(100.00)
+
+			self.assertEqual(expected, RelativeStrengthIndex(prices, 5).calculate(backend='python'))
+			self.assertEqual(expected, RelativeStrengthIndex(prices, 5).calculate(backend='numpy'))
+			self.assertEqual(expected, RelativeStrengthIndexStream(5).run(prices))
+
 '''
 class StochasticOscillatorTest(TestCase):
 
@@ -84,4 +118,83 @@ class KnowSureThingOscillatorTest(TestCase):
 		self.indicator.prices = [1,2,3,4,5,6,7,8,9,10]
 		self.indicator.period = 1
 		self.assertEqual(0, self.indicator.calculate())
-'''
\ No newline at end of file
+'''
+class MomentumExtendTest(TestCase):
+
+	def setUp(self):
+		self.prices = [44.34,44.09,44.15,43.61,44.33,44.83,45.10,45.42,45.84,46.08,45.89,46.03,45.61,46.28,46.28,46.00,46.03,46.41,46.22,45.64,46.21,46.25,45.71,46.45,45.78,45.35,44.03,44.18,44.22,44.57,43.42,42.66,43.13]
+		self.high = [price + 0.5 for price in self.prices]
+		self.low = [price - 0.5 for price in self.prices]
+		self.volume = [1000 + 10 * i for i in range(len(self.prices))]
+
+	def test_extend(self):
+		indicators = [
+			(RelativeStrengthIndex, (self.prices,), {'period': 14}),
+			(StochasticOscillator, (self.prices, self.high, self.low), {'k_period': 5}),
+			(MoneyFlowIndex, (self.prices, self.high, self.low, self.volume), {'period': 5}),
+			(TrueStrengthIndex, (self.prices,), {'r_period': 5, 's_period': 3}),
+			(KnowSureThingOscillator, (self.prices,), {'ss_roc_period': 2, 's_roc_period': 3, 'm_roc_period': 4, 'l_roc_period': 5, 'signal_period': 3}),
+		]
+		for cls, series, params in indicators:
+			expected = cls(*series, **params).calculate()
+			self.assertEqual(expected, cls(*series, **params).get_stream().run(*series))
+
+			indicator = cls(*[values[:20] for values in series], **params)
+			indicator.calculate()
+			indicator.extend(*[values[20:21] for values in series])
+			self.assertEqual(expected, indicator.extend(*[values[21:] for values in series]))
+
+class MomentumLookbackTest(TestCase):
+
+	def setUp(self):
+		self.prices = [44.34,44.09,44.15,43.61,44.33,44.83,45.10,45.42,45.84,46.08,45.89,46.03,45.61,46.28,46.28,46.00,46.03,46.41,46.22,45.64,46.21,46.25,45.71,46.45,45.78,45.35,44.03,44.18,44.22,44.57,43.42,42.66,43.13]
+		self.high = [price + 0.5 + (i % 4) * 0.1 for i, price in enumerate(self.prices)]
+		self.low = [price - 0.5 for price in self.prices]
+		self.volume = [1000 + 10 * i for i in range(len(self.prices))]
+
+	def test_lookback(self):
+		self.assertEqual(14, RelativeStrengthIndex([], period=14).lookback)
+		self.assertEqual(15, MoneyFlowIndex([], [], [], [], period=14).lookback)
+		self.assertEqual(16, StochasticOscillator([], [], [], k_period=14, d_period=3).lookback)
+		self.assertEqual(52, KnowSureThingOscillator([]).lookback)
+		self.assertFalse(RelativeStrengthIndex([]).recursive)
+		self.assertTrue(TrueStrengthIndex([]).recursive)
+
+	def test_window_outputs(self):
+		indicators = [
+			(RateOfChange, (self.prices,), {'period': 4}),
+			(RelativeStrengthIndex, (self.prices,), {'period': 14}),
+			(StochasticOscillator, (self.prices, self.high, self.low), {'k_period': 5}),
+			(MoneyFlowIndex, (self.prices, self.high, self.low, self.volume), {'period': 5}),
+			(UltimateOscillator, (self.prices, self.high, self.low), {'s_period': 3, 'm_period': 5, 'l_period': 7}),
+			(Williams, (self.prices, self.high, self.low), {'period': 5}),
+		]
+		for cls, series, params in indicators:
+			expected = cls(*series, **params).calculate()
+			lookback = cls(*series, **params).lookback
+			for i in range(lookback, len(self.prices)):
+				result = cls(*[values[i - lookback : i + 1] for values in series], **params).calculate()
+				if isinstance(expected, tuple):
+					self.assertEqual([output[i] for output in expected], [output[-1] for output in result])
+				else:
+					self.assertEqual(expected[i], result[-1])
+
+	def test_tail(self):
+		expected = RelativeStrengthIndex(self.prices, 14).calculate()
+		self.assertEqual(expected[-5:], RelativeStrengthIndex(self.prices, 14).tail(5))
+		self.assertEqual(expected[-1], RelativeStrengthIndex(self.prices, 14).latest())
+
+		k, d = StochasticOscillator(self.prices, self.high, self.low, 5).calculate()
+		self.assertEqual((k[-3:], d[-3:]), StochasticOscillator(self.prices, self.high, self.low, 5).tail(3))
+		self.assertEqual((k[-1], d[-1]), StochasticOscillator(self.prices, self.high, self.low, 5).latest())
+		self.assertRaises(Exception, RelativeStrengthIndex(self.prices, 14).tail, 0)
+
+	def test_correct(self):
+		corrected = self.prices[:28] + [44.80] + self.prices[29:31]
+		indicator = RelativeStrengthIndex(self.prices, 14)
+		original = indicator.calculate()
+		result = indicator.correct(28, corrected[28:])
+
+		self.assertEqual(RelativeStrengthIndex(corrected, 14).calculate(), result)
+		self.assertEqual(original[:28], result[:28])
+		self.assertEqual(31, len(result))
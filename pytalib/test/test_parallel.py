@@ -0,0 +1,118 @@
+from unittest import TestCase, skipUnless
+import os
+import random
+import numpy as np
+from ..parallel.executor import run_universe, chunk
+from ..parallel.shared_memory import SharedArrays, SharedUniverse
+from ..indicators.spec import build_indicator, get_indicator_class, get_inputs, get_lookback, run_indicator, run_indicator_array
+from ..indicators.momentum import RelativeStrengthIndex
+from ..indicators.volatility import BollingerBands
+
+def make_universe(symbols, length):
+	universe = {}
+	for s in range(symbols):
+		rng = random.Random(s)
+		close = [round(50 + rng.gauss(0, 3), 2) for i in range(length)]
+		universe["SYM{}".format(s)] = {
+			'close': np.asarray(close),
+			'high': np.asarray([round(price + abs(rng.gauss(0, 1)), 2) for price in close]),
+			'low': np.asarray([round(price - abs(rng.gauss(0, 1)), 2) for price in close]),
+			'volume': np.asarray([rng.randint(1000, 100000) for i in range(length)], dtype=np.float64),
+		}
+
+	return universe
+
+class SpecTest(TestCase):
+
+	def test_get_indicator_class(self):
+		self.assertIs(RelativeStrengthIndex, get_indicator_class("RelativeStrengthIndex"))
+		self.assertRaises(Exception, get_indicator_class, "AbstractPriceIndicator")
+		self.assertRaises(Exception, get_indicator_class, "Unknown")
+
+	def test_get_inputs(self):
+		self.assertEqual(['prices', 'high', 'low', 'volume'], get_inputs(get_indicator_class("MoneyFlowIndex")))
+
+	def test_get_lookback(self):
+		self.assertEqual(14, get_lookback(("RelativeStrengthIndex", {"period": 14})))
+		self.assertEqual(19, get_lookback("BollingerBands"))
+
+	def test_build_indicator(self):
+		universe = make_universe(1, 30)
+		indicator = build_indicator(("RelativeStrengthIndex", {"period": 5}), universe["SYM0"])
+
+		self.assertEqual(5, indicator.period)
+		self.assertEqual(universe["SYM0"]['close'].tolist(), indicator.prices)
+
+		indicator = build_indicator(("RelativeStrengthIndex", {"period": 5}), universe["SYM0"], copy=False)
+		self.assertIs(universe["SYM0"]['close'], indicator.prices)
+
+	def test_run_indicator_array(self):
+		ohlcv = make_universe(1, 40)["SYM0"]
+		for spec in [("AverageTrueRange", {"period": 5, "ma_type": "EMA"}), ("BollingerBands", {"period": 10, "ma_type": "WMA"}), ("OnBalanceVolume", {})]:
+			self.assertEqual(np.asarray(run_indicator(spec, ohlcv)).tolist(), np.asarray(run_indicator_array(spec, ohlcv)).tolist())
+
+		self.assertRaises(Exception, run_indicator_array, ("AverageTrueRange", {"period": 50}), ohlcv)
+
+class RunUniverseTest(TestCase):
+
+	def setUp(self):
+		self.universe = make_universe(6, 60)
+		self.specs = [("RelativeStrengthIndex", {"period": 14}), ("BollingerBands", {"period": 10}), ("OnBalanceVolume", {})]
+
+	def test_chunk(self):
+		self.assertEqual([[1, 2], [3, 4], [5]], chunk([1, 2, 3, 4, 5], 2))
+
+	def test_run_universe(self):
+		results = run_universe(self.universe, self.specs, processes=2, chunksize=2)
+
+		self.assertEqual(sorted(self.universe), sorted(results))
+		for symbol, ohlcv in self.universe.items():
+			rsi, bb, obv = results[symbol]
+			self.assertEqual(RelativeStrengthIndex(ohlcv['close'].tolist(), 14).calculate(), rsi.tolist())
+			self.assertEqual((3, 60), bb.shape)
+			self.assertEqual(list(BollingerBands(ohlcv['close'].tolist(), 10).calculate()[0]), bb[0].tolist())
+			self.assertEqual(60, len(obv))
+
+	def test_single_process(self):
+		self.assertEqual(
+			{symbol: [result.tolist() for result in results] for symbol, results in run_universe(self.universe, self.specs, processes=1).items()},
+			{symbol: [result.tolist() for result in results] for symbol, results in run_universe(self.universe, self.specs, processes=3).items()})
+
+class SharedMemoryTest(TestCase):
+
+	def test_publish_attach(self):
+		with SharedArrays.publish({'a': [1, 2, 3], ('b', 0): np.ones((2, 4))}) as shared:
+			attached = SharedArrays.attach(shared.manifest)
+			self.assertEqual([1.0, 2.0, 3.0], attached['a'].tolist())
+			self.assertEqual((2, 4), attached[('b', 0)].shape)
+
+			attached['a'][0] = 7
+			self.assertEqual(7, shared['a'][0])
+			attached.close()
+
+		self.assertRaises(FileNotFoundError, SharedArrays.attach, shared.manifest)
+
+	def test_shared_universe(self):
+		universe = make_universe(2, 20)
+		with SharedUniverse.publish(universe) as shared:
+			self.assertEqual(['SYM0', 'SYM1'], shared.symbols())
+			self.assertEqual(universe['SYM1']['close'].tolist(), shared['SYM1']['close'].tolist())
+
+	def test_run_universe(self):
+		universe = make_universe(5, 60)
+		specs = [("RelativeStrengthIndex", {"period": 14}), ("BollingerBands", {"period": 10}), ("AverageTrueRange", {"period": 5, "ma_type": "EMA"})]
+		expected = run_universe(universe, specs, processes=1)
+		results = run_universe(universe, specs, processes=2, chunksize=2, transport='shared_memory')
+
+		self.assertEqual(sorted(expected), sorted(results))
+		for symbol in expected:
+			self.assertEqual([output.tolist() for output in expected[symbol]], [output.tolist() for output in results[symbol]])
+
+	@skipUnless(os.path.isdir('/dev/shm'), "needs /dev/shm")
+	def test_failure_unlinks_blocks(self):
+		universe = make_universe(5, 60)
+		universe['SYM2'] = make_universe(1, 5)['SYM0']
+		before = set(os.listdir('/dev/shm'))
+
+		self.assertRaises(Exception, run_universe, universe, [("RelativeStrengthIndex", {"period": 14})], processes=2, chunksize=1, transport='shared_memory')
+		self.assertEqual(set(), set(os.listdir('/dev/shm')) - before)
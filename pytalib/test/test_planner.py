@@ -0,0 +1,53 @@
+from unittest import TestCase
+from ..indicators import planner
+from ..indicators.spec import run_plan, run_indicator, get_columns, get_default_indicator
+from ..indicators.trend import ExponentialMovingAverage, MovingAverageConvergenceDivergence
+from ..indicators.volatility import KeltnerChannel
+
+class PlannerTest(TestCase):
+
+	def setUp(self):
+		self.prices = [44.34,44.09,44.15,43.61,44.33,44.83,45.10,45.42,45.84,46.08,45.89,46.03,45.61,46.28,46.28,46.00,46.03,46.41,46.22,45.64,46.21,46.25,45.71,46.45,45.78,45.35,44.03,44.18,44.22,44.57,43.42,42.66,43.13]
+		self.ohlcv = {
+			'close': self.prices,
+			'high': [price + 0.5 + (i % 3) * 0.1 for i, price in enumerate(self.prices)],
+			'low': [price - 0.4 for price in self.prices],
+		}
+		self.specs = [
+			("ExponentialMovingAverage", {"period": 5}),
+			("MovingAverageConvergenceDivergence", {"f_ema_period": 5, "s_ema_period": 8, "signal_period": 4}),
+			("KeltnerChannel", {"ma_period": 5, "atr_period": 5}),
+			("BollingerBands", {"period": 5}),
+			("DetrendedPriceOscillator", {"period": 5}),
+			"StochasticOscillator",
+		]
+
+	def test_shared_nodes(self):
+		nodes = [node for spec in self.specs for node in get_default_indicator(spec).get_nodes()]
+		plan = planner.Plan(nodes)
+
+		emas = [node for node in plan.steps if node.target is ExponentialMovingAverage and node.params == {'period': 5}]
+		self.assertEqual(1, len(emas))
+		self.assertEqual(['prices', 'high', 'low'], plan.sources)
+		order = [node.key for node in plan.steps]
+		for i, node in enumerate(plan.steps):
+			self.assertTrue(all(order.index(child.key) < i for child in node.inputs))
+
+	def test_run_plan(self):
+		expected = {}
+		for spec in self.specs:
+			outputs = run_indicator(spec, self.ohlcv)
+			expected.update(zip(get_columns(spec), outputs if isinstance(outputs, tuple) else (outputs,)))
+
+		self.assertEqual(expected, run_plan(self.specs, self.ohlcv))
+
+	def test_free_intermediates(self):
+		macd = MovingAverageConvergenceDivergence(self.prices, 5, 8, 4)
+		plan = planner.Plan(macd.get_nodes())
+		ema = plan.steps[1]
+		self.assertEqual(3, plan.last_use[ema.key])
+		self.assertEqual(macd.calculate(), tuple(plan.run({'prices': self.prices})))
+
+		keltner = KeltnerChannel(self.prices, self.ohlcv['high'], self.ohlcv['low'], ma_period=5, atr_period=5)
+		keltner.calculate()
+		self.assertEqual(run_indicator(("AverageTrueRange", {"period": 5}), self.ohlcv), keltner.get_atr())
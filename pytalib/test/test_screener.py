@@ -0,0 +1,83 @@
+from unittest import IsolatedAsyncioTestCase, skipUnless
+import asyncio
+import os
+import socket
+import tempfile
+from ..service.screener import ScreenerService, request
+from ..indicators.momentum import RelativeStrengthIndex, StochasticOscillator
+from ..indicators.volatility import AverageTrueRange
+from ..indicators.trend import MovingAverageConvergenceDivergence
+
+class ScreenerServiceTest(IsolatedAsyncioTestCase):
+
+	async def asyncSetUp(self):
+		self.prices = [44.34,44.09,44.15,43.61,44.33,44.83,45.10,45.42,45.84,46.08,45.89,46.03,45.61,46.28,46.28,46.00,46.03,46.41,46.22,45.64,46.21,46.25,45.71,46.45,45.78,45.35,44.03,44.18,44.22,44.57,43.42,42.66,43.13]
+		self.high = [price + 0.5 + (i % 3) * 0.1 for i, price in enumerate(self.prices)]
+		self.low = [price - 0.4 for price in self.prices]
+		self.service = ScreenerService()
+		await self.service.start()
+
+	async def asyncTearDown(self):
+		await self.service.stop()
+
+	async def post(self, path, body):
+		return await request('POST', path, body, port=self.service.port)
+
+	async def test_latest(self):
+		status, sizes = await self.post('/bars', {'AAA': {'close': self.prices[:30], 'high': self.high[:30], 'low': self.low[:30]}})
+		self.assertEqual((200, {'AAA': 30}), (status, sizes))
+
+		specs = [["RelativeStrengthIndex", {"period": 14}], ["AverageTrueRange", {"period": 5}], ["MovingAverageConvergenceDivergence", {"f_ema_period": 3, "s_ema_period": 6, "signal_period": 4}]]
+		status, result = await self.post('/latest', {'symbols': ['AAA', 'BBB'], 'specs': specs})
+		self.assertEqual(200, status)
+		self.assertEqual(RelativeStrengthIndex(self.prices[:30], 14).latest(), result['RelativeStrengthIndex(period=14)']['AAA'])
+		self.assertIsNone(result['RelativeStrengthIndex(period=14)']['BBB'])
+
+		await self.post('/bars', {'AAA': {'close': self.prices[30:], 'high': self.high[30:], 'low': self.low[30:]}})
+		status, result = await self.post('/latest', {'symbols': ['AAA'], 'specs': specs})
+		self.assertEqual(AverageTrueRange(self.prices, self.high, self.low, 5).latest(), result['AverageTrueRange(period=5)']['AAA'])
+		self.assertEqual(list(MovingAverageConvergenceDivergence(self.prices, 3, 6, 4).latest()), result['MovingAverageConvergenceDivergence(f_ema_period=3, s_ema_period=6, signal_period=4)']['AAA'])
+		self.assertEqual(3, self.service.state.computations)
+
+	async def test_coalescing(self):
+		await self.post('/bars', {'AAA': {'close': self.prices, 'high': self.high, 'low': self.low}})
+		body = {'symbols': ['AAA'], 'specs': [["AverageDirectionalIndex", {"period": 5}]]}
+		responses = await asyncio.gather(*[self.post('/latest', body) for i in range(10)])
+
+		self.assertEqual(1, self.service.state.computations)
+		self.assertEqual(1, len(set(str(response) for response in responses)))
+
+	async def test_errors(self):
+		self.assertEqual(404, (await request('GET', '/missing', port=self.service.port))[0])
+		self.assertEqual(400, (await self.post('/bars', {'AAA': {'close': [1, 2], 'high': [1]}}))[0])
+		self.assertEqual(400, (await self.post('/latest', {'symbols': ['AAA'], 'specs': ["NotAnIndicator"]}))[0])
+		self.assertEqual(200, (await request('GET', '/health', port=self.service.port))[0])
+
+	async def test_stream_failure(self):
+		await self.post('/bars', {'AAA': {'close': self.prices[:10], 'high': self.high[:10], 'low': self.low[:10]}, 'BBB': {'close': self.prices, 'high': self.high, 'low': self.low}})
+		body = {'symbols': ['AAA', 'BBB'], 'specs': [["StochasticOscillator", {"k_period": 3, "d_period": 2}], ["SimpleMovingAverage", {"period": 3}]]}
+		self.assertEqual(200, (await self.post('/latest', body))[0])
+
+		status, sizes = await self.post('/bars', {'AAA': {'close': [44.0] * 4, 'high': [44.0] * 4, 'low': [44.0] * 4}})
+		self.assertEqual((200, {'AAA': 14}), (status, sizes))
+		self.assertNotIn('StochasticOscillator(k_period=3, d_period=2)', self.service.state.streams['AAA'])
+		self.assertEqual(14, self.service.state.streams['AAA']['SimpleMovingAverage(period=3)'][2])
+
+		status, result = await self.post('/latest', body)
+		self.assertEqual(200, status)
+		self.assertIn('error', result['StochasticOscillator(k_period=3, d_period=2)']['AAA'])
+		self.assertEqual(list(StochasticOscillator(self.prices, self.high, self.low, 3, 2).latest()), result['StochasticOscillator(k_period=3, d_period=2)']['BBB'])
+		self.assertEqual(44.0, result['SimpleMovingAverage(period=3)']['AAA'])
+
+	@skipUnless(hasattr(socket, 'AF_UNIX'), "requires Unix sockets")
+	async def test_unix_socket(self):
+		with tempfile.TemporaryDirectory() as directory:
+			path = os.path.join(directory, 'screener.sock')
+			service = ScreenerService()
+			await service.start(path=path)
+			try:
+				await request('POST', '/bars', {'AAA': {'close': self.prices}}, unix_path=path)
+				status, result = await request('POST', '/latest', {'symbols': ['AAA'], 'specs': ["RelativeStrengthIndex"]}, unix_path=path)
+				self.assertEqual(RelativeStrengthIndex(self.prices, 14).latest(), result['RelativeStrengthIndex']['AAA'])
+			finally:
+				await service.stop()
@@ -0,0 +1,52 @@
+from unittest import TestCase
+import numpy as np
+from ..strategy import signals
+from ..indicators.trend import MovingAverageConvergenceDivergence
+from ..indicators.volatility import BollingerBands
+
+class SignalsTest(TestCase):
+
+	def setUp(self):
+		self.prices = [44.34,44.09,44.15,43.61,44.33,44.83,45.10,45.42,45.84,46.08,45.89,46.03,45.61,46.28,46.28,46.00,46.03,46.41,46.22,45.64,46.21,46.25,45.71,46.45,45.78,45.35,44.03,44.18,44.22,44.57,43.42,42.66,43.13]
+
+	def test_cross(self):
+		self.assertEqual([0, 0, 1, 0, -1, 0], signals.cross([1, 2, 4, 5, 2, 1], [3, 3, 3, 3, 3, 3]).tolist())
+		self.assertEqual([0, 0, 0, 0, -1, 0], signals.crossunder([1, 2, 4, 5, 2, 1], 3).tolist())
+		self.assertEqual([0, 0, 0, 0, 0, 0], signals.crossover([1, 2, 4, 5, 2, 1], 3, start=2).tolist())
+
+		macd, signal_line = MovingAverageConvergenceDivergence(self.prices, 3, 6, 4).calculate()
+		expected = [1 if macd[i] > signal_line[i] and macd[i - 1] <= signal_line[i - 1] else -1 if macd[i] < signal_line[i] and macd[i - 1] >= signal_line[i - 1] else 0 for i in range(1, len(macd))]
+		self.assertEqual([0] + expected, signals.cross(macd, signal_line).tolist())
+
+	def test_threshold(self):
+		rsi = [50, 40, 25, 20, 28, 35, 60, 75, 80, 65, 25, 40]
+		self.assertEqual([0, 0, 1, 0, 0, 0, 0, -1, 0, 0, 1, 0], signals.threshold(rsi, 30, 70).tolist())
+		self.assertEqual([0, 0, 0, 0, 0, 0, 0, 1, 0, 0, -1, 0], signals.threshold(rsi, 70, 30).tolist())
+
+		mixed = signals.threshold(np.column_stack([rsi, rsi]), [30, 70], [70, 30])
+		self.assertEqual(signals.threshold(rsi, 30, 70).tolist(), mixed[:, 0].tolist())
+		self.assertEqual(signals.threshold(rsi, 70, 30).tolist(), mixed[:, 1].tolist())
+		stream = signals.ThresholdStream([30, 70], [70, 30])
+		self.assertEqual(mixed.tolist(), [stream.update([value, value]).tolist() for value in rsi])
+
+	def test_streams(self):
+		rng = np.random.default_rng(7)
+		values = rng.normal(50, 15, (40, 3)).round()
+		other = rng.normal(50, 15, (40, 3)).round()
+		up, ma, down = [np.array(band) for band in BollingerBands(self.prices, 5).calculate()]
+
+		cross = signals.CrossStream(start=1)
+		threshold = signals.ThresholdStream(30, 70)
+		band_break = signals.BandBreakStream(start=4)
+		self.assertEqual(signals.cross(values, other, start=1).tolist(), [cross.update(a, b).tolist() for a, b in zip(values, other)])
+		self.assertEqual(signals.threshold(values, 30, 70).tolist(), [threshold.update(a).tolist() for a in values])
+		self.assertEqual(signals.band_break(self.prices, up, down, start=4).tolist(), [band_break.update(*bar) for bar in zip(self.prices, up, down)])
+
+	def test_get_events(self):
+		signal = np.array([[0, 1], [-1, 0], [0, 0], [1, -1]], dtype=np.int8)
+		events = signals.get_events(signal)
+		self.assertEqual(4, len(events))
+		self.assertEqual([0, 1, 3, 3], events.index.tolist())
+		self.assertEqual([1, 0, 0, 1], events.symbol.tolist())
+		self.assertEqual([1, -1, 1, -1], events.kind.tolist())
+		self.assertEqual([1, 3], signals.get_events(signal[:, 0]).index.tolist())
@@ -0,0 +1,93 @@
+from unittest import TestCase
+import os
+import tempfile
+import numpy as np
+from ..indicators import snapshot
+from ..indicators.store import IndicatorStore
+from ..indicators.trend import ExponentialMovingAverageStream, AverageDirectionalIndexStream, MovingAverageConvergenceDivergenceStream
+from ..indicators.momentum import RelativeStrengthIndexStream, KnowSureThingOscillatorStream
+from ..indicators.volatility import AverageTrueRangeStream, KeltnerChannelStream
+
+class SnapshotTest(TestCase):
+
+	def setUp(self):
+		self.prices = [44.34,44.09,44.15,43.61,44.33,44.83,45.10,45.42,45.84,46.08,45.89,46.03,45.61,46.28,46.28,46.00,46.03,46.41,46.22,45.64,46.21,46.25,45.71,46.45,45.78,45.35,44.03,44.18,44.22,44.57,43.42,42.66,43.13]
+		self.high = [price + 0.5 + (i % 3) * 0.1 for i, price in enumerate(self.prices)]
+		self.low = [price - 0.5 for price in self.prices]
+
+	def make_streams(self):
+		return {
+			('AAA', 'ema'): (ExponentialMovingAverageStream(5), (self.prices,)),
+			('AAA', 'macd'): (MovingAverageConvergenceDivergenceStream(3, 6, 4), (self.prices,)),
+			('AAA', 'rsi'): (RelativeStrengthIndexStream(14), (self.prices,)),
+			('AAA', 'kst'): (KnowSureThingOscillatorStream(2, 3, 4, 5, 2, 2, 2, 3, signal_period=3), (self.prices,)),
+			('BBB', 'adx'): (AverageDirectionalIndexStream(5), (self.prices, self.high, self.low)),
+		}
+
+	def test_get_state(self):
+		for key, (stream, series) in self.make_streams().items():
+			stream.run(*[values[:20] for values in series])
+			restored = snapshot.restore(snapshot.get_state(stream))
+			self.assertIsNot(stream, restored)
+			self.assertEqual(stream.run(*[values[20:] for values in series]), restored.run(*[values[20:] for values in series]))
+
+	def test_dumps(self):
+		streams = self.make_streams()
+		for stream, series in streams.values():
+			stream.run(*[values[:20] for values in series])
+
+		restored = snapshot.loads(snapshot.dumps({key: stream for key, (stream, series) in streams.items()}))
+		self.assertEqual(set(streams), set(restored))
+		for key, (stream, series) in streams.items():
+			self.assertEqual(stream.run(*[values[20:] for values in series]), restored[key].run(*[values[20:] for values in series]))
+
+	def test_shared_stream(self):
+		atr = AverageTrueRangeStream(5)
+		keltner = KeltnerChannelStream('EMA', 5, atr=atr)
+		for bar in zip(self.prices[:20], self.high[:20], self.low[:20]):
+			atr.update(*bar)
+			keltner.update(*bar)
+
+		restored = snapshot.loads(snapshot.dumps({'atr': atr, 'keltner': keltner}))
+		self.assertIs(restored['atr'], restored['keltner'].atr)
+		for bar in zip(self.prices[20:], self.high[20:], self.low[20:]):
+			atr.update(*bar)
+			restored['atr'].update(*bar)
+			self.assertEqual(keltner.update(*bar), restored['keltner'].update(*bar))
+
+	def test_save_load(self):
+		stream = RelativeStrengthIndexStream(14)
+		stream.run(self.prices)
+		with tempfile.TemporaryDirectory() as directory:
+			path = os.path.join(directory, 'state.bin')
+			snapshot.save({'rsi': stream}, path)
+			self.assertEqual(stream.window.column(), snapshot.load(path)['rsi'].window.column())
+			self.assertEqual(['state.bin'], os.listdir(directory))
+
+	def test_store(self):
+		specs = [("ExponentialMovingAverage", {"period": 5}), ("RelativeStrengthIndex", {"period": 5}), ("BollingerBands", {"period": 5}), ("AverageDirectionalIndex", {"period": 5}), ("Williams", {"period": 5})]
+		bars = [{'close': np.array([price, price * 2, price + 1]), 'high': np.array([high, high * 2, high + 1]), 'low': np.array([low, low * 2, low + 1])} for price, high, low in zip(self.prices, self.high, self.low)]
+
+		store = IndicatorStore(['AAA', 'BBB', 'CCC'], specs)
+		for bar in bars[:20]:
+			store.update(bar)
+
+		with tempfile.TemporaryDirectory() as directory:
+			path = os.path.join(directory, 'store.bin')
+			snapshot.save(store, path)
+			restored = snapshot.load(path)
+
+		self.assertIsInstance(restored, IndicatorStore)
+		self.assertEqual(store.symbols, restored.symbols)
+		self.assertEqual(store.names, restored.names)
+		for bar in bars[20:]:
+			expected, values = store.update(bar), restored.update(bar)
+			for name in store.names:
+				self.assertEqual(np.asarray(expected[name]).tobytes(), np.asarray(values[name]).tobytes())
+
+	def test_version(self):
+		data = snapshot.dumps({'ema': ExponentialMovingAverageStream(5)})
+		self.assertRaises(Exception, snapshot.loads, data[:4] + bytes([snapshot.STATE_VERSION + 1]) + data[5:])
+		self.assertRaises(Exception, snapshot.loads, b'not a snapshot')
+		self.assertRaises(Exception, snapshot.restore, (snapshot.STATE_VERSION + 1, None))
+		self.assertEqual(5, snapshot.loads(data[:4] + bytes([1]) + data[5:])['ema'].period)
@@ -0,0 +1,116 @@
+from unittest import TestCase
+import random
+import numpy as np
+from ..indicators.store import IndicatorStore, SimpleMovingAverageState, StochasticOscillatorState, StreamState
+from ..indicators.base import get_input_names
+from ..indicators.spec import get_default_indicator, get_spec_name, INPUTS
+
+class IndicatorStoreTest(TestCase):
+
+	def setUp(self):
+		rng = random.Random(7)
+		self.symbols = ['AAA', 'BBB', 'CCC']
+		self.bars = []
+		for i in range(40):
+			close = np.round(np.asarray([50 + rng.gauss(0, 2) for symbol in self.symbols]), 2)
+			self.bars.append({
+				'close': close,
+				'high': np.round(close + np.asarray([abs(rng.gauss(0, 1)) for symbol in self.symbols]), 2),
+				'low': np.round(close - np.asarray([abs(rng.gauss(0, 1)) for symbol in self.symbols]), 2),
+				'volume': np.asarray([float(rng.randint(1000, 5000)) for symbol in self.symbols]),
+			})
+		self.specs = [
+			("SimpleMovingAverage", {"period": 5}),
+			("WeightedMovingAverage", {"period": 4}),
+			("ExponentialMovingAverage", {"period": 5}),
+			("MovingAverageConvergenceDivergence", {"f_ema_period": 3, "s_ema_period": 6, "signal_period": 4}),
+			("RelativeStrengthIndex", {"period": 14}),
+			("AverageTrueRange", {"period": 5, "ma_type": "EMA"}),
+			"OnBalanceVolume",
+			("StochasticOscillator", {"k_period": 5}),
+			("AverageDirectionalIndex", {"period": 5}),
+			("StandardDeviation", {"period": 6}),
+			("BollingerBands", {"period": 5, "ma_type": "EMA"}),
+			("Williams", {"period": 5}),
+		]
+
+	def expected(self, spec, s):
+		indicator = get_default_indicator(spec)
+		series = [[float(bar[INPUTS[name]][s]) for bar in self.bars] for name in get_input_names(type(indicator))]
+
+		return indicator.get_stream().run(*series)
+
+	def test_update(self):
+		store = IndicatorStore(self.symbols, self.specs)
+		results = [store.update(bar) for bar in self.bars]
+
+		for spec in self.specs:
+			name = get_spec_name(spec)
+			for s in range(len(self.symbols)):
+				expected = self.expected(spec, s)
+				if isinstance(expected, tuple):
+					self.assertEqual([list(output) for output in expected], [[result[name][k][s] for result in results] for k in range(len(expected))])
+				else:
+					self.assertEqual(expected, [result[name][s] for result in results])
+
+	def test_states(self):
+		store = IndicatorStore(self.symbols, self.specs)
+		self.assertIsInstance(store.states[0], SimpleMovingAverageState)
+		self.assertIsInstance(store.states[7], StochasticOscillatorState)
+		self.assertIsInstance(store.states[-1], StreamState)
+		self.assertEqual(['SimpleMovingAverage(period=5)', 'OnBalanceVolume'], [store.names[0], store.names[6]])
+
+	def test_getitem_reset(self):
+		store = IndicatorStore(self.symbols, self.specs[:1])
+		for bar in self.bars[:5]:
+			store.update(bar)
+		value = store['SimpleMovingAverage(period=5)'].tolist()
+		self.assertEqual(np.mean([bar['close'] for bar in self.bars[:5]], axis=0).round(2).tolist(), value)
+
+		store.reset()
+		self.assertIsNone(store['SimpleMovingAverage(period=5)'])
+
+	def test_validate(self):
+		store = IndicatorStore(self.symbols, self.specs)
+		self.assertRaises(Exception, store.update, {'close': self.bars[0]['close']})
+		self.assertRaises(Exception, store.update, dict(self.bars[0], close=[1.0, 2.0]))
+		self.assertRaises(Exception, IndicatorStore, self.symbols, ["OnBalanceVolume", "OnBalanceVolume"])
+
+	def test_flat_stochastic(self):
+		spec = ("StochasticOscillator", {"k_period": 3, "d_period": 2})
+		for bar in self.bars:
+			bar['high'][1] = bar['low'][1] = bar['close'][1] = 10.0
+		store = IndicatorStore(self.symbols, [spec])
+		results = [store.update(bar)['StochasticOscillator(k_period=3, d_period=2)'] for bar in self.bars]
+
+		for s in (0, 2):
+			expected = self.expected(spec, s)
+			self.assertEqual([list(output) for output in expected], [[result[k][s] for result in results] for k in range(2)])
+		self.assertEqual([0.0] * len(self.bars), [result[0][1] for result in results])
+		self.assertEqual([0.0] * len(self.bars), [result[1][1] for result in results])
+
+	def test_update_all_or_nothing(self):
+		specs = [("RelativeStrengthIndex", {"period": 5}), ("Williams", {"period": 3}), "OnBalanceVolume", ("CommodityChannelIndex", {"period": 3})]
+		store = IndicatorStore(self.symbols, specs)
+		expected = IndicatorStore(self.symbols, specs)
+		for bar in self.bars[:10]:
+			store.update(bar)
+			expected.update(bar)
+
+		for bar in self.bars[10:13]:
+			flat = {key: values.copy() for key, values in bar.items()}
+			for key in ('close', 'high', 'low'):
+				flat[key][2] = 10.0
+			try:
+				store.update(flat)
+				expected.update(flat)
+			except ZeroDivisionError:
+				break
+		else:
+			self.fail("the flat window did not raise")
+
+		for bar in self.bars[13:]:
+			result = store.update(bar)
+			reference = expected.update(bar)
+			for name in reference:
+				self.assertEqual(np.asarray(reference[name]).tolist(), np.asarray(result[name]).tolist())
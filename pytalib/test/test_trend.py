@@ -1,4 +1,7 @@
 from unittest import TestCase
+import gc
+import tracemalloc
+from ..indicators.base import RingBuffer
 from ..indicators.trend import *
 
 class MovingAverageConvergenceDivergenceTest(TestCase):
@@ -263,3 +266,210 @@ class VortexIndicatorTest(TestCase):
 		
 		self.assertEqual((pos_vi, neg_vi), self.indicator.calculate())
 
+
+class VortexIndicatorStreamTest(TestCase):
+
+	def setUp(self):
+		self.prices = [5,4,3,2,1,3,4,5,6,7]
+		self.high = [5,7,4,2,2,3,5,7,7,7]
+		self.low =  [4,3,3,2,1,1,3,5,5,6]
+
+	def test_run(self):
+		pos_vi = [0.0, 0.0, 0.8, 0.83, 0.67, 0.75, 1.2, 1.43, 1.43, 1.33]
+		neg_vi = [0.0, 0.0, 1.2, 1.33, 2.33, 1.0, 0.4, 0.14, 0.29, 0.5]
+
+		self.assertEqual((pos_vi, neg_vi), VortexIndicatorStream(3).run(self.prices, self.high, self.low))
+
+	def test_update(self):
+		stream = VortexIndicatorStream(3)
+		for i in range(len(self.prices)):
+			value = stream.update(self.prices[i], self.high[i], self.low[i])
+
+		self.assertEqual((1.33, 0.5), value)
+
+	def test_matches_period_sums(self):
+		prices = [23.89,23.95,23.67,23.78,23.50,23.32,23.75,23.79,24.14,23.81,23.78,23.86,23.70,24.96,24.88,24.96,25.18,25.07,25.27,25.00]
+		high = [24.20,24.07,24.04,23.87,23.67,23.59,23.80,23.80,24.30,24.15,24.05,24.06,23.88,25.14,25.20,25.07,25.22,25.37,25.36,25.26]
+		low = [23.85,23.72,23.64,23.37,23.46,23.18,23.40,23.57,24.05,23.77,23.60,23.84,23.64,23.94,24.74,24.77,24.90,24.93,24.96,24.93]
+		indicator = VortexIndicator(prices, high, low, 4)
+		period_tr = indicator.get_period_tr()
+		period_pos_vm = indicator.get_period_pos_vm()
+		expected = [0.00 if i < 3 else round(period_pos_vm[i] / period_tr[i], 2) for i in range(len(prices))]
+
+		self.assertEqual(expected, VortexIndicatorStream(4).run(prices, high, low)[0])
+
+class AverageDirectionalIndexStreamTest(TestCase):
+
+	def setUp(self):
+		self.prices = [5,4,3,2,1,3,4,5,6,7]
+		self.high = [5,7,4,2,2,3,5,7,7,7]
+		self.low =  [4,3,3,2,1,1,3,5,5,6]
+
+	def test_run(self):
+		expected = [0, 0, 0, 33.36, 4.0, 16.35, 44.57, 64.49, 70.78, 73.75]
+		self.assertEqual(expected, AverageDirectionalIndexStream(3).run(self.prices, self.high, self.low))
+
+	def test_run_with_di(self):
+		indicator = AverageDirectionalIndex(self.prices, self.high, self.low, 3)
+		expected = (indicator.get_adx(), indicator.get_pos_period_di(), indicator.get_neg_period_di())
+
+		self.assertEqual(expected, AverageDirectionalIndexStream(3, with_di=True).run(self.prices, self.high, self.low))
+
+	def test_update(self):
+		stream = AverageDirectionalIndexStream(3)
+		for i in range(len(self.prices)):
+			value = stream.update(self.prices[i], self.high[i], self.low[i])
+
+		self.assertEqual(73.75, value)
+
+class MovingAverageStreamTest(TestCase):
+
+	def setUp(self):
+		self.prices = [25000,9000,7000,8000,6000,12000,9000,4000,7000,3000,5000,8000,7800,5000]
+
+	def test_sma(self):
+		self.assertEqual(SimpleMovingAverage(self.prices, 3).calculate(), SimpleMovingAverageStream(3).run(self.prices))
+
+	def test_wma(self):
+		self.assertEqual(WeightedMovingAverage(self.prices, 4).calculate(), WeightedMovingAverageStream(4).run(self.prices))
+
+	def test_ema(self):
+		self.assertEqual(ExponentialMovingAverage(self.prices, 5).calculate(), ExponentialMovingAverageStream(5).run(self.prices))
+
+	def test_get_ma_stream(self):
+		self.assertIsInstance(get_ma_stream(5, 'EMA'), ExponentialMovingAverageStream)
+		self.assertIsInstance(get_ma_stream(5, 'WMA'), WeightedMovingAverageStream)
+		self.assertIsInstance(get_ma_stream(5), SimpleMovingAverageStream)
+
+class StreamMemoryTest(TestCase):
+
+	def test_ring_buffer(self):
+		window = RingBuffer(3, 2)
+		for i in range(10):
+			evicted = window.append(i, -i)
+		self.assertEqual((6.0, -6.0), evicted)
+		self.assertEqual([7.0, 8.0, 9.0], window.column())
+		self.assertEqual([-8.0, -9.0], window.tail(2, 1))
+		self.assertEqual(6, len(window.data))
+
+	def test_slots(self):
+		streams = [SimpleMovingAverageStream(5), WeightedMovingAverageStream(5), ExponentialMovingAverageStream(5), MovingAverageConvergenceDivergenceStream(3, 6, 4)
+			, TrixStream(4), AverageDirectionalIndexStream(5), CommodityChannelIndexStream(5), DetrendedPriceOscillatorStream(4), MassIndexStream(8, 4), VortexIndicatorStream(5)]
+		for stream in streams:
+			self.assertFalse(hasattr(stream, '__dict__'))
+			self.assertRaises(AttributeError, setattr, stream, 'history', [])
+
+	def test_constant_memory(self):
+		bars = [(50 + (i * 7 % 11) / 10, 50.5 + (i * 7 % 11) / 10, 49.5 + (i * 7 % 11) / 10) for i in range(2000)]
+		streams = [(SimpleMovingAverageStream(5), 1), (WeightedMovingAverageStream(5), 1), (ExponentialMovingAverageStream(5), 1), (MovingAverageConvergenceDivergenceStream(3, 6, 4), 1)
+			, (TrixStream(4), 1), (AverageDirectionalIndexStream(5), 3), (CommodityChannelIndexStream(5), 3), (DetrendedPriceOscillatorStream(4), 1), (MassIndexStream(8, 4), 3), (VortexIndicatorStream(5), 3)]
+		for stream, width in streams:
+			for bar in bars[:1000]:
+				stream.update(*bar[:width])
+
+			gc.collect()
+			tracemalloc.start()
+			try:
+				before = tracemalloc.get_traced_memory()[0]
+				for bar in bars:
+					stream.update(*bar[:width])
+				gc.collect()
+				growth = tracemalloc.get_traced_memory()[0] - before
+			finally:
+				tracemalloc.stop()
+
+			self.assertLess(growth, 1024, type(stream).__name__)
+
+class TrendExtendTest(TestCase):
+
+	def setUp(self):
+		self.prices = [44.34,44.09,44.15,43.61,44.33,44.83,45.10,45.42,45.84,46.08,45.89,46.03,45.61,46.28,46.28,46.00,46.03,46.41,46.22,45.64,46.21,46.25,45.71,46.45,45.78,45.35,44.03,44.18,44.22,44.57,43.42,42.66,43.13]
+		self.high = [price + 0.5 + (i % 3) * 0.1 for i, price in enumerate(self.prices)]
+		self.low = [price - 0.5 for price in self.prices]
+
+	def test_extend(self):
+		indicators = [
+			(MovingAverageConvergenceDivergence, (self.prices,), {'f_ema_period': 3, 's_ema_period': 6, 'signal_period': 4}),
+			(ExponentialMovingAverage, (self.prices,), {'period': 5}),
+			(Trix, (self.prices,), {'period': 4}),
+			(AverageDirectionalIndex, (self.prices, self.high, self.low), {'period': 5}),
+			(CommodityChannelIndex, (self.prices, self.high, self.low), {'period': 5}),
+			(DetrendedPriceOscillator, (self.prices,), {'period': 6}),
+			(MassIndex, (self.prices, self.high, self.low), {'mi_period': 8, 'ema_period': 4}),
+		]
+		for cls, series, params in indicators:
+			expected = cls(*series, **params).calculate()
+			self.assertEqual(expected, cls(*series, **params).get_stream().run(*series))
+
+			indicator = cls(*[values[:20] for values in series], **params)
+			indicator.calculate()
+			for i in range(20, len(self.prices)):
+				result = indicator.extend(*[values[i:i + 1] for values in series])
+			self.assertEqual(expected, result)
+
+	def test_extend_in_place(self):
+		prices = self.prices[:20]
+		indicator = ExponentialMovingAverage(prices, 5)
+		indicator.calculate()
+		first = indicator.extend(self.prices[20:21])
+		second = indicator.extend(self.prices[21:22])
+
+		self.assertIs(first, second)
+		self.assertEqual(20, len(prices))
+		self.assertEqual(ExponentialMovingAverage(self.prices[:22], 5).calculate(), second)
+
+	def test_extend_arguments(self):
+		indicator = AverageDirectionalIndex(self.prices, self.high, self.low, 5)
+		self.assertRaises(Exception, indicator.extend, [1.0])
+		self.assertRaises(Exception, indicator.extend, [1.0], [1.0, 2.0], [1.0])
+
+class TrendLookbackTest(TestCase):
+
+	def test_lookback(self):
+		self.assertEqual(19, SimpleMovingAverage([]).lookback)
+		self.assertEqual(33, MovingAverageConvergenceDivergence([]).lookback)
+		self.assertEqual(27, AverageDirectionalIndex([], [], []).lookback)
+		self.assertEqual(30, DetrendedPriceOscillator([], period=20).lookback)
+		self.assertFalse(SimpleMovingAverage([]).recursive)
+		self.assertTrue(ExponentialMovingAverage([]).recursive)
+		self.assertTrue(MovingAverageConvergenceDivergence([]).recursive)
+
+	def test_window_outputs(self):
+		prices = [25000,9000,7000,8000,6000,12000,9000,4000,7000,3000,5000,8000,7800,5000]
+		for cls, params in [(SimpleMovingAverage, {'period': 4}), (DetrendedPriceOscillator, {'period': 4})]:
+			expected = cls(prices, **params).calculate()
+			lookback = cls(prices, **params).lookback
+			for i in range(lookback, len(prices)):
+				self.assertEqual(expected[i], cls(prices[i - lookback : i + 1], **params).calculate()[-1])
+
+	def test_tail_recursive(self):
+		prices = [44.34,44.09,44.15,43.61,44.33,44.83,45.10,45.42,45.84,46.08,45.89,46.03,45.61,46.28,46.28,46.00,46.03,46.41,46.22,45.64,46.21,46.25,45.71,46.45,45.78,45.35,44.03,44.18,44.22,44.57,43.42,42.66,43.13]
+		high = [price + 0.5 + (i % 3) * 0.1 for i, price in enumerate(prices)]
+		low = [price - 0.5 for price in prices]
+		expected = AverageDirectionalIndex(prices, high, low, 5).calculate()
+
+		indicator = AverageDirectionalIndex(prices[:-1], high[:-1], low[:-1], 5)
+		self.assertEqual(expected[-4:-1], indicator.tail(3))
+		indicator.extend(prices[-1:], high[-1:], low[-1:])
+		self.assertEqual(expected[-1], indicator.latest())
+
+		macd, signal = MovingAverageConvergenceDivergence(prices, 3, 6, 4).calculate()
+		self.assertEqual((macd[-1], signal[-1]), MovingAverageConvergenceDivergence(prices, 3, 6, 4).latest())
+
+	def test_correct(self):
+		prices = [44.34,44.09,44.15,43.61,44.33,44.83,45.10,45.42,45.84,46.08,45.89,46.03,45.61,46.28,46.28,46.00,46.03,46.41,46.22,45.64,46.21,46.25,45.71,46.45,45.78,45.35,44.03,44.18,44.22,44.57,43.42,42.66,43.13]
+		high = [price + 0.5 + (i % 3) * 0.1 for i, price in enumerate(prices)]
+		low = [price - 0.5 for price in prices]
+		corrected = prices[:25] + [45.50, 45.10] + prices[27:]
+
+		indicator = AverageDirectionalIndex(prices, high, low, 5)
+		indicator.checkpoint_interval = 8
+		original = list(indicator.calculate())
+		result = indicator.correct(25, corrected[25:], high[25:], low[25:])
+		self.assertEqual(AverageDirectionalIndex(corrected, high, low, 5).calculate(), result)
+		self.assertEqual(original[:25], result[:25])
+		self.assertEqual([8, 16, 24, 32], sorted(indicator.checkpoints))
+
+		self.assertEqual(AverageDirectionalIndex(prices, high, low, 5).calculate(), indicator.correct(25, prices[25:], high[25:], low[25:]))
+		self.assertRaises(Exception, indicator.correct, 40, [1.0], [1.0], [1.0])
+		self.assertRaises(Exception, indicator.correct, 25, [1.0])
@@ -0,0 +1,100 @@
+from unittest import TestCase
+import random
+import numpy as np
+from ..indicators import vectorized
+from ..indicators.trend import SimpleMovingAverage, SimpleMovingAverageStream, WeightedMovingAverage, ExponentialMovingAverage
+from ..indicators.momentum import RelativeStrengthIndex, MoneyFlowIndex, UltimateOscillator
+from ..indicators.volatility import BollingerBands
+
+class VectorizedParityTest(TestCase):
+
+	def setUp(self):
+		self.prices = [44.34,44.09,44.15,43.61,44.33,44.83,45.10,45.42,45.84,46.08,45.89,46.03,45.61,46.28,46.28,46.00,46.03,46.41,46.22,45.64,46.21,46.25,45.71,46.45,45.78,45.35,44.03,44.18,44.22,44.57,43.42,42.66,43.13]
+		self.high = [price + 0.5 for price in self.prices]
+		self.low = [price - 0.4 for price in self.prices]
+		self.volume = [1000 + 37 * i for i in range(len(self.prices))]
+
+	def test_moving_averages(self):
+		self.assertEqual(SimpleMovingAverage(self.prices, 5).calculate(), vectorized.simple_moving_average(self.prices, 5).tolist())
+		self.assertEqual(WeightedMovingAverage(self.prices, 5).calculate(), vectorized.weighted_moving_average(self.prices, 5).tolist())
+		self.assertEqual(ExponentialMovingAverage(self.prices, 5).calculate(), vectorized.exponential_moving_average(self.prices, 5).tolist())
+
+	def test_relative_strength_index(self):
+		self.assertEqual(RelativeStrengthIndex(self.prices, 14).calculate(), vectorized.relative_strength_index(self.prices, 14).tolist())
+
+	def test_bollinger_bands(self):
+		expected = BollingerBands(self.prices, 10).calculate()
+		result = vectorized.bollinger_bands(self.prices, 10)
+
+		self.assertEqual(expected, tuple(band.tolist() for band in result))
+
+	def test_money_flow_index(self):
+		expected = MoneyFlowIndex(self.prices, self.high, self.low, self.volume, 5).calculate()
+		self.assertEqual(expected, vectorized.money_flow_index(self.prices, self.high, self.low, self.volume, 5).tolist())
+
+	def test_ultimate_oscillator(self):
+		expected = UltimateOscillator(self.prices, self.high, self.low, 3, 5, 7).calculate()
+		self.assertEqual(expected, vectorized.ultimate_oscillator(self.prices, self.high, self.low, 3, 5, 7).tolist())
+
+	def test_large_values(self):
+		rng = random.Random(3)
+		values = [round(rng.uniform(-1e9, 1e9), 2) for i in range(2000)]
+		for period in (3, 4, 7):
+			expected = [0] * (period - 1) + [round(sum(values[i + 1 - period : i + 1]) / period, 2) for i in range(period - 1, len(values))]
+			self.assertEqual(expected, vectorized.simple_moving_average(values, period).tolist())
+			self.assertEqual(expected, SimpleMovingAverageStream(period).run(values))
+			self.assertEqual([sum(values[i : i + period]) for i in range(len(values) - period + 1)], vectorized.rolling_sum(values, period).tolist())
+
+	def test_round_exact(self):
+		values = [0.125, 0.135, -0.005, -0.004, 2.675, 1.005, 52490.015, 1e300, float('inf')]
+		self.assertEqual([repr(round(value, 2)) for value in values], [repr(value) for value in vectorized.round_exact(values).tolist()])
+		self.assertEqual([round(value, 2) for value in values[:7]], vectorized.round_ties(np.asarray(values[:7])).tolist())
+		self.assertEqual(vectorized.near_tie(np.asarray(values)).tolist(), [vectorized.is_near_tie(value) for value in values])
+		self.assertTrue(vectorized.is_near_tie(0.1250001, 2, 1e-7))
+		self.assertFalse(vectorized.is_near_tie(0.1250001))
+
+class Float32Test(TestCase):
+
+	def setUp(self):
+		rng = random.Random(0)
+		price = 100.0
+		self.prices = []
+		for i in range(50000):
+			price = max(1.0, price + rng.gauss(0, 1))
+			self.prices.append(round(price, 2))
+		self.high = [round(price + abs(rng.gauss(0, 1)), 2) for price in self.prices]
+		self.low = [round(price - abs(rng.gauss(0, 1)), 2) for price in self.prices]
+		self.volume = [float(rng.randint(1000, 100000)) for price in self.prices]
+		self.prices32, self.high32, self.low32, self.volume32 = [np.asarray(values, dtype=np.float32) for values in (self.prices, self.high, self.low, self.volume)]
+
+	def assertWithinBound(self, expected, result, steps=1):
+		"""
+		float32 inputs may move a value across a rounding tie, so every rounding to cents on the way to
+		an output may be off by one step, on top of the cast of the output to float32
+		"""
+		self.assertEqual(np.float32, result.dtype)
+		error = np.abs(result.astype(np.float64) - expected)
+		self.assertTrue(np.all(error <= steps * 0.01 + 2 * np.abs(expected) * vectorized.FLOAT32_RELATIVE_ERROR))
+
+	def test_moving_averages(self):
+		for ma_type in ('SMA', 'WMA', 'EMA'):
+			expected = vectorized.moving_average(self.prices, 20, ma_type)
+			self.assertWithinBound(expected, vectorized.moving_average(self.prices32, 20, ma_type, dtype=np.float32))
+
+	def test_relative_strength_index(self):
+		expected = vectorized.relative_strength_index(self.prices, 14)
+		self.assertWithinBound(expected, vectorized.relative_strength_index(self.prices32, 14, dtype=np.float32))
+
+	def test_bollinger_bands(self):
+		expected = vectorized.bollinger_bands(self.prices, 20)
+		result = vectorized.bollinger_bands(self.prices32, 20, dtype=np.float32)
+		for i, steps in enumerate((2, 1, 2)):
+			self.assertWithinBound(expected[i], result[i], steps)
+
+	def test_money_flow_index(self):
+		expected = vectorized.money_flow_index(self.prices, self.high, self.low, self.volume, 14)
+		self.assertWithinBound(expected, vectorized.money_flow_index(self.prices32, self.high32, self.low32, self.volume32, 14, dtype=np.float32))
+
+	def test_ultimate_oscillator(self):
+		expected = vectorized.ultimate_oscillator(self.prices, self.high, self.low)
+		self.assertWithinBound(expected, vectorized.ultimate_oscillator(self.prices32, self.high32, self.low32, dtype=np.float32))
@@ -0,0 +1,79 @@
+from unittest import TestCase
+from ..indicators.volatility import *
+
+class AverageTrueRangeTest(TestCase):
+
+	def setUp(self):
+		self.prices = [5,4,3,2,1,3,4,5,6,7]
+		self.high = [5,7,4,2,2,3,5,7,7,7]
+		self.low =  [4,3,3,2,1,1,3,5,5,6]
+
+	def test_calculate(self):
+		indicator = AverageTrueRange(self.prices, self.high, self.low, 3)
+		expected = [0, 0, 1.67, 2.0, 1.0, 1.33, 1.67, 2.33, 2.33, 2.0]
+
+		self.assertEqual(expected, indicator.calculate())
+
+	def test_stream_update(self):
+		stream = AverageTrueRangeStream(3)
+		for i in range(len(self.prices)):
+			value = stream.update(self.prices[i], self.high[i], self.low[i])
+
+		self.assertEqual(2.0, value)
+
+class KeltnerChannelTest(TestCase):
+
+	def setUp(self):
+		self.prices = [5,4,3,2,1,3,4,5,6,7]
+		self.high = [5,7,4,2,2,3,5,7,7,7]
+		self.low =  [4,3,3,2,1,1,3,5,5,6]
+
+	def test_calculate(self):
+		indicator = KeltnerChannel(self.prices, self.high, self.low, 'SMA', 3, 3, 1)
+		kc_up = [0, 0, 5.67, 5.0, 3.0, 3.33, 4.34, 6.33, 7.33, 8.0]
+		ma = [0, 0, 4.0, 3.0, 2.0, 2.0, 2.67, 4.0, 5.0, 6.0]
+		kc_down = [0, 0, 2.33, 1.0, 1.0, 0.67, 1.0, 1.67, 2.67, 4.0]
+
+		self.assertEqual((kc_up, ma, kc_down), indicator.calculate())
+		self.assertEqual(AverageTrueRange(self.prices, self.high, self.low, 3).calculate(), indicator.get_atr())
+
+	def test_validate(self):
+		indicator = KeltnerChannel(self.prices, self.high, self.low, 'SMA', 20, 3, 1)
+		self.assertRaises(Exception, indicator.calculate)
+
+	def test_stream_shared_atr(self):
+		atr = AverageTrueRangeStream(3)
+		keltner = KeltnerChannelStream('SMA', 3, 3, 1, atr=atr)
+		for i in range(len(self.prices)):
+			atr.update(self.prices[i], self.high[i], self.low[i])
+			value = keltner.update(self.prices[i], self.high[i], self.low[i])
+
+		self.assertEqual(2.0, atr.value)
+		self.assertEqual((8.0, 6.0, 4.0), value)
+		self.assertEqual(3, keltner.atr_period)
+
+		self.assertRaises(Exception, KeltnerChannelStream, 'SMA', 3, 5, 1, atr=atr)
+		self.assertRaises(Exception, KeltnerChannelStream, 'SMA', 3, 3, 1, 'EMA', atr=atr)
+		self.assertEqual(3, KeltnerChannelStream('SMA', 3, atr=atr).atr_period)
+
+class VolatilityExtendTest(TestCase):
+
+	def setUp(self):
+		self.prices = [5,4,3,2,1,3,4,5,6,7,6,5,6,8,9]
+		self.high = [5,7,4,2,2,3,5,7,7,7,7,6,7,9,9]
+		self.low =  [4,3,3,2,1,1,3,5,5,6,5,4,5,6,8]
+
+	def test_extend(self):
+		indicators = [
+			(AverageTrueRange, (self.prices, self.high, self.low), {'period': 3, 'ma_type': 'EMA'}),
+			(BollingerBands, (self.prices,), {'period': 4}),
+			(PriceChannel, (self.prices, self.high, self.low), {'period': 4}),
+			(KeltnerChannel, (self.prices, self.high, self.low), {'ma_type': 'SMA', 'ma_period': 3, 'atr_period': 3, 'num_atr': 1}),
+		]
+		for cls, series, params in indicators:
+			expected = cls(*series, **params).calculate()
+			self.assertEqual(expected, cls(*series, **params).get_stream().run(*series))
+
+			indicator = cls(*[values[:6] for values in series], **params)
+			indicator.calculate()
+			self.assertEqual(expected, indicator.extend(*[values[6:] for values in series]))
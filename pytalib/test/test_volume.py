@@ -0,0 +1,167 @@
+from unittest import TestCase
+from ..indicators.volume import *
+
+class AccumulationDistributionLineTest(TestCase):
+
+	def setUp(self):
+		self.prices = [5,4,3,2,1,3,4,5,6,7]
+		self.high = [5,7,4,2,2,3,5,7,7,7]
+		self.low =  [4,3,3,2,1,1,3,5,5,6]
+		self.volume = [100,200,150,300,250,100,400,350,200,150]
+
+	def test_get_mf_multiplier(self):
+		indicator = AccumulationDistributionLine(self.prices, self.high, self.low, self.volume)
+		expected = [1.0, -0.5, -1.0, 1.0, -1.0, 1.0, 0.0, -1.0, 0.0, 1.0]
+
+		self.assertEqual(expected, indicator.get_mf_multiplier())
+
+	def test_calculate(self):
+		indicator = AccumulationDistributionLine(self.prices, self.high, self.low, self.volume)
+		expected = [100.0, 0.0, -150.0, 150.0, -100.0, 0.0, 0.0, -350.0, -350.0, -200.0]
+
+		self.assertEqual(expected, indicator.calculate())
+
+	def test_stream(self):
+		expected = [100.0, 0.0, -150.0, 150.0, -100.0, 0.0, 0.0, -350.0, -350.0, -200.0]
+
+		self.assertEqual(expected, AccumulationDistributionLineStream().run(self.prices, self.high, self.low, self.volume))
+
+	def test_flat_bars(self):
+		prices, high, low, volume = [2, 3, 2, 5, 5], [3, 3, 4, 6, 5], [1, 3, 1, 1, 5], [100] * 5
+		indicator = AccumulationDistributionLine(prices, high, low, volume)
+		expected = [0.0, 60.0, 27.0, 87.0, 147.0]
+
+		self.assertEqual(expected, indicator.calculate())
+		self.assertEqual(expected, AccumulationDistributionLine(prices, high, low, volume).calculate(backend='python'))
+		self.assertEqual(expected, indicator.get_stream().run(prices, high, low, volume))
+		self.assertEqual([0.0, 0.0, -33.0, 27.0, 87.0], AccumulationDistributionLineStream().run(prices, high, low, volume))
+
+		flat = ([2, 2], [3, 3], [3, 3], [100, 100])
+		self.assertEqual([float("-inf")] * 2, AccumulationDistributionLine(*flat).calculate())
+		self.assertEqual([float("-inf")] * 2, AccumulationDistributionLine(*flat).get_stream().run(*flat))
+
+class EaseOfMovementTest(TestCase):
+
+	def setUp(self):
+		self.prices = [5,4,3,2,1,3,4,5,6,7]
+		self.high = [5,7,4,2,2,3,5,7,7,7]
+		self.low =  [4,3,3,2,1,1,3,5,5,6]
+		self.volume = [100000000,200000000,150000000,300000000,250000000,100000000,400000000,350000000,200000000,150000000]
+
+	def test_get_box_ratio(self):
+		indicator = EaseOfMovement(self.prices, self.high, self.low, self.volume, 3)
+		expected = [1.0, 0.5, 1.5, 2.5, 2.5, 0.5, 2.0, 1.75, 1.0, 1.5]
+
+		self.assertEqual(expected, indicator.get_box_ratio())
+
+	def test_get_emv(self):
+		indicator = EaseOfMovement(self.prices, self.high, self.low, self.volume, 3)
+		expected = [0.0, 1.0, -1.0, -0.6, -0.2, 1.0, 1.0, 1.14, 0.0, 0.33]
+
+		self.assertEqual(expected, indicator.get_emv())
+
+	def test_calculate(self):
+		indicator = EaseOfMovement(self.prices, self.high, self.low, self.volume, 3)
+		expected = [0, 0, 0.0, -0.2, -0.6, 0.07, 0.6, 1.05, 0.71, 0.49]
+
+		self.assertEqual(expected, indicator.calculate())
+
+class OnBalanceVolumeTest(TestCase):
+
+	def setUp(self):
+		self.prices = [5,4,3,2,1,3,4,5,6,7]
+		self.volume = [100,200,150,300,250,100,400,350,200,150]
+
+	def test_calculate(self):
+		expected = [0.0, -200.0, -350.0, -650.0, -900.0, -800.0, -400.0, -50.0, 150.0, 300.0]
+		self.assertEqual(expected, OnBalanceVolume(self.prices, self.volume).calculate())
+
+	def test_stream_update(self):
+		stream = OnBalanceVolumeStream()
+		for i in range(len(self.prices)):
+			value = stream.update(self.prices[i], self.volume[i])
+
+		self.assertEqual(300.0, value)
+
+class NegativeVolumeIndexTest(TestCase):
+
+	def setUp(self):
+		self.prices = [5,4,3,2,1,3,4,5,6,7]
+		self.volume = [100,200,150,300,250,100,400,350,200,150]
+
+	def test_calculate(self):
+		nvi = [1000.0, 1000.0, 999.75, 999.75, 999.25, 1001.25, 1001.25, 1001.5, 1001.7, 1001.87]
+		signal = [1000.0, 1000.0, 999.88, 999.82, 999.54, 1000.39, 1000.82, 1001.16, 1001.43, 1001.65]
+
+		self.assertEqual((nvi, signal), NegativeVolumeIndex(self.prices, self.volume, 3).calculate())
+
+	def test_stream_without_signal(self):
+		expected = [1000.0, 1000.0, 999.75, 999.75, 999.25, 1001.25, 1001.25, 1001.5, 1001.7, 1001.87]
+		self.assertEqual(expected, NegativeVolumeIndexStream(None).run(self.prices, self.volume))
+
+class ForceIndexTest(TestCase):
+
+	def setUp(self):
+		self.prices = [5,4,3,2,1,3,4,5,6,7]
+		self.volume = [100,200,150,300,250,100,400,350,200,150]
+
+	def test_get_fi(self):
+		expected = [0.0, -200, -150, -300, -250, 200, 400, 350, 200, 150]
+		self.assertEqual(expected, ForceIndex(self.prices, self.volume, 3).get_fi())
+
+	def test_calculate(self):
+		expected = [0.0, -100.0, -125.0, -212.5, -231.25, -15.62, 192.19, 271.1, 235.55, 192.78]
+		self.assertEqual(expected, ForceIndex(self.prices, self.volume, 3).calculate())
+
+	def test_stream_update(self):
+		stream = ForceIndexStream(3)
+		for i in range(len(self.prices)):
+			value = stream.update(self.prices[i], self.volume[i])
+
+		self.assertEqual(192.78, value)
+		self.assertEqual(150, stream.fi)
+
+class VolumeRoundingTest(TestCase):
+
+	def test_mf_multiplier_ties(self):
+		indicator = AccumulationDistributionLine([0.53, 0.79], [0.8, 0.8], [0.0, 0.0], [100, 100])
+
+		self.assertEqual([0.33, 0.97], indicator.get_mf_multiplier())
+		self.assertEqual([33.0, 130.0], indicator.calculate())
+
+	def test_box_ratio_ties(self):
+		high, low, volume = [10.0, 11.0, 12.5, 12.0], [9.0, 10.0, 11.5, 11.0], [1500000, 2500000, 100000000, 3500000]
+		indicator = EaseOfMovement(high, high, low, volume, 2)
+
+		self.assertEqual([0.01, 0.03, 1.0, 0.04], indicator.get_box_ratio())
+		self.assertEqual(EaseOfMovement(high, high, low, volume, 2).calculate(backend='python'), indicator.calculate(backend='numpy'))
+
+class VolumeExtendTest(TestCase):
+
+	def setUp(self):
+		self.prices = [5,4,3,2,1,3,4,5,6,7]
+		self.high = [5,7,4,2,2,3,5,7,7,7]
+		self.low =  [4,3,3,2,1,1,3,5,5,6]
+		self.volume = [100,200,150,300,250,100,400,350,200,150]
+
+	def test_extend(self):
+		indicators = [
+			(OnBalanceVolume, (self.prices, self.volume), {}),
+			(ForceIndex, (self.prices, self.volume), {'period': 3}),
+			(NegativeVolumeIndex, (self.prices, self.volume), {'period': 3}),
+			(EaseOfMovement, (self.prices, self.high, self.low, self.volume), {'period': 3}),
+		]
+		for cls, series, params in indicators:
+			expected = cls(*series, **params).calculate()
+			indicator = cls(*[values[:4] for values in series], **params)
+			indicator.calculate()
+			self.assertEqual(expected, indicator.extend(*[values[4:] for values in series]))
+
+	def test_extend_flat_bar_fill(self):
+		expected = AccumulationDistributionLine(self.prices, self.high, self.low, self.volume).calculate()
+		indicator = AccumulationDistributionLine(self.prices[:4], self.high[:4], self.low[:4], self.volume[:4])
+		indicator.calculate()
+		for i in range(4, len(self.prices)):
+			result = indicator.extend([self.prices[i]], [self.high[i]], [self.low[i]], [self.volume[i]])
+
+		self.assertEqual(expected, result)